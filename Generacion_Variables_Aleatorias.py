@@ -1,13 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
 import matplotlib.patches as patches
 import numpy as np
-from scipy.stats import norm, expon, binom, poisson, geom
+from scipy.stats import poisson
+import itertools
 import math
+import os
 import re
+import time
+from diagrama_serial import BINS_SERIAL, CORTES_TRIPLES, cortes_triples, densidad_pares, pares_seriales
+from aceptacion_rechazo import TRAMOS_POR_DEFECTO, MuestreadorRechazo, texto_resumen_rechazo
+from cache_resultados import CacheResultados, clave_contenido
+from colas import METODOS_LLEGADA, simular_cola, teoria_cola, texto_resumen_cola
+from busqueda_parametros import DIMENSION_MAXIMA, buscar_multiplicadores, incremento_sugerido, tabla_texto as tabla_multiplicadores
+from bondad_ajuste import ConteoEquiprobable, pruebas_bondad_ajuste, texto_bondad_ajuste
+from barrido import ejecutar_barrido, exportar_csv, graficar_multiples, interpretar_valores, tabla_texto
+from convergencia import VistaConvergencia
+from distribuciones import (DISCRETAS, DISTRIBUCIONES, REGISTRO, ErrorParametros, convertir_parametros,
+                            clave_parametro, modelo_teorico, pares_box_muller, resumen_frecuencias, tabla_frecuencias,
+                            uniformes_requeridos)
+from flujo import (FuenteUniformes, SumideroArchivo, SumideroFrecuencias, comparar_precisiones, ejecutar_flujo,
+                   muestreador_distribucion, sumideros_resumen, texto_comparacion_precisiones)
+from generadores_uniformes import PRECISIONES, CacheSecuencias
+from importar_uniformes import ArchivoUniformes, ErrorArchivoUniformes
+from instrumentacion import Instrumentacion
+from procesos_estocasticos import (PROCESOS, TRAYECTORIAS_DESTACADAS, TRAYECTORIAS_LINEAS, convertir_parametros_proceso,
+                                   decimar_min_max, densidad_trayectorias, generar_proceso, texto_resumen_proceso)
+from normal_multivariada import NormalMultivariada, generar_multivariada, leer_matriz, leer_vector, texto_resumen_multivariada
+from reduccion_varianza import (MODOS_DEPENDIENTES, MODOS_MUESTREO, MODO_SIMPLE, aplicar_modo_muestreo,
+                                estimar_reduccion_varianza, uniformes_necesarios)
 
 class MathTextWidget:
     """Widget simplificado para mostrar texto con fórmulas matemáticas"""
@@ -197,10 +222,22 @@ class GeneradorPseudoaleatorio:
         self.numeros_generados_uniformes = []
         self.valores_x_congruencial = []
         self.procedimiento_texto = ""
+        # Congruential sequences reused across runs; extended only when more values are needed
+        self.cache_uniformes = CacheSecuencias()
+        self.clave_uniformes_mostrados = None # (method, X0, a, c, m, count) currently shown in the uniform tab
+        self.texto_procedimiento_uniformes = ""
+        self.cache_resultados = CacheResultados() # Whole runs on disk, keyed by a hash of all their parameters
+        self.ruta_archivo_uniformes = None # Validated file for the "archivo" uniform source
         # Store tuples of (Ri_used_for_X1, Ri_used_for_X2, Generated_X) for distribution table
         # For Binomial, this will be (First_U_of_the_n_trials, None, X_binomial_generated)
         self.numeros_generados_distribucion_data = [] # New: to store (Ri, Xi_dist)
         self.procedimiento_distribucion_texto = ""
+        self.uniformes_muestreo = [] # Uniforms after applying the sampling mode (antithetic, LHS, ...)
+        self.resultado_reduccion_varianza = None
+        self.resultado_bondad_ajuste = None
+        self.frecuencias_discretas = None # (minimum value, np.bincount counts) for discrete distributions
+        self.columnas_uniformes_distribucion = "uno" # "par" (Box-Muller), "grupo" (k per value), "uno" or "ninguno" (rejection)
+        self.instrumentacion = Instrumentacion()
 
         self.crear_estilos()
         self.crear_interfaz()
@@ -293,6 +330,10 @@ class GeneradorPseudoaleatorio:
         titulo = ttk.Label(self.root, text="Generador de Números Pseudoaleatorios y Variables Aleatorias", style='Title.TLabel')
         titulo.pack(pady=15)
 
+        self.barra_estado_var = tk.StringVar(value="Listo")
+        barra_estado = ttk.Label(self.root, textvariable=self.barra_estado_var, style='TLabel', anchor=tk.W, relief=tk.SUNKEN)
+        barra_estado.pack(side=tk.BOTTOM, fill=tk.X)
+
         main_frame = ttk.Frame(self.root, style='TFrame')
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
@@ -310,6 +351,14 @@ class GeneradorPseudoaleatorio:
         ttk.Radiobutton(uniform_gen_frame, text="Congruencial Mixto", variable=self.metodo_uniforme_var, value="mixto", style='TRadiobutton', command=self.actualizar_parametros_uniformes).pack(anchor=tk.W, padx=30, pady=2)
         ttk.Radiobutton(uniform_gen_frame, text="Congruencial Multiplicativo", variable=self.metodo_uniforme_var, value="multiplicativo", style='TRadiobutton', command=self.actualizar_parametros_uniformes).pack(anchor=tk.W, padx=30, pady=2)
         ttk.Radiobutton(uniform_gen_frame, text="Estándar (Python/NumPy)", variable=self.metodo_uniforme_var, value="estandar", style='TRadiobutton', command=self.actualizar_parametros_uniformes).pack(anchor=tk.W, padx=30, pady=2)
+        ttk.Radiobutton(uniform_gen_frame, text="Importar Uniformes (archivo)", variable=self.metodo_uniforme_var, value="archivo", style='TRadiobutton', command=self.actualizar_parametros_uniformes).pack(anchor=tk.W, padx=30, pady=2)
+
+        archivo_frame = ttk.Frame(uniform_gen_frame, style='TFrame')
+        archivo_frame.pack(fill=tk.X, padx=30, pady=2)
+        self.btn_archivo_uniformes = ttk.Button(archivo_frame, text="Seleccionar Archivo...", command=self.seleccionar_archivo_uniformes)
+        self.btn_archivo_uniformes.pack(side=tk.LEFT)
+        self.archivo_uniformes_var = tk.StringVar(value="Ningún archivo seleccionado")
+        ttk.Label(archivo_frame, textvariable=self.archivo_uniformes_var, style='TLabel').pack(side=tk.LEFT, padx=5)
 
         self.params_uniform_frame = ttk.Frame(uniform_gen_frame, style='TFrame')
         self.params_uniform_frame.pack(padx=20, pady=10, fill=tk.X)
@@ -332,13 +381,15 @@ class GeneradorPseudoaleatorio:
 
         self.actualizar_parametros_uniformes()
 
+        ttk.Button(uniform_gen_frame, text="Buscar Multiplicadores...", command=self.abrir_ventana_busqueda_multiplicadores).pack(pady=(0, 10))
+
         dist_sim_frame = ttk.LabelFrame(self.left_frame, text="Simulación de Variables Aleatorias", style='TLabelframe')
         dist_sim_frame.pack(padx=15, pady=10, fill=tk.X)
 
         ttk.Label(dist_sim_frame, text="Seleccione Distribución:", style='Section.TLabel').pack(pady=(5, 5))
         self.distribucion_var = tk.StringVar()
         self.distribucion_combobox = ttk.Combobox(dist_sim_frame, textvariable=self.distribucion_var,
-                                                   values=["Normal", "Exponencial", "Binomial", "Poisson", "Geométrica"],
+                                                   values=DISTRIBUCIONES,
                                                    state="readonly", style='TCombobox')
         self.distribucion_combobox.pack(pady=5, padx=20, fill=tk.X)
         self.distribucion_combobox.bind("<<ComboboxSelected>>", self.mostrar_parametros_distribucion)
@@ -346,6 +397,18 @@ class GeneradorPseudoaleatorio:
         self.params_dist_frame = ttk.Frame(dist_sim_frame, style='TFrame')
         self.params_dist_frame.pack(padx=20, pady=10, fill=tk.X)
 
+        ttk.Label(dist_sim_frame, text="Modo de Muestreo:", style='Section.TLabel').pack(pady=(5, 5))
+        self.modo_muestreo_var = tk.StringVar(value=MODO_SIMPLE)
+        self.modo_muestreo_combobox = ttk.Combobox(dist_sim_frame, textvariable=self.modo_muestreo_var,
+                                                   values=MODOS_MUESTREO, state="readonly", style='TCombobox')
+        self.modo_muestreo_combobox.pack(pady=5, padx=20, fill=tk.X)
+
+        # Applies to the block pipeline (file output, convergence, sweeps); float32 halves the bytes per block
+        ttk.Label(dist_sim_frame, text="Precisión (por bloques):", style='Section.TLabel').pack(pady=(5, 5))
+        self.precision_var = tk.StringVar(value="float64")
+        ttk.Combobox(dist_sim_frame, textvariable=self.precision_var, values=list(PRECISIONES),
+                     state="readonly", style='TCombobox').pack(pady=5, padx=20, fill=tk.X)
+
         self.dist_param_entries = {}
         self.vcmd_int_dist = vcmd_int
         self.vcmd_float_dist = vcmd_float
@@ -353,6 +416,16 @@ class GeneradorPseudoaleatorio:
         self.btn_generar_distribucion = ttk.Button(dist_sim_frame, text="Generar Variable Aleatoria", command=self.generar_variable_aleatoria, state=tk.DISABLED)
         self.btn_generar_distribucion.pack(pady=10)
 
+        self.btn_barrido = ttk.Button(dist_sim_frame, text="Barrido de Parámetros...", command=self.abrir_ventana_barrido, state=tk.DISABLED)
+        self.btn_barrido.pack(pady=(0, 10))
+
+        self.btn_generar_archivo = ttk.Button(dist_sim_frame, text="Generar a Archivo (por bloques)...", command=self.generar_a_archivo, state=tk.DISABLED)
+        self.btn_generar_archivo.pack(pady=(0, 10))
+
+        ttk.Button(dist_sim_frame, text="Densidad Personalizada (Rechazo)...", command=self.abrir_ventana_densidad_personalizada).pack(pady=(0, 10))
+        ttk.Button(dist_sim_frame, text="Normal Multivariada...", command=self.abrir_ventana_normal_multivariada).pack(pady=(0, 10))
+        ttk.Button(dist_sim_frame, text="Simulación de Colas...", command=self.abrir_ventana_colas).pack(pady=(0, 10))
+
         self.right_frame = ttk.Frame(paned_window, style='TFrame')
         paned_window.add(self.right_frame, weight=2)
 
@@ -387,11 +460,26 @@ class GeneradorPseudoaleatorio:
         uniform_paned_window.add(bottom_half_frame, weight=1)
 
         ttk.Label(bottom_half_frame, text="Gráfico de Números Uniformes", style='Subtitle.TLabel').pack(pady=(5, 5))
+        tipo_grafico_frame = ttk.Frame(bottom_half_frame, style='TFrame')
+        tipo_grafico_frame.pack(fill=tk.X, padx=10)
+        ttk.Label(tipo_grafico_frame, text="Tipo de gráfico:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        self.tipo_grafico_uniformes_var = tk.StringVar(value="Histograma")
+        self.tipo_grafico_uniformes_combobox = ttk.Combobox(tipo_grafico_frame, textvariable=self.tipo_grafico_uniformes_var,
+                                                            values=["Histograma", "Serial 2-D (Ri, Ri+1)", "Serial 3-D (cortes de Ri+2)"],
+                                                            state="readonly", style='TCombobox')
+        self.tipo_grafico_uniformes_combobox.pack(side=tk.LEFT, padx=5)
+        self.tipo_grafico_uniformes_combobox.bind("<<ComboboxSelected>>", lambda event: self.dibujar_grafico_uniformes())
+
         self.figure_uniformes = plt.Figure(figsize=(6, 4), dpi=100)
         self.ax_uniformes = self.figure_uniformes.add_subplot(111)
         self.canvas_uniformes = FigureCanvasTkAgg(self.figure_uniformes, master=bottom_half_frame)
         self.canvas_uniformes_widget = self.canvas_uniformes.get_tk_widget()
+        self.toolbar_uniformes = NavigationToolbar2Tk(self.canvas_uniformes, bottom_half_frame, pack_toolbar=False)
+        self.toolbar_uniformes.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas_uniformes_widget.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+        # Serial density images: axes -> (Ri, Ri+1) arrays and AxesImage, re-binned on zoom
+        self.imagenes_serial = {}
+        self.rebinado_pendiente = False
 
         self.tab_distribucion = ttk.Frame(self.notebook, style='TFrame')
         self.notebook.add(self.tab_distribucion, text="Variables Aleatorias")
@@ -428,10 +516,75 @@ class GeneradorPseudoaleatorio:
         self.canvas_distribucion_widget = self.canvas_distribucion.get_tk_widget()
         self.canvas_distribucion_widget.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
 
+        self.tab_convergencia = ttk.Frame(self.notebook, style='TFrame')
+        self.notebook.add(self.tab_convergencia, text="Convergencia")
+
+        conv_controles_frame = ttk.Frame(self.tab_convergencia, style='TFrame')
+        conv_controles_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(conv_controles_frame, text="Tamaño de bloque:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        self.entry_bloque_convergencia = ttk.Entry(conv_controles_frame, width=12, validate="key", validatecommand=vcmd_int, style='TEntry')
+        self.entry_bloque_convergencia.insert(0, "1000")
+        self.entry_bloque_convergencia.pack(side=tk.LEFT, padx=5)
+        ttk.Button(conv_controles_frame, text="Iniciar Convergencia", command=self.iniciar_convergencia).pack(side=tk.LEFT, padx=5)
+        ttk.Button(conv_controles_frame, text="Detener", command=self.detener_convergencia).pack(side=tk.LEFT, padx=5)
+
+        self.figure_convergencia = plt.Figure(figsize=(6, 4), dpi=100)
+        self.canvas_convergencia = FigureCanvasTkAgg(self.figure_convergencia, master=self.tab_convergencia)
+        self.canvas_convergencia.get_tk_widget().pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+        self.convergencia_activa = False
+
+        self.tab_procesos = ttk.Frame(self.notebook, style='TFrame')
+        self.notebook.add(self.tab_procesos, text="Procesos Estocásticos")
+
+        procesos_controles_frame = ttk.Frame(self.tab_procesos, style='TFrame')
+        procesos_controles_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(procesos_controles_frame, text="Proceso:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        self.proceso_var = tk.StringVar(value=next(iter(PROCESOS)))
+        combo_proceso = ttk.Combobox(procesos_controles_frame, textvariable=self.proceso_var, values=list(PROCESOS), width=24, state="readonly", style='TCombobox')
+        combo_proceso.pack(side=tk.LEFT, padx=5)
+        combo_proceso.bind("<<ComboboxSelected>>", self.mostrar_parametros_proceso)
+        self.entries_proceso_comunes = {}
+        for etiqueta, defecto in [("Trayectorias:", "1000"), ("Pasos:", "2000")]:
+            ttk.Label(procesos_controles_frame, text=etiqueta, style='TLabel').pack(side=tk.LEFT, padx=5)
+            entry = ttk.Entry(procesos_controles_frame, width=10, validate="key", validatecommand=vcmd_int, style='TEntry')
+            entry.insert(0, defecto)
+            entry.pack(side=tk.LEFT, padx=5)
+            self.entries_proceso_comunes[etiqueta] = entry
+        ttk.Button(procesos_controles_frame, text="Generar Trayectorias", command=self.generar_trayectorias).pack(side=tk.LEFT, padx=5)
+
+        self.params_proceso_frame = ttk.Frame(self.tab_procesos, style='TFrame')
+        self.params_proceso_frame.pack(fill=tk.X, padx=10)
+        self.entries_proceso = {}
+        self.mostrar_parametros_proceso()
+
+        self.texto_procesos = scrolledtext.ScrolledText(self.tab_procesos, wrap=tk.NONE, height=10, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        self.texto_procesos.pack(padx=10, pady=5, fill=tk.X)
+        self.figure_procesos = plt.Figure(figsize=(6, 4), dpi=100)
+        self.canvas_procesos = FigureCanvasTkAgg(self.figure_procesos, master=self.tab_procesos)
+        self.canvas_procesos.get_tk_widget().pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+
+        self.tab_diagnostico = ttk.Frame(self.notebook, style='TFrame')
+        self.notebook.add(self.tab_diagnostico, text="Diagnóstico")
+
+        diag_controles_frame = ttk.Frame(self.tab_diagnostico, style='TFrame')
+        diag_controles_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.medir_memoria_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(diag_controles_frame, text="Medir memoria (tracemalloc, más lento)", variable=self.medir_memoria_var).pack(side=tk.LEFT, padx=5)
+        self.perfilar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(diag_controles_frame, text="Perfilar la próxima ejecución (cProfile)", variable=self.perfilar_var).pack(side=tk.LEFT, padx=5)
+        self.usar_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(diag_controles_frame, text="Usar caché de resultados en disco", variable=self.usar_cache_var).pack(side=tk.LEFT, padx=5)
+        ttk.Button(diag_controles_frame, text="Exportar JSON", command=self.exportar_diagnostico_json).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(diag_controles_frame, text="Comparar float32/float64", command=self.comparar_precisiones).pack(side=tk.RIGHT, padx=5)
+
+        self.texto_diagnostico = scrolledtext.ScrolledText(self.tab_diagnostico, wrap=tk.NONE, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        self.texto_diagnostico.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
     def actualizar_parametros_uniformes(self):
         metodo = self.metodo_uniforme_var.get()
-        if metodo == "estandar":
-            # Only N is editable for standard, other params for congruential are disabled
+        self.btn_archivo_uniformes.config(state=tk.NORMAL if metodo == "archivo" else tk.DISABLED)
+        if metodo in ("estandar", "archivo"):
+            # Only N is editable for standard and imported uniforms, other params for congruential are disabled
             for label_text, entry_widget in self.entries_uniform_params.items():
                 if label_text != "Cantidad (N)":
                     entry_widget.config(state=tk.DISABLED)
@@ -459,40 +612,105 @@ class GeneradorPseudoaleatorio:
                 self.entries_uniform_params["Constante (c)"].delete(0, tk.END)
 
 
+    def mostrar_parametros_proceso(self, event=None):
+        for widget in self.params_proceso_frame.winfo_children():
+            widget.destroy()
+        self.entries_proceso.clear()
+        for text, tipo, defecto in PROCESOS[self.proceso_var.get()]:
+            ttk.Label(self.params_proceso_frame, text=text, style='TLabel').pack(side=tk.LEFT, padx=5)
+            entry = ttk.Entry(self.params_proceso_frame, width=10, style='TEntry')
+            entry.insert(0, defecto)
+            entry.pack(side=tk.LEFT, padx=5)
+            self.entries_proceso[clave_parametro(text)] = entry
+
+    def generar_trayectorias(self):
+        proceso = self.proceso_var.get()
+        try:
+            params = convertir_parametros_proceso(proceso, {clave: entry.get() for clave, entry in self.entries_proceso.items()})
+            trayectorias = int(self.entries_proceso_comunes["Trayectorias:"].get())
+            pasos = int(self.entries_proceso_comunes["Pasos:"].get())
+        except ErrorParametros as e:
+            messagebox.showerror("Error de Validación", str(e))
+            return
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "Ingrese valores numéricos válidos para el proceso, las trayectorias y los pasos.")
+            return
+        config = self.leer_configuracion_generador()
+        if config is None:
+            return
+        try:
+            # Paths are built from the generator configured in the left panel, at the selected precision
+            fuente = FuenteUniformes.desde_generador(config, dtype=PRECISIONES[self.precision_var.get()])
+            inicio = time.perf_counter()
+            resultado = generar_proceso(proceso, params, fuente, trayectorias, pasos)
+            segundos = time.perf_counter() - inicio
+        except ValueError as e:
+            messagebox.showerror("Error de Generación", str(e))
+            return
+
+        inicio = time.perf_counter()
+        self.dibujar_trayectorias(proceso, resultado)
+        segundos_grafico = time.perf_counter() - inicio
+        self.texto_procesos.delete(1.0, tk.END)
+        self.texto_procesos.insert(tk.END, texto_resumen_proceso(proceso, params, resultado, segundos))
+        self.texto_procesos.insert(tk.END, f"Decimación y dibujo: {segundos_grafico:.3f} s\n")
+
+    def dibujar_trayectorias(self, proceso, resultado):
+        """Min/max-decimated paths as one LineCollection; with many paths, a density image plus a few highlighted ones"""
+        t, valores = resultado['t'], resultado['valores']
+        self.figure_procesos.clear()
+        self.figure_procesos.patch.set_facecolor(self.frame_bg)
+        ax = self.figure_procesos.add_subplot(111)
+        if len(valores) > TRAYECTORIAS_LINEAS:
+            densidad, (y0, y1) = densidad_trayectorias(valores)
+            ax.imshow(np.log1p(densidad), origin='lower', extent=(t[0], t[-1], y0, y1), aspect='auto',
+                      cmap='Blues', interpolation='nearest')
+            lineas = valores[:TRAYECTORIAS_DESTACADAS]
+            opacidad = 0.8
+        else:
+            lineas = valores
+            # Fainter lines as the number of paths grows, so dense regions still read as density
+            opacidad = min(0.8, max(0.1, 20 / len(valores)))
+        t_decimado, decimados = decimar_min_max(t, lineas)
+        segmentos = np.empty(decimados.shape + (2,))
+        segmentos[:, :, 0] = t_decimado
+        segmentos[:, :, 1] = decimados
+        ax.add_collection(LineCollection(segmentos, colors=self.accent_color, linewidths=0.6, alpha=opacidad))
+        desviacion = np.sqrt(resultado['varianza'])
+        ax.plot(t, resultado['media'], color='red', linewidth=1.5, label="Media teórica")
+        ax.plot(t, resultado['media'] + 2 * desviacion, color='red', linestyle='dashed', linewidth=1, label="Media ± 2σ")
+        ax.plot(t, resultado['media'] - 2 * desviacion, color='red', linestyle='dashed', linewidth=1)
+        ax.autoscale_view()
+        titulo = f"{proceso}: {len(valores)} trayectorias"
+        if len(valores) > len(lineas):
+            titulo += f" (densidad; {len(lineas)} destacadas)"
+        ax.set_title(titulo, color=self.text_color)
+        ax.set_xlabel("t" if proceso in ("Proceso de Poisson", "Movimiento browniano") else "Paso", color=self.text_color)
+        ax.set_ylabel("Valor", color=self.text_color)
+        ax.set_facecolor(self.frame_bg)
+        ax.tick_params(colors=self.text_color)
+        ax.legend()
+        self.canvas_procesos.draw()
+
     def mostrar_parametros_distribucion(self, event=None):
         for widget in self.params_dist_frame.winfo_children():
             widget.destroy()
         self.dist_param_entries.clear()
         self.btn_generar_distribucion.config(state=tk.NORMAL)
+        self.btn_barrido.config(state=tk.NORMAL)
+        self.btn_generar_archivo.config(state=tk.NORMAL)
 
         distribucion = self.distribucion_var.get()
-        labels_params = []
-        if distribucion == "Normal":
-            labels_params = [("Media (μ):", self.vcmd_float_dist), ("Desviación Estándar (σ):", self.vcmd_float_dist)]
-        elif distribucion == "Exponencial":
-            labels_params = [("Lambda (λ):", self.vcmd_float_dist)]
-        elif distribucion == "Binomial":
-            labels_params = [("N (Ensayos):", self.vcmd_int_dist), ("P (Probabilidad):", self.vcmd_float_dist)]
-        elif distribucion == "Poisson":
-            labels_params = [("Lambda (λ):", self.vcmd_float_dist)]
-        elif distribucion == "Geométrica":
-            labels_params = [("P (Probabilidad):", self.vcmd_float_dist)]
-
-        for text, vcmd in labels_params:
+        # Labels, entry validation and defaults come from the distribution registry
+        for text, tipo, defecto in REGISTRO[distribucion].parametros:
+            vcmd = self.vcmd_int_dist if tipo is int else self.vcmd_float_dist
             row_frame = ttk.Frame(self.params_dist_frame, style='TFrame')
             row_frame.pack(fill=tk.X, pady=2)
             ttk.Label(row_frame, text=text, width=20, anchor=tk.W, style='TLabel').pack(side=tk.LEFT, padx=5)
             entry = ttk.Entry(row_frame, width=20, validate="key", validatecommand=vcmd, style='TEntry')
             entry.pack(side=tk.RIGHT, expand=True, fill=tk.X, padx=5)
-            self.dist_param_entries[text.split('(')[0].strip()] = entry
-
-            if distribucion == "Normal" and text.startswith("Media"): entry.insert(0, "0")
-            elif distribucion == "Normal" and text.startswith("Desviación"): entry.insert(0, "1")
-            elif distribucion == "Exponencial" and text.startswith("Lambda"): entry.insert(0, "1")
-            elif distribucion == "Binomial" and text.startswith("N"): entry.insert(0, "10")
-            elif distribucion == "Binomial" and text.startswith("P"): entry.insert(0, "0.5")
-            elif distribucion == "Poisson" and text.startswith("Lambda"): entry.insert(0, "2") # Default lambda for Poisson
-            elif distribucion == "Geométrica" and text.startswith("P"): entry.insert(0, "0.5")
+            self.dist_param_entries[clave_parametro(text)] = entry
+            entry.insert(0, defecto)
 
     def validar_parametros_uniformes(self, x0, a, c, m, n, metodo):
         if not all(isinstance(val, int) and val >= 0 for val in [x0, a, m, n]):
@@ -544,18 +762,42 @@ class GeneradorPseudoaleatorio:
         # Otherwise, ensure we generate at least N_uniformes_requeridos.
         actual_N_to_generate = max(N_from_entry, N_uniformes_requeridos)
         
-        self.numeros_generados_uniformes = []
-        self.valores_x_congruencial = []
-        self.procedimiento_texto = ""
         metodo = self.metodo_uniforme_var.get()
 
         if metodo == "estandar":
-            self.procedimiento_text.delete(1.0, tk.END)
-            texto_procedimiento = "Generando números aleatorios utilizando np.random.rand()\n"
-            texto_procedimiento += f"Se generaron {actual_N_to_generate} números uniformes entre 0 y 1.\n"
-            self.procedimiento_text.insert(tk.END, texto_procedimiento)
-            self.numeros_generados_uniformes = np.random.rand(actual_N_to_generate).tolist()
-            self.valores_x_congruencial = ['N/A'] * actual_N_to_generate # Asignar 'N/A' para el método estándar
+            # Fresh numbers on every run, so there is nothing to reuse
+            self.clave_uniformes_mostrados = None
+            with self.instrumentacion.etapa("Generación de uniformes") as conteos:
+                self.numeros_generados_uniformes = np.random.rand(actual_N_to_generate).tolist()
+                self.valores_x_congruencial = ['N/A'] * actual_N_to_generate # Asignar 'N/A' para el método estándar
+                conteos['valores'] = actual_N_to_generate
+            with self.instrumentacion.etapa("MathTextWidget.insert (uniformes)"):
+                self.procedimiento_text.delete(1.0, tk.END)
+                texto_procedimiento = "Generando números aleatorios utilizando np.random.rand()\n"
+                texto_procedimiento += f"Se generaron {actual_N_to_generate} números uniformes entre 0 y 1.\n"
+                self.procedimiento_text.insert(tk.END, texto_procedimiento)
+                self.texto_procedimiento_uniformes = texto_procedimiento
+        elif metodo == "archivo":
+            if self.ruta_archivo_uniformes is None:
+                messagebox.showerror("Error de Entrada", "Seleccione primero un archivo de uniformes.")
+                return False
+            # The file can be much larger than N: only the leading values needed for this run are read
+            self.clave_uniformes_mostrados = None
+            with self.instrumentacion.etapa("Lectura de uniformes (archivo)") as conteos:
+                try:
+                    valores = ArchivoUniformes(self.ruta_archivo_uniformes).leer(actual_N_to_generate)
+                except ErrorArchivoUniformes as e:
+                    messagebox.showerror("Error de Archivo", str(e))
+                    return False
+                self.numeros_generados_uniformes = valores.tolist()
+                self.valores_x_congruencial = ['N/A'] * actual_N_to_generate
+                conteos['valores'] = actual_N_to_generate
+            with self.instrumentacion.etapa("MathTextWidget.insert (uniformes)"):
+                self.procedimiento_text.delete(1.0, tk.END)
+                texto_procedimiento = f"Uniformes importados del archivo {os.path.basename(self.ruta_archivo_uniformes)}\n"
+                texto_procedimiento += f"Se leyeron los primeros {actual_N_to_generate} valores (validados en [0, 1)).\n"
+                self.procedimiento_text.insert(tk.END, texto_procedimiento)
+                self.texto_procedimiento_uniformes = texto_procedimiento
         else:
             x0_str = self.entries_uniform_params["Semilla (X₀)"].get()
             a_str = self.entries_uniform_params["Constante (a)"].get()
@@ -574,6 +816,35 @@ class GeneradorPseudoaleatorio:
             if not self.validar_parametros_uniformes(X0, a, c, m, actual_N_to_generate, metodo):
                 return False
 
+            secuencia, _ = self.cache_uniformes.obtener(metodo, X0, a, c, m)
+            pasos = secuencia.pasos
+
+            # Only the values (and procedure steps) beyond those already cached are computed
+            self.instrumentacion.abrir_etapa("Generación de uniformes")
+            inicio = secuencia.extender(actual_N_to_generate)
+            self.instrumentacion.cerrar_etapa(valores=actual_N_to_generate, nuevos=len(secuencia) - inicio)
+
+            self.instrumentacion.abrir_etapa("Texto de procedimiento (uniformes)")
+            for i in range(inicio, len(secuencia)):
+                xi = secuencia.anterior(i)
+                xi_next = secuencia.valores_x[i]
+                ri = secuencia.valores_r[i]
+                if metodo == "mixto":
+                    paso = f"X_{{{i+1}}} = ({a} * {xi} + {c}) mod {m} = {xi_next}\n"
+                else:
+                    paso = f"X_{{{i+1}}} = ({a} * {xi}) mod {m} = {xi_next}\n"
+                pasos.append(paso + f"R_{{{i+1}}} = {xi_next} / {m} = {ri:.8f}\n\n")
+
+            self.numeros_generados_uniformes = secuencia.valores_r[:actual_N_to_generate]
+            self.valores_x_congruencial = secuencia.valores_x[:actual_N_to_generate]
+
+            clave_mostrada = (metodo, X0, a, c, m, actual_N_to_generate)
+            if clave_mostrada == self.clave_uniformes_mostrados:
+                # Same sequence already on screen: skip the procedure text and the uniform tab redraw
+                self.instrumentacion.cerrar_etapa(pasos_nuevos=len(secuencia) - inicio, reutilizado=True)
+                return True
+            self.clave_uniformes_mostrados = clave_mostrada
+
             self.procedimiento_text.delete(1.0, tk.END)
             
             # Construir el texto del procedimiento
@@ -591,35 +862,26 @@ class GeneradorPseudoaleatorio:
                 texto_procedimiento += "Fórmula: $R_i = X_i / m$\n\n"
             
             texto_procedimiento += "Procedimiento de generación:\n"
-
-            xi = X0
-            for i in range(actual_N_to_generate):
-                if metodo == "mixto":
-                    xi_next = (a * xi + c) % m
-                    texto_procedimiento += f"X_{{{i+1}}} = ({a} * {xi} + {c}) mod {m} = {xi_next}\n"
-                else:
-                    xi_next = (a * xi) % m
-                    texto_procedimiento += f"X_{{{i+1}}} = ({a} * {xi}) mod {m} = {xi_next}\n"
-
-                ri = xi_next / m
-                self.numeros_generados_uniformes.append(ri)
-                self.valores_x_congruencial.append(xi_next)
-                texto_procedimiento += f"R_{{{i+1}}} = {xi_next} / {m} = {ri:.8f}\n\n"
-                xi = xi_next
+            texto_procedimiento += "".join(pasos[:actual_N_to_generate])
+            self.instrumentacion.cerrar_etapa(pasos_nuevos=len(secuencia) - inicio, caracteres=len(texto_procedimiento))
             
             # Insertar todo el texto de una vez
-            self.procedimiento_text.insert(tk.END, texto_procedimiento)
+            with self.instrumentacion.etapa("MathTextWidget.insert (uniformes)") as conteos:
+                self.procedimiento_text.insert(tk.END, texto_procedimiento)
+                conteos['caracteres'] = len(texto_procedimiento)
+            self.texto_procedimiento_uniformes = texto_procedimiento
             
         self.actualizar_tablas_y_graficos_uniformes()
         return True
 
     def actualizar_tablas_y_graficos_uniformes(self):
+        self.instrumentacion.abrir_etapa("Tabla de uniformes")
         self.tabla_uniformes.delete(1.0, tk.END)
         self.tabla_uniformes.insert(tk.END, " N° |         Xi |          Ri\n")
         self.tabla_uniformes.insert(tk.END, "----|------------|------------------\n")
 
         # Ensure self.valores_x_congruencial is populated correctly even for "estandar" method
-        x_vals_to_display = self.valores_x_congruencial if self.metodo_uniforme_var.get() != "estandar" else ['N/A'] * len(self.numeros_generados_uniformes)
+        x_vals_to_display = self.valores_x_congruencial if self.metodo_uniforme_var.get() in ("mixto", "multiplicativo") else ['N/A'] * len(self.numeros_generados_uniformes)
 
         for i, (x_val, r_val) in enumerate(zip(x_vals_to_display, self.numeros_generados_uniformes)):
             fila = f"{i+1:>3} | {str(x_val):>10} | {r_val:>16.8f}\n"
@@ -636,7 +898,7 @@ class GeneradorPseudoaleatorio:
             resumen += f"Media de valores R: {media:.4f}\n"
             resumen += f"Valores únicos R: {valores_unicos_r}\n"
 
-            if self.metodo_uniforme_var.get() != "estandar":
+            if self.metodo_uniforme_var.get() in ("mixto", "multiplicativo"):
                 valores_unicos_x = len(set(self.valores_x_congruencial))
                 resumen += f"Valores únicos X: {valores_unicos_x}\n"
                 resumen += f"Mínimo X: {min(self.valores_x_congruencial)}\n"
@@ -646,15 +908,40 @@ class GeneradorPseudoaleatorio:
             resumen += f"Máximo R: {max(self.numeros_generados_uniformes):.6f}\n"
             resumen += f"{'='*40}\n"
             self.tabla_uniformes.insert(tk.END, resumen)
+        self.instrumentacion.cerrar_etapa(filas=len(self.numeros_generados_uniformes))
 
-        self.ax_uniformes.clear()
-        if self.numeros_generados_uniformes:
+        with self.instrumentacion.etapa("Gráfico de uniformes (canvas.draw)") as conteos:
+            self.dibujar_grafico_uniformes()
+            conteos['valores'] = len(self.numeros_generados_uniformes)
+
+    def dibujar_grafico_uniformes(self):
+        tipo = self.tipo_grafico_uniformes_var.get()
+        self.figure_uniformes.clear()
+        self.imagenes_serial = {}
+        self.figure_uniformes.patch.set_facecolor(self.frame_bg)
+
+        if not self.numeros_generados_uniformes:
+            self.ax_uniformes = self.figure_uniformes.add_subplot(111)
+            self.ax_uniformes.text(0.5, 0.5, "No hay datos para mostrar", horizontalalignment='center', verticalalignment='center', transform=self.ax_uniformes.transAxes, color=self.text_color)
+        elif tipo.startswith("Serial 2-D"):
+            self.ax_uniformes = self.figure_uniformes.add_subplot(111)
+            x, y = pares_seriales(self.numeros_generados_uniformes)
+            self.crear_imagen_serial(self.ax_uniformes, x, y, "Diagrama Serial (Ri, Ri+1)")
+        elif tipo.startswith("Serial 3-D"):
+            filas = 2
+            columnas = math.ceil(CORTES_TRIPLES / filas)
+            for k, (z0, z1, x, y) in enumerate(cortes_triples(self.numeros_generados_uniformes)):
+                ax = self.figure_uniformes.add_subplot(filas, columnas, k + 1)
+                self.crear_imagen_serial(ax, x, y, f"{z0:.2f} ≤ Ri+2 < {z1:.2f}")
+            self.ax_uniformes = self.figure_uniformes.axes[0] if self.figure_uniformes.axes else self.figure_uniformes.add_subplot(111)
+            self.figure_uniformes.tight_layout()
+        else:
+            self.ax_uniformes = self.figure_uniformes.add_subplot(111)
             self.ax_uniformes.hist(self.numeros_generados_uniformes, bins=20, density=True, color=self.accent_color, edgecolor=self.primary_color, alpha=0.7)
             self.ax_uniformes.set_title("Histograma de Números Uniformes [0,1)", color=self.text_color)
             self.ax_uniformes.set_xlabel("Valor", color=self.text_color)
             self.ax_uniformes.set_ylabel("Densidad de Probabilidad", color=self.text_color)
             self.ax_uniformes.set_facecolor(self.frame_bg)
-            self.figure_uniformes.patch.set_facecolor(self.frame_bg)
             self.ax_uniformes.tick_params(colors=self.text_color)
             for spine in self.ax_uniformes.spines.values():
                 spine.set_edgecolor(self.text_color)
@@ -662,54 +949,63 @@ class GeneradorPseudoaleatorio:
             self.ax_uniformes.axhline(1, color='red', linestyle='dashed', linewidth=2, label="PDF Uniforme Teórica")
             self.ax_uniformes.set_ylim(bottom=0, top=1.2)
             self.ax_uniformes.legend()
-        else:
-            self.ax_uniformes.text(0.5, 0.5, "No hay datos para mostrar", horizontalalignment='center', verticalalignment='center', transform=self.ax_uniformes.transAxes, color=self.text_color)
 
         self.canvas_uniformes.draw()
 
+    def crear_imagen_serial(self, ax, x, y, titulo):
+        densidad = densidad_pares(x, y)
+        imagen = ax.imshow(densidad, origin='lower', extent=(0, 1, 0, 1), aspect='auto',
+                           cmap='viridis', interpolation='nearest')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_autoscale_on(False)
+        ax.set_title(titulo, color=self.text_color)
+        ax.set_xlabel("Ri", color=self.text_color)
+        ax.set_ylabel("Ri+1", color=self.text_color)
+        ax.tick_params(colors=self.text_color)
+        self.imagenes_serial[ax] = (x, y, imagen)
+        ax.callbacks.connect('xlim_changed', self.programar_rebinado_serial)
+        ax.callbacks.connect('ylim_changed', self.programar_rebinado_serial)
+
+    def programar_rebinado_serial(self, ax=None):
+        # Both xlim and ylim change on a zoom; re-bin once when Tk is idle
+        if not self.rebinado_pendiente:
+            self.rebinado_pendiente = True
+            self.root.after_idle(self.rebinar_serial)
+
+    def rebinar_serial(self):
+        self.rebinado_pendiente = False
+        for ax, (x, y, imagen) in self.imagenes_serial.items():
+            x0, x1 = sorted(ax.get_xlim())
+            y0, y1 = sorted(ax.get_ylim())
+            imagen.set_data(densidad_pares(x, y, BINS_SERIAL, ((x0, x1), (y0, y1))))
+            imagen.set_extent((x0, x1, y0, y1))
+            imagen.autoscale()
+        self.canvas_uniformes.draw_idle()
+
     def validar_parametros_distribucion(self, distribucion, params):
         try:
-            if distribucion == "Normal":
-                media = float(params.get("Media", 0))
-                std_dev = float(params.get("Desviación Estándar", 0))
-                if std_dev <= 0:
-                    messagebox.showerror("Error de Validación", "La desviación estándar debe ser mayor que 0.")
-                    return False, None
-                return True, {'loc': media, 'scale': std_dev}
-            elif distribucion == "Exponencial":
-                lam = float(params.get("Lambda", 0))
-                if lam <= 0:
-                    messagebox.showerror("Error de Validación", "Lambda (λ) debe ser mayor que 0.")
-                    return False, None
-                return True, {'scale': 1/lam}
-            elif distribucion == "Binomial":
-                n = int(params.get("N", 0))
-                p = float(params.get("P", 0))
-                if not (0 <= p <= 1):
-                    messagebox.showerror("Error de Validación", "La probabilidad (P) debe estar entre 0 y 1.")
-                    return False, None
-                if n <= 0:
-                    messagebox.showerror("Error de Validación", "El número de ensayos (N) debe ser un entero positivo.")
-                    return False, None
-                return True, {'n': n, 'p': p}
-            elif distribucion == "Poisson":
-                lam = float(params.get("Lambda", 0))
-                if lam <= 0:
-                    messagebox.showerror("Error de Validación", "Lambda (λ) debe ser mayor que 0.")
-                    return False, None
-                return True, {'mu': lam}
-            elif distribucion == "Geométrica":
-                p = float(params.get("P", 0))
-                if not (0 < p <= 1):
-                    messagebox.showerror("Error de Validación", "La probabilidad (P) debe estar entre 0 (exclusive) y 1.")
-                    return False, None
-                return True, {'p': p}
+            return True, convertir_parametros(distribucion, params)
+        except ErrorParametros as e:
+            messagebox.showerror("Error de Validación", str(e))
             return False, None
         except ValueError:
             messagebox.showerror("Error de Entrada", "Por favor, ingrese valores numéricos válidos para los parámetros de la distribución.")
             return False, None
 
     def generar_variable_aleatoria(self):
+        self.instrumentacion.medir_memoria = self.medir_memoria_var.get()
+        if self.perfilar_var.get():
+            self.instrumentacion.perfilar_siguiente = True
+            self.perfilar_var.set(False)
+        self.instrumentacion.iniciar(f"{self.distribucion_var.get()} (N={self.entries_uniform_params['Cantidad (N)'].get()})")
+        try:
+            self.ejecutar_generacion_variable_aleatoria()
+        finally:
+            self.instrumentacion.finalizar()
+            self.mostrar_diagnostico()
+
+    def ejecutar_generacion_variable_aleatoria(self):
         distribucion = self.distribucion_var.get()
         if not distribucion:
             messagebox.showerror("Error", "Por favor, seleccione un tipo de distribución.")
@@ -730,36 +1026,70 @@ class GeneradorPseudoaleatorio:
             messagebox.showerror("Error de Entrada", "La cantidad (N) para la generación de uniformes debe ser un número entero.")
             return
 
-        required_uniforms_for_dist = N_dist_samples # Default, will be adjusted for Normal and Binomial
-
-        if distribucion == "Normal":
-            # Normal requires 2 uniforms per sample, so N_dist_samples * 2 uniforms are needed
-            # We also ensure an even number of uniforms by adding 1 if N_dist_samples is odd.
-            required_uniforms_for_dist = N_dist_samples + (N_dist_samples % 2) 
-        elif distribucion == "Binomial":
-            n_trials_per_sample = params['n'] # 'n' from Binomial parameters
-            required_uniforms_for_dist = N_dist_samples * n_trials_per_sample
-            if required_uniforms_for_dist == 0: # Avoid division by zero or infinite loop if n_trials is 0
-                messagebox.showerror("Error", "El número de ensayos (N) para la distribución Binomial debe ser mayor que 0.")
+        familia = REGISTRO[distribucion]
+        modo_muestreo = self.modo_muestreo_var.get()
+        nota_modo = ""
+        if familia.consumo_fijo:
+            # Each "row" of uniforms feeds one sample (one Box-Muller pair for Normal, n trials for Binomial)
+            filas_muestreo, uniformes_por_fila = familia.estructura(params, N_dist_samples)
+            required_uniforms_for_dist = uniformes_necesarios(modo_muestreo, filas_muestreo, uniformes_por_fila)
+        else:
+            # Rejection samplers consume a variable number of uniforms, so sampling modes don't apply
+            filas_muestreo, uniformes_por_fila = N_dist_samples, 1
+            if modo_muestreo != MODO_SIMPLE:
+                nota_modo = f"Nota: el modo {modo_muestreo} no aplica a métodos de rechazo; se usa {MODO_SIMPLE}.\n"
+                modo_muestreo = MODO_SIMPLE
+            required_uniforms_for_dist = familia.uniformes_requeridos(params, N_dist_samples)
+
+        # Which uniforms the results table shows next to each value
+        if not familia.consumo_fijo:
+            self.columnas_uniformes_distribucion = "ninguno"
+        elif familia.estructura is pares_box_muller:
+            self.columnas_uniformes_distribucion = "par"
+        elif uniformes_por_fila > 1:
+            self.columnas_uniformes_distribucion = "grupo"
+        else:
+            self.columnas_uniformes_distribucion = "uno"
+
+        # A run with exactly these parameters may already be on disk
+        clave_cache = self.clave_cache_resultados(distribucion, params, modo_muestreo)
+        if clave_cache is not None:
+            with self.instrumentacion.etapa("Caché de resultados (lectura)") as conteos:
+                entrada = self.cache_resultados.cargar(clave_cache)
+                conteos['acierto'] = entrada is not None
+            if entrada is not None:
+                self.restaurar_resultado_cache(entrada, distribucion, params)
                 return
 
-
         # Always generate uniform numbers first, ensuring enough are available for the chosen distribution
         if not self.generar_numeros_uniformes(required_uniforms_for_dist):
              return
 
+        if familia.consumo_fijo:
+            self.uniformes_muestreo = aplicar_modo_muestreo(self.numeros_generados_uniformes, modo_muestreo, filas_muestreo, uniformes_por_fila,
+                                                            box_muller=familia.estructura is pares_box_muller).tolist()
+        else:
+            self.uniformes_muestreo = list(self.numeros_generados_uniformes)
+        uniformes = self.uniformes_muestreo
+
         self.numeros_generados_distribucion_data = [] # Reset for new data
         self.procedimiento_distribucion_texto = ""
-        cantidad_uniformes_disponibles = len(self.numeros_generados_uniformes) 
+        cantidad_uniformes_disponibles = len(uniformes)
 
         self.procedimiento_distribucion_texto += f"Distribución seleccionada: {distribucion}\n"
         self.procedimiento_distribucion_texto += f"Parámetros: {params_raw}\n"
-        self.procedimiento_distribucion_texto += f"Números Uniformes disponibles: {cantidad_uniformes_disponibles}. (Mostrando los primeros 5 si son muchos): {[f'{u:.4f}' for u in self.numeros_generados_uniformes[:min(5, cantidad_uniformes_disponibles)]]}...\n\n"
+        self.procedimiento_distribucion_texto += f"Modo de muestreo: {modo_muestreo}\n"
+        self.procedimiento_distribucion_texto += nota_modo
+        self.procedimiento_distribucion_texto += f"Números Uniformes disponibles: {cantidad_uniformes_disponibles}. (Mostrando los primeros 5 si son muchos): {[f'{u:.4f}' for u in uniformes[:min(5, cantidad_uniformes_disponibles)]]}...\n\n"
         self.procedimiento_distribucion_texto += "--- Procedimiento de Generación ---\n"
 
         uniform_index = 0 # To keep track of which uniform numbers have been used
+        # Discrete values are counted as they are generated, so the summary never re-scans the list
+        frecuencias = SumideroFrecuencias() if distribucion in DISCRETAS else None
 
         try:
+            # The transforms build the procedure text in the same loop, so both are timed together
+            self.instrumentacion.abrir_etapa("Transformación + texto (distribución)")
             if distribucion == "Normal":
                 self.procedimiento_distribucion_texto += "Usando el Método de Box-Muller (Transformada Inversa):\n"
                 self.procedimiento_distribucion_texto += "Fórmulas:\n"
@@ -780,8 +1110,8 @@ class GeneradorPseudoaleatorio:
                         self.procedimiento_distribucion_texto += "  No hay suficientes números uniformes para formar un par completo. Deteniendo la generación de Normal.\n"
                         break
 
-                    u1 = self.numeros_generados_uniformes[uniform_index]
-                    u2 = self.numeros_generados_uniformes[uniform_index + 1]
+                    u1 = uniformes[uniform_index]
+                    u2 = uniformes[uniform_index + 1]
                     uniform_index += 2 # Consume two uniforms per pair
 
                     if u1 == 0: u1 = 1e-10 # Avoid log(0)
@@ -820,7 +1150,7 @@ class GeneradorPseudoaleatorio:
                     if uniform_index >= cantidad_uniformes_disponibles:
                         self.procedimiento_distribucion_texto += "  No quedan números uniformes para completar la muestra. Deteniendo.\n"
                         break
-                    u = self.numeros_generados_uniformes[uniform_index]
+                    u = uniformes[uniform_index]
                     uniform_index += 1
                     if u == 1: u = 0.999999 # Avoid log(0)
                     x_val = - (1/lam) * np.log(1 - u)
@@ -847,7 +1177,7 @@ class GeneradorPseudoaleatorio:
                         break
 
                     for j in range(n_trials_per_sample):
-                        u_val = self.numeros_generados_uniformes[uniform_index]
+                        u_val = uniformes[uniform_index]
                         uniforms_for_this_sample.append(u_val)
                         uniform_index += 1
                         if u_val <= p_success:
@@ -859,6 +1189,7 @@ class GeneradorPseudoaleatorio:
                     # Store the first uniform of the set used for this sample, and the generated value
                     display_ri1 = uniforms_for_this_sample[0] if uniforms_for_this_sample else float('nan')
                     self.numeros_generados_distribucion_data.append((display_ri1, None, successes))
+                    frecuencias.contar(successes)
                     self.procedimiento_distribucion_texto += f"  Uniformes usados para esta muestra: {', '.join([f'{u:.4f}' for u in uniforms_for_this_sample])}\n" # Detailed display
                     self.procedimiento_distribucion_texto += f"  Total éxitos para esta muestra: {successes}\n\n"
                 
@@ -885,7 +1216,7 @@ class GeneradorPseudoaleatorio:
                     if uniform_index >= cantidad_uniformes_disponibles:
                         self.procedimiento_distribucion_texto += "  No quedan números uniformes para completar la muestra. Deteniendo.\n"
                         break
-                    u_val = self.numeros_generados_uniformes[uniform_index]
+                    u_val = uniformes[uniform_index]
                     uniform_index += 1
                     self.procedimiento_distribucion_texto += f"Muestra Poisson {i+1}: U = {u_val:.4f}\n"
                     generated_x = -1
@@ -910,6 +1241,7 @@ class GeneradorPseudoaleatorio:
                         generated_x = k_max
                         self.procedimiento_distribucion_texto += f"  U={u_val:.4f} excede todas las probabilidades. Asignando k_max ({k_max}).\n\n"
                     self.numeros_generados_distribucion_data.append((u_val, None, generated_x)) # Store U1, U2 (None), X_val
+                    frecuencias.contar(generated_x)
 
 
             elif distribucion == "Geométrica":
@@ -927,26 +1259,706 @@ class GeneradorPseudoaleatorio:
                     if uniform_index >= cantidad_uniformes_disponibles:
                         self.procedimiento_distribucion_texto += "  No quedan números uniformes para completar la muestra. Deteniendo.\n"
                         break
-                    u = self.numeros_generados_uniformes[uniform_index]
+                    u = uniformes[uniform_index]
                     uniform_index += 1
                     if u == 1: u = 0.999999 # Avoid log(0) for ln(1-U)
                     val_ln_1_minus_u = np.log(1 - u)
                     x_val_float = val_ln_1_minus_u / ln_one_minus_p
                     x_val = np.floor(x_val_float) + 1
                     self.numeros_generados_distribucion_data.append((u, None, int(x_val))) # Store U1, U2 (None), X_val
+                    frecuencias.contar(int(x_val))
                     self.procedimiento_distribucion_texto += f"R_{{{i+1}}}={u:.4f} -> $X_{{{i+1}}} = ⌊\\ln(1 - {u:.4f})/\\ln(1 - {p:.2f})⌋ + 1 = ⌊{val_ln_1_minus_u:.4f}/{ln_one_minus_p:.4f}⌋ + 1 = {int(x_val)}$\n"
 
 
+            else:
+                # Registry families without a step-by-step procedure use their vectorized sampler
+                self.procedimiento_distribucion_texto += f"Método: {familia.metodo}\n\n"
+                u = np.asarray(uniformes, dtype=float)
+                if familia.consumo_fijo:
+                    uniform_index = filas_muestreo * uniformes_por_fila
+                    valores = familia.transformar(params, u[:uniform_index], N_dist_samples).tolist()
+                    if self.columnas_uniformes_distribucion == "par":
+                        filas = [(u[2 * (i // 2)], u[2 * (i // 2) + 1]) for i in range(N_dist_samples)]
+                    else:
+                        filas = [(u[i * uniformes_por_fila], None) for i in range(N_dist_samples)]
+                else:
+                    # If rejection runs past the displayed uniforms, the generator's sequence continues
+                    config = self.leer_configuracion_generador()
+                    if config is None:
+                        return
+                    if config["metodo"] == "archivo":
+                        config["inicio"] = len(u)
+                    elif config["metodo"] != "estandar":
+                        config["x0"] = int(self.valores_x_congruencial[-1])
+                    fuente = FuenteUniformes(itertools.chain([u], FuenteUniformes.desde_generador(config, 4096).bloques))
+                    valores = familia.muestrear_bloque(params, fuente, N_dist_samples).tolist()
+                    uniform_index = fuente.consumidos
+                    filas = [(None, None)] * N_dist_samples
+                    self.procedimiento_distribucion_texto += f"Uniformes consumidos por el método de rechazo: {uniform_index} ({uniform_index / N_dist_samples:.3f} por valor)\n"
+                    if uniform_index > len(u):
+                        self.procedimiento_distribucion_texto += f"  {uniform_index - len(u)} de ellos continúan la secuencia del generador (o del archivo) más allá de la tabla de uniformes.\n"
+                    self.procedimiento_distribucion_texto += "\n"
+                if frecuencias is not None:
+                    frecuencias.agregar(valores)
+
+                for i, ((u1, u2), x_val) in enumerate(zip(filas, valores)):
+                    self.numeros_generados_distribucion_data.append((u1, u2, x_val))
+                    x_str = f"{x_val:.4f}" if isinstance(x_val, float) else str(x_val)
+                    if u2 is not None:
+                        usados = f"U1={u1:.4f}, U2={u2:.4f} -> "
+                    elif u1 is not None:
+                        usados = f"R={u1:.4f} -> "
+                    else:
+                        usados = ""
+                    self.procedimiento_distribucion_texto += f"Muestra {i+1}: {usados}X = {x_str}\n"
+
+
             # Extract only the generated X values for plotting and summary statistics
             # This is created from numeros_generados_distribucion_data for convenience
             self.numeros_generados_distribucion = [item[2] for item in self.numeros_generados_distribucion_data]
+            # Discrete results are summarized and plotted from one integer frequency table
+            self.frecuencias_discretas = frecuencias.tabla if frecuencias is not None else None
+            self.instrumentacion.cerrar_etapa(valores=len(self.numeros_generados_distribucion), uniformes_usados=uniform_index)
+
+            self.resultado_bondad_ajuste = None
+            if modo_muestreo in MODOS_DEPENDIENTES:
+                # χ², KS and AD assume an i.i.d. sample; their p-values mean nothing here
+                self.resultado_bondad_ajuste = {'omitida': f"las muestras del modo {modo_muestreo} no son independientes, "
+                                                           "así que las distribuciones nulas de las pruebas no aplican."}
+            elif self.numeros_generados_distribucion:
+                with self.instrumentacion.etapa("Bondad de ajuste") as conteos:
+                    self.resultado_bondad_ajuste = pruebas_bondad_ajuste(distribucion, params, valores=self.numeros_generados_distribucion,
+                                                                         frecuencias=self.frecuencias_discretas)
+                    conteos['valores'] = len(self.numeros_generados_distribucion)
+
+            self.resultado_reduccion_varianza = None
+            if modo_muestreo != MODO_SIMPLE:
+                with self.instrumentacion.etapa("Reducción de varianza") as conteos:
+                    self.resultado_reduccion_varianza = estimar_reduccion_varianza(
+                        self.numeros_generados_distribucion, modo_muestreo, filas_muestreo,
+                        uniformes_modo=uniformes, k=uniformes_por_fila,
+                        valores_por_fila=2 if familia.estructura is pares_box_muller else 1,
+                        box_muller=familia.estructura is pares_box_muller)
+                    conteos['valores'] = len(self.numeros_generados_distribucion)
 
             self.actualizar_tablas_y_graficos_distribucion(distribucion, params)
             self.notebook.select(self.tab_distribucion)
 
+            if clave_cache is not None:
+                with self.instrumentacion.etapa("Caché de resultados (escritura)"):
+                    self.guardar_resultado_cache(clave_cache, distribucion)
+
         except Exception as e:
             messagebox.showerror("Error de Generación", f"Ocurrió un error al generar la variable aleatoria: {e}")
 
+    def iniciar_convergencia(self):
+        distribucion = self.distribucion_var.get()
+        if not distribucion:
+            messagebox.showerror("Error", "Por favor, seleccione un tipo de distribución.")
+            return
+        params_raw = {key: entry.get() for key, entry in self.dist_param_entries.items()}
+        es_valido, params = self.validar_parametros_distribucion(distribucion, params_raw)
+        if not es_valido:
+            return
+        config = self.leer_configuracion_generador()
+        if config is None:
+            return
+        try:
+            n_total = int(self.entries_uniform_params["Cantidad (N)"].get())
+            tamano_bloque = int(self.entry_bloque_convergencia.get())
+            if n_total <= 0 or tamano_bloque <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "La cantidad (N) y el tamaño de bloque deben ser enteros positivos.")
+            return
+        # Box-Muller consumes uniforms in pairs, so keep every block even
+        tamano_bloque += tamano_bloque % 2
+
+        self.convergencia_restantes = n_total
+        self.convergencia_bloque = tamano_bloque
+        dtype = PRECISIONES[self.precision_var.get()]
+        self.convergencia_fuente = FuenteUniformes.desde_generador(config, uniformes_requeridos(distribucion, params, tamano_bloque), dtype=dtype)
+        self.convergencia_muestreador = muestreador_distribucion(distribucion, params, dtype)
+        colores = {'relleno': self.accent_color, 'borde': self.primary_color, 'texto': self.text_color}
+        self.vista_convergencia = VistaConvergencia(self.figure_convergencia, self.canvas_convergencia, distribucion,
+                                                    modelo_teorico(distribucion, params), n_total, colores)
+        self.notebook.select(self.tab_convergencia)
+        self.convergencia_activa = True
+        self.root.after(1, self.paso_convergencia)
+
+    def paso_convergencia(self):
+        # One block per Tk callback keeps the window responsive during long runs
+        if not self.convergencia_activa:
+            return
+        n_bloque = min(self.convergencia_bloque, self.convergencia_restantes)
+        try:
+            valores = self.convergencia_muestreador(self.convergencia_fuente, n_bloque)
+        except ValueError as e: # Invalid parameters, or an imported file that ran out or holds values outside [0,1)
+            self.convergencia_activa = False
+            messagebox.showerror("Error de Generación", str(e))
+            return
+        self.vista_convergencia.agregar_bloque(valores)
+        self.convergencia_restantes -= n_bloque
+        if self.convergencia_restantes > 0:
+            self.root.after(1, self.paso_convergencia)
+        else:
+            self.convergencia_activa = False
+
+    def detener_convergencia(self):
+        self.convergencia_activa = False
+
+    def generar_a_archivo(self):
+        """Stream N variates to a file through the block pipeline; memory stays bounded by the block size"""
+        distribucion = self.distribucion_var.get()
+        if not distribucion:
+            messagebox.showerror("Error", "Por favor, seleccione un tipo de distribución.")
+            return
+        params_raw = {key: entry.get() for key, entry in self.dist_param_entries.items()}
+        es_valido, params = self.validar_parametros_distribucion(distribucion, params_raw)
+        if not es_valido:
+            return
+        config = self.leer_configuracion_generador()
+        if config is None:
+            return
+        try:
+            n_total = int(self.entries_uniform_params["Cantidad (N)"].get())
+            if n_total <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "La cantidad (N) debe ser un número entero positivo.")
+            return
+        ruta = filedialog.asksaveasfilename(defaultextension=".npy", filetypes=[("NumPy", "*.npy"), ("CSV", "*.csv")], title="Guardar variables generadas")
+        if not ruta:
+            return
+
+        precision = self.precision_var.get()
+        dtype = np.int64 if distribucion in DISCRETAS else PRECISIONES[precision]
+        sumideros = sumideros_resumen(distribucion, params)
+        # Continuous fits are tested from equiprobable-class counts, discrete ones from the frequency table
+        conteo_equiprobable = None if distribucion in DISCRETAS else ConteoEquiprobable(distribucion, params)
+        adicionales = [SumideroArchivo(ruta, n_total, dtype)] if conteo_equiprobable is None else [conteo_equiprobable, SumideroArchivo(ruta, n_total, dtype)]
+        try:
+            ejecutar_flujo(muestreador_distribucion(distribucion, params, PRECISIONES[precision]),
+                           FuenteUniformes.desde_generador(config, dtype=PRECISIONES[precision]),
+                           n_total, sumideros + adicionales)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Error de Generación", f"No se pudo generar el archivo: {e}")
+            return
+        estadisticas, distribucion_muestral = sumideros
+        modelo = modelo_teorico(distribucion, params)
+
+        self.dist_title_label.config(text=f"Resumen de Distribución {distribucion} (archivo)")
+        self.tabla_distribucion.delete(1.0, tk.END)
+        resumen = f"{'='*40}\n"
+        resumen += f"{'RESUMEN ESTADÍSTICO':^40}\n"
+        resumen += f"{'='*40}\n"
+        resumen += f"Archivo: {ruta}\n"
+        resumen += f"Total de valores generados: {estadisticas.n}\n"
+        resumen += f"Precisión: {precision} (sumas acumuladas en float64)\n"
+        resumen += f"Media generada: {estadisticas.media:.6f} (teórica {modelo.mean():.6f})\n"
+        resumen += f"Varianza generada: {estadisticas.varianza:.6f} (teórica {modelo.var():.6f})\n"
+        resumen += f"Mínimo: {estadisticas.minimo:.6f}\n"
+        resumen += f"Máximo: {estadisticas.maximo:.6f}\n"
+        resumen += f"{'='*40}\n"
+        if distribucion in DISCRETAS:
+            resultado = pruebas_bondad_ajuste(distribucion, params, frecuencias=(distribucion_muestral.minimo, distribucion_muestral.conteos))
+        else:
+            resultado = pruebas_bondad_ajuste(distribucion, params, conteo_equiprobable=conteo_equiprobable)
+        resumen += texto_bondad_ajuste(resultado)
+        self.tabla_distribucion.insert(tk.END, resumen)
+        self.procedimiento_distribucion_text_widget.delete(1.0, tk.END)
+        self.procedimiento_distribucion_text_widget.insert(tk.END, f"Generación por bloques de {n_total} valores de {distribucion}.\nParámetros: {params_raw}\nEl procedimiento paso a paso no se construye en este modo.\n")
+
+        self.ax_distribucion.clear()
+        self.ax_distribucion.set_title(f"Histograma de Distribución {distribucion}", color=self.text_color)
+        if distribucion in DISCRETAS:
+            soporte = np.arange(distribucion_muestral.minimo, distribucion_muestral.minimo + len(distribucion_muestral.conteos))
+            self.ax_distribucion.bar(soporte, distribucion_muestral.conteos / estadisticas.n, width=0.8, color=self.accent_color, edgecolor=self.primary_color, alpha=0.7)
+            self.ax_distribucion.plot(soporte, modelo.pmf(soporte), 'ro', markersize=6, label="PMF Teórica")
+            self.ax_distribucion.xaxis.set_major_locator(plt.MaxNLocator(integer=True, nbins=min(max(len(soporte), 1), 12)))
+        else:
+            bordes = distribucion_muestral.bordes
+            self.ax_distribucion.stairs(distribucion_muestral.densidades(), bordes, fill=True, color=self.accent_color, alpha=0.7)
+            x_axis = np.linspace(bordes[0], bordes[-1], 200)
+            self.ax_distribucion.plot(x_axis, modelo.pdf(x_axis), color='red', linestyle='dashed', linewidth=2, label="PDF Teórica")
+        self.ax_distribucion.legend()
+        self.canvas_distribucion.draw()
+        self.notebook.select(self.tab_distribucion)
+
+    def seleccionar_archivo_uniformes(self):
+        ruta = filedialog.askopenfilename(title="Importar uniformes",
+                                          filetypes=[("Uniformes", "*.npy *.bin *.raw *.f64 *.f32 *.csv *.txt"), ("Todos", "*.*")])
+        if not ruta:
+            return
+        # One vectorized pass over the whole file, so bad values are reported now rather than mid-run
+        self.barra_estado_var.set(f"Validando {os.path.basename(ruta)}...")
+        self.root.update_idletasks()
+        try:
+            cantidad, minimo, maximo = ArchivoUniformes(ruta).validar()
+        except ErrorArchivoUniformes as e:
+            self.barra_estado_var.set("Listo")
+            messagebox.showerror("Error de Archivo", str(e))
+            return
+        self.ruta_archivo_uniformes = ruta
+        self.archivo_uniformes_var.set(f"{os.path.basename(ruta)}: {cantidad} valores")
+        self.barra_estado_var.set(f"{os.path.basename(ruta)}: {cantidad} uniformes en [{minimo:.6f}, {maximo:.6f}]")
+
+    def leer_configuracion_generador(self):
+        """Generator settings from the left panel as a dict for headless runs (None if invalid)"""
+        metodo = self.metodo_uniforme_var.get()
+        if metodo == "estandar":
+            return {"metodo": metodo}
+        if metodo == "archivo":
+            if self.ruta_archivo_uniformes is None:
+                messagebox.showerror("Error de Entrada", "Seleccione primero un archivo de uniformes.")
+                return None
+            return {"metodo": metodo, "ruta": self.ruta_archivo_uniformes}
+        try:
+            config = {"metodo": metodo,
+                      "x0": int(self.entries_uniform_params["Semilla (X₀)"].get()),
+                      "a": int(self.entries_uniform_params["Constante (a)"].get()),
+                      "m": int(self.entries_uniform_params["Módulo (m)"].get()),
+                      "c": int(self.entries_uniform_params["Constante (c)"].get()) if metodo == "mixto" else 0}
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "Asegúrese de que X₀, a, c y m sean números enteros válidos.")
+            return None
+        if not self.validar_parametros_uniformes(config["x0"], config["a"], config["c"], config["m"], 1, metodo):
+            return None
+        return config
+
+    def abrir_ventana_barrido(self):
+        distribucion = self.distribucion_var.get()
+        if not distribucion:
+            messagebox.showerror("Error", "Por favor, seleccione un tipo de distribución.")
+            return
+
+        barrido_window = tk.Toplevel(self.root)
+        barrido_window.title(f"Barrido de Parámetros - {distribucion}")
+        barrido_window.geometry("1100x800")
+        barrido_window.configure(bg=self.bg_color)
+
+        controles = ttk.LabelFrame(barrido_window, text="Rejilla de parámetros", style='TLabelframe')
+        controles.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(controles, text="Valores: 'inicio:fin:pasos' o lista 'v1,v2,...'. Se usa el generador de uniformes del panel principal.", style='TLabel').pack(anchor=tk.W, padx=10, pady=(5, 5))
+
+        entradas = {}
+        for nombre, entry in self.dist_param_entries.items():
+            row_frame = ttk.Frame(controles, style='TFrame')
+            row_frame.pack(fill=tk.X, pady=2, padx=10)
+            ttk.Label(row_frame, text=f"{nombre}:", width=22, anchor=tk.W, style='TLabel').pack(side=tk.LEFT, padx=5)
+            entrada = ttk.Entry(row_frame, width=30, style='TEntry')
+            entrada.insert(0, entry.get())
+            entrada.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+            entradas[nombre] = entrada
+
+        opciones_frame = ttk.Frame(controles, style='TFrame')
+        opciones_frame.pack(fill=tk.X, pady=5, padx=10)
+        ttk.Label(opciones_frame, text="Muestras por punto:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        entrada_n = ttk.Entry(opciones_frame, width=10, style='TEntry')
+        entrada_n.insert(0, self.entries_uniform_params["Cantidad (N)"].get())
+        entrada_n.pack(side=tk.LEFT, padx=5)
+        ttk.Label(opciones_frame, text="Procesos:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        entrada_procesos = ttk.Entry(opciones_frame, width=6, style='TEntry')
+        entrada_procesos.insert(0, str(os.cpu_count() or 1))
+        entrada_procesos.pack(side=tk.LEFT, padx=5)
+
+        tabla_barrido = scrolledtext.ScrolledText(barrido_window, wrap=tk.NONE, height=10, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        figura_barrido = plt.Figure(figsize=(10, 6), dpi=100)
+        canvas_barrido = FigureCanvasTkAgg(figura_barrido, master=barrido_window)
+        resultados_barrido = []
+
+        def ejecutar():
+            config = self.leer_configuracion_generador()
+            if config is None:
+                return
+            try:
+                rejilla = {nombre: interpretar_valores(entrada.get()) for nombre, entrada in entradas.items()}
+                n = int(entrada_n.get())
+                procesos = int(entrada_procesos.get())
+                if n <= 0 or procesos <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error de Entrada", "Revise los valores de la rejilla, las muestras por punto y los procesos.", parent=barrido_window)
+                return
+            try:
+                resultados = ejecutar_barrido(distribucion, rejilla, n, config, procesos=procesos, precision=self.precision_var.get())
+            except ValueError as e:
+                messagebox.showerror("Error de Validación", str(e), parent=barrido_window)
+                return
+            resultados_barrido[:] = resultados
+            tabla_barrido.delete(1.0, tk.END)
+            tabla_barrido.insert(tk.END, tabla_texto(resultados))
+            graficar_multiples(distribucion, resultados, figura_barrido)
+            canvas_barrido.draw()
+
+        def exportar():
+            if not resultados_barrido:
+                messagebox.showwarning("Advertencia", "Ejecute el barrido antes de exportar.", parent=barrido_window)
+                return
+            ruta = filedialog.asksaveasfilename(parent=barrido_window, defaultextension=".csv", filetypes=[("CSV", "*.csv")], title="Exportar barrido")
+            if ruta:
+                exportar_csv(resultados_barrido, ruta)
+
+        botones_frame = ttk.Frame(controles, style='TFrame')
+        botones_frame.pack(fill=tk.X, pady=5, padx=10)
+        ttk.Button(botones_frame, text="Ejecutar Barrido", command=ejecutar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botones_frame, text="Exportar CSV", command=exportar).pack(side=tk.LEFT, padx=5)
+
+        tabla_barrido.pack(fill=tk.X, padx=10, pady=5)
+        canvas_barrido.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    def abrir_ventana_busqueda_multiplicadores(self):
+        busqueda_window = tk.Toplevel(self.root)
+        busqueda_window.title("Búsqueda de Multiplicadores (periodo máximo + prueba espectral)")
+        busqueda_window.geometry("1000x600")
+        busqueda_window.configure(bg=self.bg_color)
+
+        controles = ttk.LabelFrame(busqueda_window, text="Parámetros de búsqueda", style='TLabelframe')
+        controles.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(controles, text="Candidatos de periodo máximo por teoría de números, ordenados por M = min S_t de la prueba espectral (1 es ideal).", style='TLabel').pack(anchor=tk.W, padx=10, pady=(5, 5))
+
+        metodo_busqueda_var = tk.StringVar(value="multiplicativo" if self.metodo_uniforme_var.get() == "multiplicativo" else "mixto")
+        metodo_frame = ttk.Frame(controles, style='TFrame')
+        metodo_frame.pack(fill=tk.X, pady=2, padx=10)
+        ttk.Radiobutton(metodo_frame, text="Congruencial Mixto", variable=metodo_busqueda_var, value="mixto", style='TRadiobutton').pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(metodo_frame, text="Congruencial Multiplicativo", variable=metodo_busqueda_var, value="multiplicativo", style='TRadiobutton').pack(side=tk.LEFT, padx=5)
+
+        opciones_frame = ttk.Frame(controles, style='TFrame')
+        opciones_frame.pack(fill=tk.X, pady=5, padx=10)
+        entradas = {}
+        for etiqueta, valor, ancho in [("Módulo (m):", self.entries_uniform_params["Módulo (m)"].get() or "2147483647", 22),
+                                       ("Candidatos:", "100", 8), ("Dimensión máx.:", str(DIMENSION_MAXIMA), 4),
+                                       ("Procesos:", str(os.cpu_count() or 1), 6)]:
+            ttk.Label(opciones_frame, text=etiqueta, style='TLabel').pack(side=tk.LEFT, padx=5)
+            entrada = ttk.Entry(opciones_frame, width=ancho, style='TEntry')
+            entrada.insert(0, valor)
+            entrada.pack(side=tk.LEFT, padx=5)
+            entradas[etiqueta] = entrada
+
+        tabla_busqueda = scrolledtext.ScrolledText(busqueda_window, wrap=tk.NONE, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        resultados_busqueda = []
+
+        def buscar():
+            try:
+                m = int(entradas["Módulo (m):"].get())
+                cantidad = int(entradas["Candidatos:"].get())
+                dimension = int(entradas["Dimensión máx.:"].get())
+                procesos = int(entradas["Procesos:"].get())
+                if cantidad <= 0 or procesos <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error de Entrada", "Revise el módulo, los candidatos, la dimensión y los procesos.", parent=busqueda_window)
+                return
+            try:
+                resultados, periodo = buscar_multiplicadores(m, metodo_busqueda_var.get(), cantidad, dimension, procesos)
+            except ValueError as e:
+                messagebox.showerror("Error de Validación", str(e), parent=busqueda_window)
+                return
+            resultados_busqueda[:] = [(m, metodo_busqueda_var.get(), r) for r in resultados]
+            tabla_busqueda.delete(1.0, tk.END)
+            tabla_busqueda.insert(tk.END, tabla_multiplicadores(resultados, periodo))
+
+        def usar_mejor():
+            if not resultados_busqueda:
+                messagebox.showwarning("Advertencia", "Ejecute la búsqueda antes de aplicar un multiplicador.", parent=busqueda_window)
+                return
+            m, metodo, mejor = resultados_busqueda[0]
+            self.metodo_uniforme_var.set(metodo)
+            self.actualizar_parametros_uniformes()
+            for etiqueta, valor in [("Módulo (m)", m), ("Constante (a)", mejor['a'])]:
+                self.entries_uniform_params[etiqueta].delete(0, tk.END)
+                self.entries_uniform_params[etiqueta].insert(0, str(valor))
+            if metodo == "mixto":
+                try:
+                    c_actual = int(self.entries_uniform_params["Constante (c)"].get())
+                except ValueError:
+                    c_actual = None
+                self.entries_uniform_params["Constante (c)"].delete(0, tk.END)
+                self.entries_uniform_params["Constante (c)"].insert(0, str(incremento_sugerido(m, c_actual)))
+
+        botones_frame = ttk.Frame(controles, style='TFrame')
+        botones_frame.pack(fill=tk.X, pady=5, padx=10)
+        ttk.Button(botones_frame, text="Buscar", command=buscar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botones_frame, text="Usar el Mejor", command=usar_mejor).pack(side=tk.LEFT, padx=5)
+
+        tabla_busqueda.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    def abrir_ventana_densidad_personalizada(self):
+        rechazo_window = tk.Toplevel(self.root)
+        rechazo_window.title("Aceptación-Rechazo para una Densidad f(x)")
+        rechazo_window.geometry("1000x700")
+        rechazo_window.configure(bg=self.bg_color)
+
+        controles = ttk.LabelFrame(rechazo_window, text="Densidad y envolvente", style='TLabelframe')
+        controles.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(controles, text="f(x) no necesita estar normalizada. Funciones: exp, log, sqrt, abs, sin, cos, tan, where, ...; constantes pi y e; potencia con ^ o **.", style='TLabel').pack(anchor=tk.W, padx=10, pady=(5, 5))
+
+        expresion_frame = ttk.Frame(controles, style='TFrame')
+        expresion_frame.pack(fill=tk.X, pady=2, padx=10)
+        ttk.Label(expresion_frame, text="f(x) =", style='TLabel').pack(side=tk.LEFT, padx=5)
+        entrada_expresion = ttk.Entry(expresion_frame, width=60, style='TEntry')
+        entrada_expresion.insert(0, "exp(-x^2/2) * (1 + sin(3*x)^2)")
+        entrada_expresion.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+        opciones_frame = ttk.Frame(controles, style='TFrame')
+        opciones_frame.pack(fill=tk.X, pady=5, padx=10)
+        entradas = {}
+        for etiqueta, valor, ancho in [("Mínimo (a):", "-5", 8), ("Máximo (b):", "5", 8),
+                                       ("Tramos:", str(TRAMOS_POR_DEFECTO), 6),
+                                       ("Cantidad (N):", self.entries_uniform_params["Cantidad (N)"].get() or "100000", 12)]:
+            ttk.Label(opciones_frame, text=etiqueta, style='TLabel').pack(side=tk.LEFT, padx=5)
+            entrada = ttk.Entry(opciones_frame, width=ancho, style='TEntry')
+            entrada.insert(0, valor)
+            entrada.pack(side=tk.LEFT, padx=5)
+            entradas[etiqueta] = entrada
+        envolvente_var = tk.StringVar(value="Por tramos")
+        ttk.Label(opciones_frame, text="Envolvente:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(opciones_frame, textvariable=envolvente_var, values=["Por tramos", "Constante"], width=12,
+                     state="readonly", style='TCombobox').pack(side=tk.LEFT, padx=5)
+
+        resumen_rechazo = scrolledtext.ScrolledText(rechazo_window, wrap=tk.NONE, height=16, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        figura_rechazo = Figure(figsize=(8, 4), dpi=100)
+        canvas_rechazo = FigureCanvasTkAgg(figura_rechazo, master=rechazo_window)
+
+        def generar():
+            try:
+                a = float(entradas["Mínimo (a):"].get())
+                b = float(entradas["Máximo (b):"].get())
+                tramos = 1 if envolvente_var.get() == "Constante" else int(entradas["Tramos:"].get())
+                n = int(entradas["Cantidad (N):"].get())
+                if n <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error de Entrada", "Revise el soporte, los tramos y la cantidad (N).", parent=rechazo_window)
+                return
+            config = self.leer_configuracion_generador()
+            if config is None:
+                return
+            try:
+                muestreador = MuestreadorRechazo(entrada_expresion.get(), a, b, tramos)
+                # Candidates come from the generator configured in the main window
+                fuente = FuenteUniformes.desde_generador(config, dtype=PRECISIONES[self.precision_var.get()])
+                inicio = time.perf_counter()
+                valores = muestreador.muestrear(fuente, n)
+                segundos = time.perf_counter() - inicio
+            except ValueError as e:
+                messagebox.showerror("Error de Generación", str(e), parent=rechazo_window)
+                return
+            resumen_rechazo.delete(1.0, tk.END)
+            resumen_rechazo.insert(tk.END, texto_resumen_rechazo(muestreador, valores, segundos))
+
+            figura_rechazo.clear()
+            ax = figura_rechazo.add_subplot(111)
+            ax.hist(valores, bins=min(100, max(10, int(np.sqrt(n)))), range=(a, b), density=True,
+                    color=self.accent_color, edgecolor=self.primary_color, alpha=0.7, label="Muestra")
+            x, y = muestreador.rejilla
+            ax.plot(x, y / muestreador.integral, color='red', linewidth=2, label="f(x) normalizada")
+            ax.stairs(muestreador.alturas / muestreador.integral, muestreador.bordes, color=self.text_color,
+                      linestyle='dashed', label="Envolvente")
+            ax.set_title(f"Aceptación-rechazo: tasa {muestreador.tasa_observada:.3f}", color=self.text_color)
+            ax.legend()
+            canvas_rechazo.draw()
+
+        botones_frame = ttk.Frame(controles, style='TFrame')
+        botones_frame.pack(fill=tk.X, pady=5, padx=10)
+        ttk.Button(botones_frame, text="Generar", command=generar).pack(side=tk.LEFT, padx=5)
+
+        resumen_rechazo.pack(fill=tk.X, padx=10, pady=5)
+        canvas_rechazo.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    def abrir_ventana_normal_multivariada(self):
+        multivariada_window = tk.Toplevel(self.root)
+        multivariada_window.title("Normal Multivariada N(μ, Σ)")
+        multivariada_window.geometry("1100x800")
+        multivariada_window.configure(bg=self.bg_color)
+
+        controles = ttk.LabelFrame(multivariada_window, text="Vector de medias y matriz de covarianza", style='TLabelframe')
+        controles.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(controles, text="Valores separados por comas o espacios; en Σ, una fila por línea (o filas separadas por ;). Σ puede ser semidefinida.", style='TLabel').pack(anchor=tk.W, padx=10, pady=(5, 5))
+
+        media_frame = ttk.Frame(controles, style='TFrame')
+        media_frame.pack(fill=tk.X, pady=2, padx=10)
+        ttk.Label(media_frame, text="μ =", style='TLabel').pack(side=tk.LEFT, padx=5)
+        entrada_media = ttk.Entry(media_frame, width=40, style='TEntry')
+        entrada_media.insert(0, "0, 1, -1")
+        entrada_media.pack(side=tk.LEFT, padx=5)
+        ttk.Label(media_frame, text="Cantidad (N):", style='TLabel').pack(side=tk.LEFT, padx=5)
+        entrada_n = ttk.Entry(media_frame, width=12, style='TEntry')
+        entrada_n.insert(0, self.entries_uniform_params["Cantidad (N)"].get() or "100000")
+        entrada_n.pack(side=tk.LEFT, padx=5)
+
+        covarianza_frame = ttk.Frame(controles, style='TFrame')
+        covarianza_frame.pack(fill=tk.X, pady=2, padx=10)
+        ttk.Label(covarianza_frame, text="Σ =", style='TLabel').pack(side=tk.LEFT, anchor=tk.N, padx=5)
+        entrada_covarianza = tk.Text(covarianza_frame, width=40, height=4, font=("Courier New", 10))
+        entrada_covarianza.insert(tk.END, "1, 0.8, -0.3\n0.8, 2, 0\n-0.3, 0, 0.5")
+        entrada_covarianza.pack(side=tk.LEFT, padx=5)
+
+        resumen_multivariada = scrolledtext.ScrolledText(multivariada_window, wrap=tk.NONE, height=14, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        figura_multivariada = Figure(figsize=(8, 6), dpi=100)
+        canvas_multivariada = FigureCanvasTkAgg(figura_multivariada, master=multivariada_window)
+
+        def generar(ruta=None):
+            try:
+                n = int(entrada_n.get())
+                if n <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error de Entrada", "La cantidad (N) debe ser un entero positivo.", parent=multivariada_window)
+                return
+            config = self.leer_configuracion_generador()
+            if config is None:
+                return
+            dtype = PRECISIONES[self.precision_var.get()]
+            try:
+                modelo = NormalMultivariada(leer_vector(entrada_media.get()),
+                                            leer_matriz(entrada_covarianza.get(1.0, tk.END)), dtype)
+                # Normals come from the generator configured in the main window, in blocks
+                fuente = FuenteUniformes.desde_generador(config, dtype=dtype)
+                acumulador, histogramas, segundos = generar_multivariada(modelo, fuente, n, ruta)
+            except (ValueError, OSError) as e:
+                messagebox.showerror("Error de Generación", str(e), parent=multivariada_window)
+                return
+            resumen_multivariada.delete(1.0, tk.END)
+            resumen_multivariada.insert(tk.END, texto_resumen_multivariada(modelo, acumulador, segundos))
+            if ruta:
+                resumen_multivariada.insert(tk.END, f"Vectores guardados en: {ruta}\n")
+            self.dibujar_densidades_pares(figura_multivariada, modelo, acumulador, histogramas)
+            canvas_multivariada.draw()
+
+        def generar_a_archivo():
+            ruta = filedialog.asksaveasfilename(defaultextension=".npy", filetypes=[("NumPy", "*.npy"), ("CSV", "*.csv")],
+                                                title="Guardar vectores generados", parent=multivariada_window)
+            if ruta:
+                generar(ruta)
+
+        botones_frame = ttk.Frame(controles, style='TFrame')
+        botones_frame.pack(fill=tk.X, pady=5, padx=10)
+        ttk.Button(botones_frame, text="Generar", command=generar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(botones_frame, text="Generar a Archivo...", command=generar_a_archivo).pack(side=tk.LEFT, padx=5)
+
+        resumen_multivariada.pack(fill=tk.X, padx=10, pady=5)
+        canvas_multivariada.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    def dibujar_densidades_pares(self, figura, modelo, acumulador, histogramas):
+        """Histogram per component on the diagonal, pair densities below it, correlations above it"""
+        figura.clear()
+        figura.patch.set_facecolor(self.frame_bg)
+        d = histogramas.dimension
+        correlacion = acumulador.correlacion
+        for i in range(d):
+            for j in range(d):
+                ax = figura.add_subplot(d, d, i * d + j + 1)
+                ax.tick_params(colors=self.text_color, labelsize=7)
+                if i == j:
+                    bordes, densidad = histogramas.densidad_marginal(i)
+                    ax.stairs(densidad, bordes, fill=True, color=self.accent_color, alpha=0.7)
+                    if modelo.desviaciones[i] > 0:
+                        x = np.linspace(bordes[0], bordes[-1], 200)
+                        z = (x - modelo.media[i]) / modelo.desviaciones[i]
+                        ax.plot(x, np.exp(-z * z / 2) / (modelo.desviaciones[i] * np.sqrt(2 * np.pi)), color='red', linewidth=1)
+                    ax.set_yticks([])
+                elif i > j:
+                    ax.imshow(histogramas.pares[(i, j)], origin='lower', extent=histogramas.rangos[j] + histogramas.rangos[i],
+                              aspect='auto', cmap='viridis', interpolation='nearest')
+                else:
+                    ax.text(0.5, 0.5, f"ρ = {correlacion[i, j]:.3f}\n({modelo.correlacion[i, j]:.3f})", ha='center', va='center',
+                            transform=ax.transAxes, color=self.text_color)
+                    ax.set_xticks([])
+                    ax.set_yticks([])
+                if i == d - 1:
+                    ax.set_xlabel(f"X{j + 1}", color=self.text_color)
+                if j == 0:
+                    ax.set_ylabel(f"X{i + 1}", color=self.text_color)
+        if modelo.dimension > d:
+            figura.suptitle(f"Primeras {d} de {modelo.dimension} componentes", color=self.text_color)
+        figura.tight_layout()
+
+    def abrir_ventana_colas(self):
+        distribucion = self.distribucion_var.get()
+        if not distribucion:
+            messagebox.showerror("Error", "Seleccione la distribución del tiempo de servicio en el panel principal.")
+            return
+        params_raw = {key: entry.get() for key, entry in self.dist_param_entries.items()}
+        es_valido, params = self.validar_parametros_distribucion(distribucion, params_raw)
+        if not es_valido:
+            return
+
+        colas_window = tk.Toplevel(self.root)
+        colas_window.title(f"Simulación de Colas - servicio {distribucion}")
+        colas_window.geometry("1000x800")
+        colas_window.configure(bg=self.bg_color)
+
+        controles = ttk.LabelFrame(colas_window, text="Llegadas, servidores y capacidad", style='TLabelframe')
+        controles.pack(fill=tk.X, padx=10, pady=10)
+        detalle = ", ".join(f"{nombre} = {valor}" for nombre, valor in params_raw.items())
+        ttk.Label(controles, text=f"Tiempo de servicio: {distribucion} ({detalle}), del panel principal. Llegadas de Poisson de tasa λ; capacidad vacía = infinita.", style='TLabel').pack(anchor=tk.W, padx=10, pady=(5, 5))
+
+        opciones_frame = ttk.Frame(controles, style='TFrame')
+        opciones_frame.pack(fill=tk.X, pady=5, padx=10)
+        entradas = {}
+        for etiqueta, valor, ancho in [("Tasa de llegadas (λ):", "0.9", 8), ("Servidores (c):", "1", 6),
+                                       ("Capacidad (K):", "", 6), ("Clientes (N):", "1000000", 12)]:
+            ttk.Label(opciones_frame, text=etiqueta, style='TLabel').pack(side=tk.LEFT, padx=5)
+            entrada = ttk.Entry(opciones_frame, width=ancho, style='TEntry')
+            entrada.insert(0, valor)
+            entrada.pack(side=tk.LEFT, padx=5)
+            entradas[etiqueta] = entrada
+        llegadas_var = tk.StringVar(value=METODOS_LLEGADA[0])
+        ttk.Label(opciones_frame, text="Llegadas:", style='TLabel').pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(opciones_frame, textvariable=llegadas_var, values=list(METODOS_LLEGADA), width=12,
+                     state="readonly", style='TCombobox').pack(side=tk.LEFT, padx=5)
+
+        resumen_colas = scrolledtext.ScrolledText(colas_window, wrap=tk.NONE, height=18, font=("Courier New", 10), bg="#f8f8f8", fg=self.text_color, relief=tk.FLAT)
+        figura_colas = Figure(figsize=(8, 4), dpi=100)
+        canvas_colas = FigureCanvasTkAgg(figura_colas, master=colas_window)
+
+        def simular():
+            try:
+                tasa = float(entradas["Tasa de llegadas (λ):"].get())
+                servidores = int(entradas["Servidores (c):"].get())
+                texto_capacidad = entradas["Capacidad (K):"].get().strip()
+                capacidad = int(texto_capacidad) if texto_capacidad else None
+                n = int(entradas["Clientes (N):"].get())
+                if n <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error de Entrada", "Revise λ, los servidores, la capacidad y la cantidad de clientes.", parent=colas_window)
+                return
+            config = self.leer_configuracion_generador()
+            if config is None:
+                return
+            try:
+                # Arrivals and service times come from the generator configured in the main window
+                simulador = simular_cola(tasa, distribucion, params, n, servidores, capacidad, config, llegadas=llegadas_var.get())
+            except ValueError as e:
+                messagebox.showerror("Error de Simulación", str(e), parent=colas_window)
+                return
+            teoria = teoria_cola(tasa, distribucion, params, servidores, capacidad)
+            resumen_colas.delete(1.0, tk.END)
+            resumen_colas.insert(tk.END, texto_resumen_cola(simulador, teoria, tasa, distribucion))
+
+            figura_colas.clear()
+            ax = figura_colas.add_subplot(111)
+            probabilidades = simulador.probabilidades_estado()[:40]
+            estados = np.arange(len(probabilidades))
+            ax.bar(estados, probabilidades, color=self.accent_color, edgecolor=self.primary_color, alpha=0.7, label="Simulada (vista por las llegadas)")
+            if teoria is not None and len(teoria['p']) > 1:
+                teoricas = teoria['p'][:len(probabilidades)]
+                ax.plot(np.arange(len(teoricas)), teoricas, 'o--', color='red', label=f"Teórica {teoria['modelo']}")
+            ax.set_title("Distribución del número de clientes en el sistema", color=self.text_color)
+            ax.set_xlabel("n", color=self.text_color)
+            ax.set_ylabel("P(n)", color=self.text_color)
+            ax.legend()
+            canvas_colas.draw()
+
+        botones_frame = ttk.Frame(controles, style='TFrame')
+        botones_frame.pack(fill=tk.X, pady=5, padx=10)
+        ttk.Button(botones_frame, text="Simular", command=simular).pack(side=tk.LEFT, padx=5)
+
+        resumen_colas.pack(fill=tk.X, padx=10, pady=5)
+        canvas_colas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
     def mostrar_tabla_poisson_pmf_cdf(self, lam):
         poisson_window = tk.Toplevel(self.root)
         poisson_window.title(f"Tabla de Probabilidad Poisson (λ={lam:.2f})")
@@ -979,16 +1991,35 @@ class GeneradorPseudoaleatorio:
                 break
 
 
+    def resumen_reduccion_varianza(self, distribucion, params):
+        resultado = self.resultado_reduccion_varianza
+        media_teorica = modelo_teorico(distribucion, params).mean()
+        resumen = f"{'REDUCCIÓN DE VARIANZA':^40}\n"
+        resumen += f"{'='*40}\n"
+        resumen += f"Modo de muestreo: {self.modo_muestreo_var.get()}\n"
+        if 'control' in resultado:
+            resumen += f"Controles: {resultado['control']}\n"
+        resumen += f"Media teórica: {media_teorica:.6f}\n"
+        resumen += f"Media estimada: {resultado['estimacion']:.6f}\n"
+        resumen += f"Error absoluto: {abs(resultado['estimacion'] - media_teorica):.6f}\n"
+        resumen += f"Var. estimador MC simple: {resultado['var_simple']:.6e}\n"
+        resumen += f"Var. estimador del modo: {resultado['var_modo']:.6e}\n"
+        resumen += f"Factor de reducción: {resultado['factor']:.4f}\n"
+        resumen += f"{'='*40}\n"
+        return resumen
+
     def actualizar_tablas_y_graficos_distribucion(self, distribucion, params):
         self.dist_title_label.config(text=f"Tabla de Resultados de Distribución {distribucion}")
+        self.instrumentacion.abrir_etapa("Tabla de distribución")
 
         self.tabla_distribucion.delete(1.0, tk.END)
         
-        # Adjust table header based on distribution type
-        if distribucion == "Normal":
+        # Adjust table header to the uniforms each value was built from
+        columnas = self.columnas_uniformes_distribucion
+        if columnas == "par":
             self.tabla_distribucion.insert(tk.END, f" N° | Ri (U1)    | Ri (U2)    | Valor Generado ({distribucion})\n")
             self.tabla_distribucion.insert(tk.END, "----|------------|------------|--------------------------\n")
-        elif distribucion == "Binomial":
+        elif columnas == "grupo":
             # For Binomial, we show the first Ri used and indicate it's from a group of 'n' uniforms
             self.tabla_distribucion.insert(tk.END, f" N° | Ri (1er Usado) | Valor Generado ({distribucion})\n")
             self.tabla_distribucion.insert(tk.END, "----|----------------|--------------------------\n")
@@ -1002,19 +2033,19 @@ class GeneradorPseudoaleatorio:
             dist_val = data_row[2] # The generated X value is always the 3rd element
             dist_val_str = f"{dist_val:.8f}" if isinstance(dist_val, float) else str(dist_val)
 
-            if distribucion == "Normal":
+            if columnas == "par":
                 u1_val = data_row[0]
                 u2_val = data_row[1]
                 u1_str = f"{u1_val:.8f}"
                 u2_str = f"{u2_val:.8f}"
                 fila = f"{i+1:>3} | {u1_str:>10} | {u2_str:>10} | {dist_val_str:^24}\n"
-            elif distribucion == "Binomial":
+            elif columnas == "grupo":
                 u1_val = data_row[0] # This is the first uniform used for the sample
                 u1_str = f"{u1_val:.8f}"
                 fila = f"{i+1:>3} | {u1_str:>14} | {dist_val_str:^24}\n"
             else:
-                u1_val = data_row[0]
-                u1_str = f"{u1_val:.8f}"
+                u1_val = data_row[0] # None for rejection samplers
+                u1_str = f"{u1_val:.8f}" if u1_val is not None else "N/A"
                 fila = f"{i+1:>3} | {u1_str:>10} | {dist_val_str:^24}\n"
             
             self.tabla_distribucion.insert(tk.END, fila)
@@ -1028,7 +2059,7 @@ class GeneradorPseudoaleatorio:
 
 
         if len(self.numeros_generados_distribucion) > 0:
-            if distribucion in ["Normal", "Exponencial"]:
+            if distribucion not in DISCRETAS:
                 mean_gen = np.mean(self.numeros_generados_distribucion)
                 std_gen = np.std(self.numeros_generados_distribucion)
                 resumen = f"\n{'='*40}\n"
@@ -1041,22 +2072,32 @@ class GeneradorPseudoaleatorio:
                 resumen += f"Máximo: {max(self.numeros_generados_distribucion):.6f}\n"
                 resumen += f"{'='*40}\n"
             else: # Discrete distributions
-                unique_values, counts = np.unique(self.numeros_generados_distribucion, return_counts=True)
-                mode_val = unique_values[np.argmax(counts)] if unique_values.size > 0 else "N/A"
+                estadisticos = resumen_frecuencias(*self.frecuencias_discretas)
                 resumen = f"\n{'='*40}\n"
                 resumen += f"{'RESUMEN ESTADÍSTICO':^40}\n"
                 resumen += f"{'='*40}\n"
-                resumen += f"Total de valores generados: {len(self.numeros_generados_distribucion)}\n"
-                resumen += f"Media generada: {np.mean(self.numeros_generados_distribucion):.4f}\n"
-                resumen += f"Moda: {mode_val}\n"
-                resumen += f"Mínimo: {min(self.numeros_generados_distribucion)}\n"
-                resumen += f"Máximo: {max(self.numeros_generados_distribucion)}\n"
+                resumen += f"Total de valores generados: {estadisticos['total']}\n"
+                resumen += f"Media generada: {estadisticos['media']:.4f}\n"
+                resumen += f"Moda: {estadisticos['moda']}\n"
+                resumen += f"Mínimo: {estadisticos['minimo']}\n"
+                resumen += f"Máximo: {estadisticos['maximo']}\n"
                 resumen += f"{'='*40}\n"
             self.tabla_distribucion.insert(tk.END, resumen)
 
-        self.procedimiento_distribucion_text_widget.delete(1.0, tk.END)
-        self.procedimiento_distribucion_text_widget.insert(tk.END, self.procedimiento_distribucion_texto)
+            if self.resultado_bondad_ajuste is not None:
+                self.tabla_distribucion.insert(tk.END, texto_bondad_ajuste(self.resultado_bondad_ajuste))
+
+            if self.resultado_reduccion_varianza is not None:
+                self.tabla_distribucion.insert(tk.END, self.resumen_reduccion_varianza(distribucion, params))
 
+        self.instrumentacion.cerrar_etapa(filas=len(self.numeros_generados_distribucion_data))
+
+        with self.instrumentacion.etapa("MathTextWidget.insert (distribución)") as conteos:
+            self.procedimiento_distribucion_text_widget.delete(1.0, tk.END)
+            self.procedimiento_distribucion_text_widget.insert(tk.END, self.procedimiento_distribucion_texto)
+            conteos['caracteres'] = len(self.procedimiento_distribucion_texto)
+
+        self.instrumentacion.abrir_etapa("Gráfico de distribución (canvas.draw)")
         self.ax_distribucion.clear()
         if self.numeros_generados_distribucion:
             self.ax_distribucion.set_title(f"Histograma de Distribución {distribucion}", color=self.text_color)
@@ -1068,55 +2109,155 @@ class GeneradorPseudoaleatorio:
             for spine in self.ax_distribucion.spines.values():
                 spine.set_edgecolor(self.text_color)
 
-            if distribucion in ["Normal", "Exponencial"]:
+            modelo = modelo_teorico(distribucion, params)
+            if distribucion not in DISCRETAS:
                 count, bins, ignored = self.ax_distribucion.hist(self.numeros_generados_distribucion, bins=30, density=True, color=self.accent_color, edgecolor=self.primary_color, alpha=0.7)
                 x_axis = np.linspace(min(self.numeros_generados_distribucion), max(self.numeros_generados_distribucion), 100)
-
-                if distribucion == "Normal":
-                    pdf = norm.pdf(x_axis, loc=params['loc'], scale=params['scale'])
-                    self.ax_distribucion.plot(x_axis, pdf, color='red', linestyle='dashed', linewidth=2, label="PDF Teórica")
-                elif distribucion == "Exponencial":
-                    pdf = expon.pdf(x_axis, scale=params['scale'])
-                    self.ax_distribucion.plot(x_axis, pdf, color='red', linestyle='dashed', linewidth=2, label="PDF Teórica")
+                self.ax_distribucion.plot(x_axis, modelo.pdf(x_axis), color='red', linestyle='dashed', linewidth=2, label="PDF Teórica")
             else: # Discrete distributions
-                unique_vals = np.unique(self.numeros_generados_distribucion)
-                if unique_vals.size > 0:
-                    min_val = min(unique_vals)
-                    max_val = max(unique_vals)
-                    # Adjust bins for discrete histogram to center bars on integer values
-                    bins = np.arange(min_val - 0.5, max_val + 1.5, 1)
-                    self.ax_distribucion.hist(self.numeros_generados_distribucion, bins=bins, density=True, color=self.accent_color, edgecolor=self.primary_color, alpha=0.7, rwidth=0.8)
-                    self.ax_distribucion.set_xticks(unique_vals) # Set x-ticks to actual integer values
+                min_val, conteos = self.frecuencias_discretas
+                if conteos.size > 0:
+                    # One bar per integer value, centered on it, drawn in a single call
+                    soporte = np.arange(min_val, min_val + len(conteos))
+                    self.ax_distribucion.bar(soporte, conteos / conteos.sum(), width=0.8, color=self.accent_color, edgecolor=self.primary_color, alpha=0.7)
                 else:
                     self.ax_distribucion.text(0.5, 0.5, "No hay datos para mostrar", horizontalalignment='center', verticalalignment='center', transform=self.ax_distribucion.transAxes, color=self.text_color)
                 
-                if distribucion == "Binomial":
-                    # Generate theoretical PMF for comparison
-                    k_values = np.arange(0, params['n'] + 1)
-                    pmf = binom.pmf(k_values, n=params['n'], p=params['p'])
-                    # Plot PMF as discrete points with lines to guide
-                    self.ax_distribucion.plot(k_values, pmf, 'ro', markersize=6, label="PMF Teórica")
-                    self.ax_distribucion.vlines(k_values, 0, pmf, color='red', lw=1.5, alpha=0.7, linestyle='dashed') 
-                elif distribucion == "Poisson":
-                    max_k_poisson = max(self.numeros_generados_distribucion) if self.numeros_generados_distribucion else int(params['mu'] * 3) + 1
-                    k_values = np.arange(0, max_k_poisson + 1)
-                    pmf = poisson.pmf(k_values, mu=params['mu'])
-                    self.ax_distribucion.plot(k_values, pmf, 'ro', markersize=6, label="PMF Teórica")
-                    self.ax_distribucion.vlines(k_values, 0, pmf, color='red', lw=1.5, alpha=0.7, linestyle='dashed') 
-                elif distribucion == "Geométrica":
-                    max_k_geom = max(self.numeros_generados_distribucion) if self.numeros_generados_distribucion else int(1/params['p'] * 3) + 1
-                    k_values = np.arange(1, max_k_geom + 1)
-                    pmf = geom.pmf(k_values, p=params['p'])
-                    self.ax_distribucion.plot(k_values, pmf, 'ro', markersize=6, label="PMF Teórica")
-                    self.ax_distribucion.vlines(k_values, 0, pmf, color='red', lw=1.5, alpha=0.7, linestyle='dashed') 
-                
-                self.ax_distribucion.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
+                # Theoretical PMF over the whole support when it is finite, up to the largest observed value otherwise
+                inferior, superior = modelo.support()
+                max_observado = min_val + len(conteos) - 1 if conteos.size > 0 else int(modelo.ppf(0.999))
+                k_values = np.arange(int(inferior), int(superior if np.isfinite(superior) else max_observado) + 1)
+                pmf = modelo.pmf(k_values)
+                self.ax_distribucion.plot(k_values, pmf, 'ro', markersize=6, label="PMF Teórica")
+                self.ax_distribucion.vlines(k_values, 0, pmf, color='red', lw=1.5, alpha=0.7, linestyle='dashed')
+
+                # Integer ticks: one per value on narrow supports, about a dozen on wide ones
+                self.ax_distribucion.xaxis.set_major_locator(plt.MaxNLocator(integer=True, nbins=min(max(len(conteos), 1), 12)))
                 
             self.ax_distribucion.legend()
         else:
             self.ax_distribucion.text(0.5, 0.5, "No hay datos para mostrar", horizontalalignment='center', verticalalignment='center', transform=self.ax_distribucion.transAxes, color=self.text_color)
 
         self.canvas_distribucion.draw()
+        self.instrumentacion.cerrar_etapa(valores=len(self.numeros_generados_distribucion))
+
+    def clave_cache_resultados(self, distribucion, params, modo_muestreo):
+        """Content hash of a run, or None if it can't be cached (np.random, imported file, cache off, invalid entries)"""
+        metodo = self.metodo_uniforme_var.get()
+        if metodo in ("estandar", "archivo") or not self.usar_cache_var.get():
+            return None
+        try:
+            generador = {nombre: int(self.entries_uniform_params[etiqueta].get()) for nombre, etiqueta in
+                         [("x0", "Semilla (X₀)"), ("a", "Constante (a)"), ("m", "Módulo (m)"), ("n", "Cantidad (N)")]}
+            generador["c"] = int(self.entries_uniform_params["Constante (c)"].get()) if metodo == "mixto" else 0
+        except ValueError:
+            return None
+        if generador["m"] >= 2**63:
+            return None # X values would not fit in an int64 .npy
+        return clave_contenido(metodo=metodo, generador=generador, distribucion=distribucion, params=params, modo=modo_muestreo)
+
+    def guardar_resultado_cache(self, clave, distribucion):
+        filas = self.numeros_generados_distribucion_data
+        arreglos = {
+            'uniformes': np.asarray(self.numeros_generados_uniformes, dtype=np.float64),
+            'valores_x': np.asarray(self.valores_x_congruencial, dtype=np.int64),
+            'uniformes_muestreo': np.asarray(self.uniformes_muestreo, dtype=np.float64),
+            'u1': np.array([np.nan if fila[0] is None else fila[0] for fila in filas], dtype=np.float64),
+            'u2': np.array([np.nan if fila[1] is None else fila[1] for fila in filas], dtype=np.float64),
+            'valores': np.asarray(self.numeros_generados_distribucion, dtype=np.int64 if distribucion in DISCRETAS else np.float64),
+        }
+        resumen = {
+            'clave_uniformes': list(self.clave_uniformes_mostrados),
+            'columnas': self.columnas_uniformes_distribucion,
+            'bondad_ajuste': self.resultado_bondad_ajuste,
+            'reduccion_varianza': self.resultado_reduccion_varianza,
+        }
+        textos = {'procedimiento_uniformes': self.texto_procedimiento_uniformes,
+                  'procedimiento_distribucion': self.procedimiento_distribucion_texto}
+        try:
+            self.cache_resultados.guardar(clave, arreglos, resumen, textos)
+        except OSError:
+            pass # The cache only saves time; a full or read-only disk must not fail the run
+
+    def restaurar_resultado_cache(self, entrada, distribucion, params):
+        """Show a cached run in both tabs without regenerating anything"""
+        arreglos, resumen, textos = entrada['arreglos'], entrada['resumen'], entrada['textos']
+        self.numeros_generados_uniformes = arreglos['uniformes'].tolist()
+        self.valores_x_congruencial = arreglos['valores_x'].tolist()
+        self.texto_procedimiento_uniformes = textos['procedimiento_uniformes']
+        clave_mostrada = tuple(resumen['clave_uniformes'])
+        if clave_mostrada != self.clave_uniformes_mostrados:
+            self.clave_uniformes_mostrados = clave_mostrada
+            with self.instrumentacion.etapa("MathTextWidget.insert (uniformes)") as conteos:
+                self.procedimiento_text.delete(1.0, tk.END)
+                self.procedimiento_text.insert(tk.END, self.texto_procedimiento_uniformes)
+                conteos['caracteres'] = len(self.texto_procedimiento_uniformes)
+            self.actualizar_tablas_y_graficos_uniformes()
+
+        self.uniformes_muestreo = arreglos['uniformes_muestreo'].tolist()
+        u1 = [None if np.isnan(u) else u for u in arreglos['u1'].tolist()]
+        u2 = [None if np.isnan(u) else u for u in arreglos['u2'].tolist()]
+        self.numeros_generados_distribucion = arreglos['valores'].tolist()
+        self.numeros_generados_distribucion_data = list(zip(u1, u2, self.numeros_generados_distribucion))
+        self.frecuencias_discretas = tabla_frecuencias(arreglos['valores']) if distribucion in DISCRETAS else None
+        self.procedimiento_distribucion_texto = textos['procedimiento_distribucion']
+        self.columnas_uniformes_distribucion = resumen['columnas']
+        self.resultado_bondad_ajuste = resumen['bondad_ajuste']
+        self.resultado_reduccion_varianza = resumen['reduccion_varianza']
+
+        if distribucion == "Poisson":
+            self.mostrar_tabla_poisson_pmf_cdf(params['mu'])
+        self.actualizar_tablas_y_graficos_distribucion(distribucion, params)
+        self.notebook.select(self.tab_distribucion)
+
+    def comparar_precisiones(self):
+        """Time the block pipeline for the current distribution and N in float64 and float32"""
+        distribucion = self.distribucion_var.get()
+        if not distribucion:
+            messagebox.showerror("Error", "Por favor, seleccione un tipo de distribución.")
+            return
+        params_raw = {key: entry.get() for key, entry in self.dist_param_entries.items()}
+        es_valido, params = self.validar_parametros_distribucion(distribucion, params_raw)
+        if not es_valido:
+            return
+        config = self.leer_configuracion_generador()
+        if config is None:
+            return
+        try:
+            n_total = int(self.entries_uniform_params["Cantidad (N)"].get())
+            if n_total <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "La cantidad (N) debe ser un número entero positivo.")
+            return
+        self.barra_estado_var.set(f"Comparando precisiones con N = {n_total}...")
+        self.root.update_idletasks()
+        try:
+            filas = comparar_precisiones(distribucion, params, n_total, config)
+        except ValueError as e:
+            messagebox.showerror("Error de Generación", str(e))
+            return
+        self.texto_diagnostico.delete(1.0, tk.END)
+        self.texto_diagnostico.insert(tk.END, texto_comparacion_precisiones(distribucion, n_total, filas))
+        self.barra_estado_var.set(f"float32: {filas[0]['segundos'] / filas[1]['segundos']:.2f}x respecto de float64")
+        self.notebook.select(self.tab_diagnostico)
+
+    def mostrar_diagnostico(self):
+        self.barra_estado_var.set(self.instrumentacion.resumen_linea())
+        self.texto_diagnostico.delete(1.0, tk.END)
+        self.texto_diagnostico.insert(tk.END, self.instrumentacion.resumen_texto())
+
+    def exportar_diagnostico_json(self):
+        if not self.instrumentacion.etapas:
+            messagebox.showwarning("Advertencia", "Todavía no hay mediciones para exportar. Genere una variable aleatoria primero.")
+            return
+        ruta = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")], title="Exportar diagnóstico")
+        if not ruta:
+            return
+        try:
+            self.instrumentacion.exportar_json(ruta)
+        except OSError as e:
+            messagebox.showerror("Error de Exportación", f"No se pudo guardar el archivo: {e}")
 
 
 if __name__ == "__main__":
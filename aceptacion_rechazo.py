@@ -0,0 +1,246 @@
+"""Método de aceptación-rechazo para densidades ingresadas como expresión.
+
+La expresión (en x, p. ej. "x^2 * exp(-x)") se valida con el árbol sintáctico de Python,
+se compila una sola vez a una función vectorizada de NumPy y no necesita estar
+normalizada. Sobre el soporte finito [a, b] se construye una envolvente constante
+por tramos (un único tramo = envolvente constante) a partir del máximo de la densidad
+en una rejilla fina, con un margen de seguridad.
+
+Cada candidato usa dos uniformes de la fuente del proyecto: uno elige el tramo (en
+proporción a su área) y la posición dentro de él, el otro decide la aceptación
+U·M_j < f(x). Los candidatos se generan en lotes sobredimensionados según la tasa de
+aceptación esperada (hasta CANDIDATOS_POR_LOTE por lote), sin bucle de Python por
+valor; los aceptados que sobran del último lote se descartan.
+
+Uso sin interfaz gráfica, por ejemplo:
+
+    python aceptacion_rechazo.py "x^2 * exp(-x)" --soporte 0 30 -n 1000000
+    python aceptacion_rechazo.py "exp(-x^2/2) * (1 + sin(3*x)^2)" --soporte -5 5 --tramos 1
+"""
+import argparse
+import ast
+import time
+
+import numpy as np
+
+from distribuciones import ErrorParametros
+from flujo import TAMANO_BLOQUE, FuenteUniformes
+
+FUNCIONES_DENSIDAD = {
+    "exp": np.exp, "log": np.log, "log1p": np.log1p, "sqrt": np.sqrt, "abs": np.abs,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "arctan": np.arctan, "sinh": np.sinh,
+    "cosh": np.cosh, "tanh": np.tanh, "minimum": np.minimum, "maximum": np.maximum, "where": np.where,
+}
+CONSTANTES_DENSIDAD = {"pi": np.pi, "e": np.e}
+NODOS_PERMITIDOS = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant, ast.Compare,
+                    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd,
+                    ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+TRAMOS_POR_DEFECTO = 64
+PUNTOS_REJILLA = 8192
+MARGEN_ENVOLVENTE = 0.02
+# Tope de candidatos por lote, para que la memoria no crezca con n / tasa de aceptación
+CANDIDATOS_POR_LOTE = 16 * TAMANO_BLOQUE
+
+
+def compilar_densidad(expresion):
+    """Función vectorizada f(x) a partir del texto; sólo se admiten x, números, operadores y FUNCIONES_DENSIDAD"""
+    texto = expresion.strip().replace("^", "**")
+    if not texto:
+        raise ErrorParametros("Ingrese una expresión para la densidad f(x).")
+    try:
+        arbol = ast.parse(texto, mode="eval")
+    except SyntaxError:
+        raise ErrorParametros(f"La expresión '{expresion}' no es válida.")
+    for nodo in ast.walk(arbol):
+        if not isinstance(nodo, NODOS_PERMITIDOS):
+            raise ErrorParametros(f"Elemento no permitido en la expresión: {type(nodo).__name__}.")
+        if isinstance(nodo, ast.Name) and nodo.id != "x" and nodo.id not in FUNCIONES_DENSIDAD and nodo.id not in CONSTANTES_DENSIDAD:
+            raise ErrorParametros(f"Nombre desconocido: '{nodo.id}'. Use x, {', '.join(CONSTANTES_DENSIDAD)} "
+                                  f"o las funciones {', '.join(FUNCIONES_DENSIDAD)}.")
+        if isinstance(nodo, ast.Call) and not (isinstance(nodo.func, ast.Name) and nodo.func.id in FUNCIONES_DENSIDAD):
+            raise ErrorParametros("Sólo se pueden llamar las funciones matemáticas permitidas.")
+        if isinstance(nodo, ast.Constant):
+            if not isinstance(nodo.value, (int, float)):
+                raise ErrorParametros("Las constantes de la expresión deben ser numéricas.")
+            # Float constants make towers like 9**9**9 overflow at once instead of growing a huge int
+            try:
+                nodo.value = float(nodo.value)
+            except OverflowError:
+                raise ErrorParametros(f"Una constante de la expresión es demasiado grande ({len(str(nodo.value))} dígitos).")
+    # The tree was checked above, so evaluating it can only reach the whitelisted names
+    lambda_x = ast.Lambda(args=ast.arguments(posonlyargs=[], args=[ast.arg(arg="x")], kwonlyargs=[], kw_defaults=[], defaults=[]),
+                          body=arbol.body)
+    codigo = compile(ast.fix_missing_locations(ast.Expression(body=lambda_x)), "<densidad>", "eval")
+    funcion = eval(codigo, {"__builtins__": {}, **FUNCIONES_DENSIDAD, **CONSTANTES_DENSIDAD})
+
+    def densidad(x):
+        x = np.asarray(x, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            valores = funcion(x)
+        # Python powers like (-8)**(1/3) give complex constants; casting would keep only the real part
+        if np.iscomplexobj(valores):
+            raise ErrorParametros("f(x) toma valores complejos; revise las potencias de bases negativas.")
+        # A constant expression evaluates to a scalar; give it the shape of x
+        return np.broadcast_to(np.asarray(valores, dtype=np.float64), x.shape)
+    return densidad
+
+
+class MuestreadorRechazo:
+    """Aceptación-rechazo con envolvente constante por tramos sobre [a, b].
+
+    Lleva la cuenta de candidatos y aceptados de todas las llamadas, para informar la
+    tasa de aceptación observada junto a la esperada (∫f / área de la envolvente).
+    """
+
+    def __init__(self, expresion, a, b, tramos=TRAMOS_POR_DEFECTO, margen=MARGEN_ENVOLVENTE):
+        if not (np.isfinite(a) and np.isfinite(b) and a < b):
+            raise ErrorParametros("El soporte [a, b] debe ser finito con a < b.")
+        if tramos < 1:
+            raise ErrorParametros("La envolvente necesita al menos un tramo.")
+        self.expresion = expresion
+        self.densidad = compilar_densidad(expresion)
+        self.a, self.b = float(a), float(b)
+        self.margen = margen
+
+        # Same fine grid for any number of pieces, so a constant envelope is not cruder about the maximum
+        puntos = max(PUNTOS_REJILLA // tramos, 16)
+        x = np.linspace(self.a, self.b, tramos * puntos + 1)
+        try:
+            y = self.densidad(x)
+        except ErrorParametros:
+            raise
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ErrorParametros(f"No se pudo evaluar f(x) en el soporte: {e}")
+        if not np.all(np.isfinite(y)) or np.any(y < 0):
+            raise ErrorParametros("f(x) debe ser finita y no negativa en todo el soporte [a, b].")
+        self.integral = float(np.trapezoid(y, x))
+        if self.integral <= 0:
+            raise ErrorParametros("f(x) es nula en todo el soporte: no hay nada que muestrear.")
+        self.rejilla = (x, y)
+
+        bordes = np.linspace(self.a, self.b, tramos + 1)
+        maximos = np.maximum(y[:-1].reshape(tramos, puntos).max(axis=1), y[puntos::puntos])
+        # Pieces where f is zero on the whole grid are never proposed
+        positivos = maximos > 0
+        self.bordes = bordes
+        self.alturas = np.where(positivos, maximos * (1 + margen), 0.0)
+        self.izquierdas = bordes[:-1][positivos]
+        self.anchos = np.diff(bordes)[positivos]
+        self.indices_tramo = np.flatnonzero(positivos)
+        self.actualizar_areas()
+
+        self.candidatos = 0
+        self.aceptados = 0
+        self.excesos = 0
+
+    def actualizar_areas(self):
+        alturas = self.alturas[self.indices_tramo]
+        areas = alturas * self.anchos
+        self.alturas_positivas = alturas
+        self.areas = areas
+        self.areas_acumuladas = np.cumsum(areas)
+        self.inicios_areas = self.areas_acumuladas - areas
+        self.area_total = float(self.areas_acumuladas[-1])
+
+    @property
+    def tasa_esperada(self):
+        return self.integral / self.area_total
+
+    @property
+    def tasa_observada(self):
+        return self.aceptados / self.candidatos if self.candidatos else float("nan")
+
+    def proponer(self, u):
+        """Candidatos x con densidad proporcional a la envolvente, y la altura M_j de su tramo"""
+        w = np.asarray(u, dtype=np.float64) * self.area_total
+        j = np.minimum(np.searchsorted(self.areas_acumuladas, w, side='right'), len(self.areas) - 1)
+        x = self.izquierdas[j] + (w - self.inicios_areas[j]) / self.areas[j] * self.anchos[j]
+        return np.minimum(x, self.b), self.alturas_positivas[j], j
+
+    def muestrear(self, fuente, n):
+        """n valores aceptados, tomando 2 uniformes por candidato de `fuente` (FuenteUniformes)"""
+        resultado = np.empty(n)
+        obtenidos = 0
+        while obtenidos < n:
+            faltan = n - obtenidos
+            # Enough for the expected acceptances plus three standard deviations, so one batch nearly always suffices below the cap
+            candidatos = min(int((faltan + 3 * np.sqrt(faltan)) / max(self.tasa_esperada, 1e-3)) + 16, CANDIDATOS_POR_LOTE)
+            u = fuente.tomar(2 * candidatos)
+            x, alturas, j = self.proponer(u[:candidatos])
+            fx = self.densidad(x)
+            excedidos = fx > alturas
+            if excedidos.any():
+                # The grid missed a peak: raise those pieces so later batches are exact again
+                self.excesos += int(np.count_nonzero(excedidos))
+                tramos = self.indices_tramo[j[excedidos]]
+                np.maximum.at(self.alturas, tramos, fx[excedidos] * (1 + self.margen))
+                self.actualizar_areas()
+            acepta = u[candidatos:] * alturas < fx
+            aceptados = x[acepta]
+            self.candidatos += candidatos
+            self.aceptados += len(aceptados)
+            aceptados = aceptados[:faltan]
+            resultado[obtenidos:obtenidos + len(aceptados)] = aceptados
+            obtenidos += len(aceptados)
+        return resultado
+
+    def momentos_teoricos(self):
+        """Media y varianza de la densidad normalizada, por la regla del trapecio sobre la rejilla"""
+        x, y = self.rejilla
+        media = np.trapezoid(x * y, x) / self.integral
+        return float(media), float(np.trapezoid((x - media) ** 2 * y, x) / self.integral)
+
+    def cdf_teorica(self, valores):
+        """F(x) de la densidad normalizada, interpolando la integral acumulada de la rejilla"""
+        x, y = self.rejilla
+        acumulada = np.concatenate([[0.0], np.cumsum((y[1:] + y[:-1]) / 2 * np.diff(x))])
+        return np.interp(valores, x, acumulada / acumulada[-1])
+
+
+def texto_resumen_rechazo(muestreador, valores, segundos):
+    """Bloque de texto con el mismo formato que el resumen estadístico de la interfaz"""
+    media, varianza = muestreador.momentos_teoricos()
+    d = float(np.max(np.abs(muestreador.cdf_teorica(np.sort(valores)) - (np.arange(len(valores)) + 0.5) / len(valores)))) if len(valores) else float("nan")
+    tramos = len(muestreador.bordes) - 1
+    texto = f"{'='*40}\n"
+    texto += f"{'ACEPTACIÓN-RECHAZO':^40}\n"
+    texto += f"{'='*40}\n"
+    texto += f"f(x) = {muestreador.expresion} en [{muestreador.a:g}, {muestreador.b:g}]\n"
+    texto += f"Envolvente: {'constante' if tramos == 1 else f'constante por tramos ({tramos} tramos)'}\n"
+    texto += f"∫f(x)dx = {muestreador.integral:.6f}, área de la envolvente = {muestreador.area_total:.6f}\n"
+    texto += f"Valores generados: {len(valores)} ({muestreador.aceptados} aceptados de {muestreador.candidatos} candidatos)\n"
+    texto += f"Tasa de aceptación: {muestreador.tasa_observada:.4f} (esperada {muestreador.tasa_esperada:.4f})\n"
+    texto += f"Uniformes usados: {2 * muestreador.candidatos} ({2 / muestreador.tasa_observada:.3f} por valor)\n"
+    texto += f"Tiempo: {segundos:.3f} s ({len(valores) / max(segundos, 1e-9):.4g} valores/s)\n"
+    if muestreador.excesos:
+        texto += f"Aviso: f(x) superó la envolvente en {muestreador.excesos} candidatos; se elevaron esos tramos (aumente los tramos).\n"
+    texto += f"Media: {np.mean(valores):.6f} (teórica {media:.6f})\n"
+    texto += f"Varianza: {np.var(valores, ddof=1):.6f} (teórica {varianza:.6f})\n"
+    texto += f"Distancia K-S a la CDF numérica: {d:.6f}\n"
+    texto += f"{'='*40}\n"
+    return texto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Muestrear una densidad f(x) por aceptación-rechazo.")
+    parser.add_argument("expresion", help='Densidad en x, no necesariamente normalizada, p. ej. "x^2 * exp(-x)"')
+    parser.add_argument("--soporte", nargs=2, type=float, required=True, metavar=("A", "B"))
+    parser.add_argument("-n", type=int, default=1_000_000)
+    parser.add_argument("--tramos", type=int, default=TRAMOS_POR_DEFECTO, help="1 = envolvente constante")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--salida", help="Guardar los valores aceptados en .npy")
+    args = parser.parse_args(argv)
+    try:
+        muestreador = MuestreadorRechazo(args.expresion, *args.soporte, tramos=args.tramos)
+    except ErrorParametros as e:
+        parser.error(str(e))
+    fuente = FuenteUniformes.desde_generador({"metodo": "estandar"}, rng=np.random.default_rng(args.semilla))
+    inicio = time.perf_counter()
+    valores = muestreador.muestrear(fuente, args.n)
+    print(texto_resumen_rechazo(muestreador, valores, time.perf_counter() - inicio))
+    if args.salida:
+        np.save(args.salida, valores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Barrido de parámetros de una distribución ejecutado en un pool de procesos.
+
+Uso sin interfaz gráfica, por ejemplo:
+
+    python barrido.py Poisson --param "Lambda=0.1:50:20" -n 10000 --procesos 4 --csv poisson.csv --grafico poisson.png
+    python barrido.py Binomial --param "N=5,10,20" --param "P=0.1:0.9:5" --gen metodo=mixto --gen x0=7 --gen a=1103515245 --gen c=12345 --gen m=2147483648
+    python barrido.py Exponencial --param "Lambda=0.5,1,2" -n 100000 --gen metodo=archivo --gen ruta=uniformes.npy
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from distribuciones import DISCRETAS, REGISTRO, convertir_parametros, modelo_teorico, uniformes_requeridos
+from flujo import FuenteUniformes, ejecutar_flujo, muestreador_distribucion, sumideros_resumen
+from generadores_uniformes import PRECISIONES, saltar
+
+CLAVES_GENERADOR = ["metodo", "x0", "a", "c", "m"]
+GENERADOR_POR_DEFECTO = {"metodo": "estandar"}
+MAX_PANELES = 36
+
+
+def interpretar_valores(texto):
+    """Convertir "inicio:fin:pasos" (equiespaciado) o "v1,v2,..." en una lista de valores"""
+    def numero(token):
+        token = token.strip()
+        try:
+            return int(token)
+        except ValueError:
+            return float(token)
+
+    if ':' in texto:
+        inicio, fin, pasos = texto.split(':')
+        inicio, fin, pasos = numero(inicio), numero(fin), int(pasos)
+        valores = np.linspace(inicio, fin, pasos)
+        if isinstance(inicio, int) and isinstance(fin, int):
+            return sorted(set(int(round(v)) for v in valores))
+        return [float(v) for v in valores]
+    return [numero(token) for token in texto.split(',') if token.strip()]
+
+
+def expandir_rejilla(rejilla):
+    """Producto cartesiano de {nombre: [valores]} como lista de diccionarios"""
+    nombres = list(rejilla)
+    return [dict(zip(nombres, combinacion)) for combinacion in itertools.product(*(rejilla[n] for n in nombres))]
+
+
+def crear_tareas(distribucion, rejilla, n, generador=None, semilla=None, precision="float64"):
+    """Preparar una tarea por punto de la rejilla, cada una con su propio flujo de uniformes.
+
+    La rejilla puede incluir parámetros de la distribución y del generador (metodo, x0,
+    a, c, m). Con el método estándar cada tarea recibe una semilla hija independiente
+    (SeedSequence.spawn); con los congruenciales cada tarea arranca donde terminó la
+    anterior con el mismo generador (salto hacia adelante), de modo que los tramos no
+    se solapan mientras no se agote el periodo. Para las familias por rechazo el tramo
+    reservado es una estimación: ejecutar_tarea informa si una tarea consumió más y
+    entró en el tramo de la siguiente.
+    """
+    generador = dict(GENERADOR_POR_DEFECTO if generador is None else generador)
+    puntos = expandir_rejilla(rejilla)
+    semillas = np.random.SeedSequence(semilla).spawn(len(puntos))
+    consumidos = {}
+    tareas = []
+    for punto, semilla_hija in zip(puntos, semillas):
+        params_raw = {k: v for k, v in punto.items() if k not in CLAVES_GENERADOR}
+        config = dict(generador)
+        config.update({k: v for k, v in punto.items() if k in CLAVES_GENERADOR})
+        params = convertir_parametros(distribucion, params_raw)
+        requeridos = uniformes_requeridos(distribucion, params, n)
+
+        tarea = {'distribucion': distribucion, 'params_raw': params_raw, 'params': params,
+                 'generador': config, 'n': n, 'semilla': semilla_hija, 'desplazamiento': 0, 'precision': precision}
+        if config['metodo'] != "estandar":
+            clave = tuple(config.get(k) for k in CLAVES_GENERADOR)
+            tarea['desplazamiento'] = consumidos.get(clave, 0)
+            consumidos[clave] = tarea['desplazamiento'] + requeridos
+        tareas.append(tarea)
+    return tareas
+
+
+def ejecutar_tarea(tarea):
+    """Generar una muestra y resumirla; función de nivel superior para poder enviarla al pool"""
+    distribucion, params, n = tarea['distribucion'], tarea['params'], tarea['n']
+    config = dict(tarea['generador'])
+    requeridos = uniformes_requeridos(distribucion, params, n)
+    dtype = PRECISIONES[tarea['precision']]
+
+    if config['metodo'] == "estandar":
+        fuente = FuenteUniformes.desde_generador(config, rng=np.random.default_rng(tarea['semilla']), dtype=dtype)
+        excede_periodo = False
+    elif config['metodo'] == "archivo":
+        # Each point reads its own stretch of the file; running past the end raises ValueError
+        config['inicio'] = tarea['desplazamiento']
+        fuente = FuenteUniformes.desde_generador(config, dtype=dtype)
+        excede_periodo = False
+    else:
+        if config['metodo'] != "mixto":
+            config['c'] = 0
+        config['x0'] = saltar(config['x0'], config['a'], config.get('c', 0), config['m'], tarea['desplazamiento'])
+        fuente = FuenteUniformes.desde_generador(config, dtype=dtype)
+
+    estadisticas, distribucion_muestral = ejecutar_flujo(muestreador_distribucion(distribucion, params, dtype), fuente, n,
+                                                         sumideros_resumen(distribucion, params))
+    # Rejection samplers only have an estimate; using more than reserved runs into the next task's stretch
+    excede_reserva = config['metodo'] != "estandar" and fuente.consumidos > requeridos
+    if config['metodo'] not in ("estandar", "archivo"):
+        excede_periodo = tarea['desplazamiento'] + fuente.consumidos > config['m']
+    if distribucion in DISCRETAS:
+        soporte = np.arange(distribucion_muestral.minimo, distribucion_muestral.minimo + len(distribucion_muestral.conteos))
+        histograma = (soporte, distribucion_muestral.conteos / estadisticas.n)
+    else:
+        histograma = (distribucion_muestral.bordes, distribucion_muestral.densidades())
+
+    modelo = modelo_teorico(distribucion, params)
+    media_teorica = modelo.mean()
+    return {
+        'params_raw': tarea['params_raw'],
+        'params': params,
+        'generador': tarea['generador'],
+        'n': estadisticas.n,
+        'media': estadisticas.media,
+        'varianza': estadisticas.varianza,
+        'minimo': estadisticas.minimo,
+        'maximo': estadisticas.maximo,
+        'media_teorica': float(media_teorica),
+        'varianza_teorica': float(modelo.var()),
+        'error_media': estadisticas.media - media_teorica,
+        'excede_periodo': excede_periodo,
+        'uniformes_reservados': requeridos,
+        'uniformes_consumidos': fuente.consumidos,
+        'excede_reserva': excede_reserva,
+        'histograma': histograma,
+    }
+
+
+def ejecutar_barrido(distribucion, rejilla, n, generador=None, procesos=None, semilla=None, precision="float64"):
+    """Ejecutar todos los puntos de la rejilla y devolver sus resúmenes en el mismo orden.
+
+    procesos=1 ejecuta en el proceso actual; None usa un proceso por CPU. precision
+    ("float64" o "float32") es la de los uniformes y las variables continuas.
+    """
+    tareas = crear_tareas(distribucion, rejilla, n, generador, semilla, precision)
+    if procesos == 1 or len(tareas) <= 1:
+        return [ejecutar_tarea(t) for t in tareas]
+    tamano_lote = max(1, len(tareas) // (4 * (procesos or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(ejecutar_tarea, tareas, chunksize=tamano_lote))
+
+
+def nombres_variables(resultados):
+    """Parámetros (de distribución o generador) que cambian entre puntos del barrido"""
+    if not resultados:
+        return []
+    claves = list(resultados[0]['params_raw']) + [k for k in CLAVES_GENERADOR if k in resultados[0]['generador']]
+    def valor(r, k):
+        return r['params_raw'][k] if k in r['params_raw'] else r['generador'].get(k)
+    return [k for k in claves if len({str(valor(r, k)) for r in resultados}) > 1] or list(resultados[0]['params_raw'])
+
+
+def etiqueta_punto(resultado, claves):
+    partes = []
+    for k in claves:
+        v = resultado['params_raw'][k] if k in resultado['params_raw'] else resultado['generador'].get(k)
+        partes.append(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}")
+    return ", ".join(partes)
+
+
+def tabla_texto(resultados):
+    claves = nombres_variables(resultados)
+    texto = f"{'Punto':<28} | {'N':>8} | {'Media':>11} | {'Media teór.':>11} | {'Varianza':>11} | {'Var. teór.':>11}\n"
+    texto += f"{'-'*28}-|-{'-'*8}-|-{'-'*11}-|-{'-'*11}-|-{'-'*11}-|-{'-'*11}\n"
+    for r in resultados:
+        marca = (" *" if r['excede_periodo'] else "") + (" †" if r['excede_reserva'] else "")
+        texto += (f"{etiqueta_punto(r, claves):<28} | {r['n']:>8} | {r['media']:>11.5f} | {r['media_teorica']:>11.5f} | "
+                  f"{r['varianza']:>11.5f} | {r['varianza_teorica']:>11.5f}{marca}\n")
+    if any(r['excede_periodo'] for r in resultados):
+        texto += "\n* El tramo de uniformes de este punto supera el periodo del generador y se solapa con otros puntos.\n"
+    if any(r['excede_reserva'] for r in resultados):
+        texto += ("\n† El método de rechazo consumió más uniformes que los reservados para este punto "
+                  "y pudo solaparse con el tramo del punto siguiente.\n")
+    return texto
+
+
+def exportar_csv(resultados, ruta):
+    claves = nombres_variables(resultados)
+    columnas = claves + ['n', 'media', 'media_teorica', 'varianza', 'varianza_teorica', 'minimo', 'maximo', 'excede_periodo',
+                       'uniformes_reservados', 'uniformes_consumidos', 'excede_reserva']
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(columnas)
+        for r in resultados:
+            fila = [r['params_raw'][k] if k in r['params_raw'] else r['generador'].get(k) for k in claves]
+            fila += [r[k] for k in columnas[len(claves):]]
+            escritor.writerow(fila)
+
+
+def graficar_multiples(distribucion, resultados, figura=None, max_paneles=MAX_PANELES):
+    """Dibujar un panel por punto (histograma + PDF/PMF teórica) en una cuadrícula"""
+    figura = figura if figura is not None else Figure(figsize=(12, 8), dpi=100)
+    figura.clear()
+    mostrados = resultados[:max_paneles]
+    if not mostrados:
+        return figura
+    claves = nombres_variables(resultados)
+    columnas = math.ceil(math.sqrt(len(mostrados)))
+    filas = math.ceil(len(mostrados) / columnas)
+    for i, r in enumerate(mostrados):
+        ax = figura.add_subplot(filas, columnas, i + 1)
+        modelo = modelo_teorico(distribucion, r['params'])
+        if distribucion in DISCRETAS:
+            soporte, frecuencias = r['histograma']
+            ax.bar(soporte, frecuencias, width=0.8, color="#4db6ac", edgecolor="#00796b")
+            ax.plot(soporte, modelo.pmf(soporte), 'r.', markersize=3)
+        else:
+            bordes, densidades = r['histograma']
+            ax.stairs(densidades, bordes, fill=True, color="#4db6ac")
+            x = np.linspace(bordes[0], bordes[-1], 100)
+            ax.plot(x, modelo.pdf(x), 'r--', linewidth=1)
+        ax.set_title(etiqueta_punto(r, claves), fontsize=7)
+        ax.tick_params(labelsize=6)
+    if len(resultados) > max_paneles:
+        figura.suptitle(f"{distribucion}: primeros {max_paneles} de {len(resultados)} puntos", fontsize=9)
+    else:
+        figura.suptitle(f"Barrido de {distribucion}", fontsize=9)
+    figura.tight_layout()
+    return figura
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de una distribución en un pool de procesos.")
+    parser.add_argument("distribucion", help=f"Distribución a barrer: {', '.join(REGISTRO)}")
+    parser.add_argument("--param", action="append", default=[], help='Nombre=valores, p. ej. "Lambda=0.1:50:20" o "P=0.2,0.5"')
+    parser.add_argument("--gen", action="append", default=[], help="Ajuste del generador, p. ej. metodo=mixto, x0=7 (admite rejillas)")
+    parser.add_argument("-n", type=int, default=1000, help="Muestras por punto")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla raíz para el método estándar")
+    parser.add_argument("--precision", choices=list(PRECISIONES), default="float64", help="Precisión de uniformes y variables continuas")
+    parser.add_argument("--csv", help="Guardar la tabla de resultados en CSV")
+    parser.add_argument("--grafico", help="Guardar la figura de múltiplos pequeños (PNG, PDF, ...)")
+    args = parser.parse_args(argv)
+
+    rejilla = {}
+    generador = dict(GENERADOR_POR_DEFECTO)
+    for especificacion in args.param:
+        nombre, valores = especificacion.split('=', 1)
+        rejilla[nombre.strip()] = interpretar_valores(valores)
+    for especificacion in args.gen:
+        nombre, valores = especificacion.split('=', 1)
+        nombre = nombre.strip()
+        if nombre in ("metodo", "ruta"):
+            generador[nombre] = valores.strip()
+        else:
+            valores = interpretar_valores(valores)
+            if len(valores) == 1:
+                generador[nombre] = valores[0]
+            else:
+                rejilla[nombre] = valores
+
+    resultados = ejecutar_barrido(args.distribucion, rejilla, args.n, generador, args.procesos, args.semilla, args.precision)
+    print(tabla_texto(resultados))
+    if args.csv:
+        exportar_csv(resultados, args.csv)
+    if args.grafico:
+        graficar_multiples(args.distribucion, resultados).savefig(args.grafico)
+
+
+if __name__ == "__main__":
+    main()
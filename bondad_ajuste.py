@@ -0,0 +1,176 @@
+"""Pruebas de bondad de ajuste contra la distribución teórica.
+
+- Discretas: chi-cuadrado sobre la tabla de frecuencias (mínimo, conteos), fusionando
+  celdas vecinas hasta que cada frecuencia esperada llegue a MIN_ESPERADO.
+- Continuas: Kolmogorov-Smirnov y Anderson-Darling. Hasta LIMITE_EXACTO valores se
+  calculan sobre la muestra ordenada; por encima (o en el flujo por bloques) se usan
+  conteos en BINS_PRUEBA clases equiprobables, cuyos bordes (cuantiles del modelo) se
+  calculan una vez por distribución y parámetros.
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.stats import chi2, kstwo
+
+from distribuciones import DISCRETAS, modelo_teorico
+
+BINS_PRUEBA = 4096
+MIN_ESPERADO = 5
+LIMITE_EXACTO = 1_000_000
+ALFA_PRUEBA = 0.05
+
+
+@lru_cache(maxsize=32)
+def bordes_equiprobables(distribucion, clave_params, bins=BINS_PRUEBA):
+    """Cuantiles j/bins (j = 1..bins-1) del modelo; clave_params = tuple(sorted(params.items()))"""
+    modelo = modelo_teorico(distribucion, dict(clave_params))
+    return modelo.ppf(np.arange(1, bins) / bins)
+
+
+class ConteoEquiprobable:
+    """Conteos por clase equiprobable del modelo, acumulados bloque a bloque"""
+
+    def __init__(self, distribucion, params, bins=BINS_PRUEBA):
+        self.bordes = bordes_equiprobables(distribucion, tuple(sorted(params.items())), bins)
+        self.conteos = np.zeros(bins, dtype=np.int64)
+
+    def agregar(self, bloque):
+        self.conteos += np.bincount(np.searchsorted(self.bordes, bloque, side='right'), minlength=len(self.conteos))
+
+
+def fusionar_celdas(observados, esperados, min_esperado=MIN_ESPERADO):
+    """Unir celdas consecutivas hasta que cada una tenga esperado >= min_esperado"""
+    cortes = []
+    acumulado = 0.0
+    for i, e in enumerate(esperados):
+        acumulado += e
+        if acumulado >= min_esperado:
+            cortes.append(i + 1)
+            acumulado = 0.0
+    if not cortes:
+        cortes = [len(esperados)]
+    # El sobrante de la cola se une a la última celda completa
+    cortes[-1] = len(esperados)
+    inicios = np.concatenate([[0], cortes[:-1]])
+    return np.add.reduceat(observados, inicios), np.add.reduceat(esperados, inicios)
+
+
+def chi_cuadrado_discreta(minimo, conteos, modelo, min_esperado=MIN_ESPERADO):
+    """Chi-cuadrado sobre el soporte observado; las colas teóricas se suman a las celdas extremas"""
+    total = int(conteos.sum())
+    soporte = np.arange(minimo, minimo + len(conteos))
+    probabilidades = modelo.pmf(soporte)
+    probabilidades[0] += modelo.cdf(minimo - 1)
+    probabilidades[-1] += modelo.sf(soporte[-1])
+    observados, esperados = fusionar_celdas(conteos.astype(float), total * probabilidades, min_esperado)
+    gl = len(observados) - 1
+    estadistico = float(np.sum((observados - esperados) ** 2 / esperados))
+    return {'prueba': 'chi2', 'estadistico': estadistico, 'gl': gl,
+            'p_valor': float(chi2.sf(estadistico, gl)) if gl > 0 else float('nan'),
+            'celdas_originales': len(conteos), 'celdas': len(observados)}
+
+
+def p_valor_anderson_darling(a2):
+    """1 - ADinf(A²): distribución asintótica de Marsaglia y Marsaglia (2004), modelo totalmente especificado"""
+    if a2 <= 0:
+        return 1.0
+    if a2 < 2:
+        cdf = (np.exp(-1.2337141 / a2) / np.sqrt(a2)
+               * (2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * a2) * a2) * a2) * a2) * a2))
+    else:
+        cdf = np.exp(-np.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * a2) * a2) * a2) * a2) * a2))
+    return float(min(max(1 - cdf, 0.0), 1.0))
+
+
+def ks_anderson_exactas(valores, modelo):
+    """D de Kolmogorov-Smirnov y A² de Anderson-Darling sobre la muestra ordenada"""
+    u = modelo.cdf(np.sort(np.asarray(valores, dtype=np.float64)))
+    n = u.size
+    i = np.arange(1, n + 1)
+    d = max(np.max(i / n - u), np.max(u - (i - 1) / n))
+    u = np.clip(u, 1e-300, 1 - 1e-16) # Values on the edge of the support would give log(0)
+    a2 = -n - np.sum((2 * i - 1) * (np.log(u) + np.log1p(-u[::-1]))) / n
+    return float(d), float(a2)
+
+
+def ks_anderson_agrupadas(conteos):
+    """D y A² a partir de conteos en clases equiprobables de ancho 1/B en la escala F(x).
+
+    La FDE se interpola linealmente dentro de cada clase; D difiere del exacto en a lo
+    sumo 1/B y A² se integra con Gauss-Legendre de 5 puntos por clase.
+    """
+    n = int(conteos.sum())
+    bins = len(conteos)
+    bordes = np.arange(bins + 1) / bins
+    fde = np.concatenate([[0.0], np.cumsum(conteos) / n])
+    d = float(np.max(np.abs(fde - bordes)))
+
+    nodos, pesos = np.polynomial.legendre.leggauss(5)
+    t = (nodos + 1) / 2
+    u = bordes[:-1, None] + t[None, :] / bins
+    f = fde[:-1, None] + t[None, :] * (fde[1:] - fde[:-1])[:, None]
+    integrando = (f - u) ** 2 / (u * (1 - u))
+    a2 = float(n * np.sum(integrando * pesos[None, :]) / (2 * bins))
+    return d, a2
+
+
+def pruebas_bondad_ajuste(distribucion, params, valores=None, frecuencias=None, conteo_equiprobable=None):
+    """Pruebas que corresponden a la distribución, a partir de lo que se tenga a mano.
+
+    - Discretas: frecuencias = (mínimo, conteos); si faltan se calculan de valores.
+    - Continuas: valores (exactas hasta LIMITE_EXACTO) o un ConteoEquiprobable ya lleno.
+    """
+    modelo = modelo_teorico(distribucion, params)
+    if distribucion in DISCRETAS:
+        if frecuencias is None:
+            valores = np.asarray(valores, dtype=np.int64)
+            minimo = int(valores.min())
+            frecuencias = (minimo, np.bincount(valores - minimo))
+        return {'discreta': True, 'chi2': chi_cuadrado_discreta(frecuencias[0], frecuencias[1], modelo)}
+
+    if conteo_equiprobable is None and len(valores) > LIMITE_EXACTO:
+        conteo_equiprobable = ConteoEquiprobable(distribucion, params)
+        conteo_equiprobable.agregar(np.asarray(valores, dtype=np.float64))
+    if conteo_equiprobable is None:
+        n = len(valores)
+        d, a2 = ks_anderson_exactas(valores, modelo)
+        calculo = "exacto sobre la muestra ordenada"
+    else:
+        n = int(conteo_equiprobable.conteos.sum())
+        d, a2 = ks_anderson_agrupadas(conteo_equiprobable.conteos)
+        calculo = f"agrupado en {len(conteo_equiprobable.conteos)} clases equiprobables"
+    return {'discreta': False, 'n': n, 'calculo': calculo,
+            'ks': {'estadistico': d, 'p_valor': float(kstwo.sf(d, n))},
+            'ad': {'estadistico': a2, 'p_valor': p_valor_anderson_darling(a2)}}
+
+
+def decision(p_valor, alfa=ALFA_PRUEBA):
+    if np.isnan(p_valor):
+        return "No aplicable"
+    return "Se rechaza H0" if p_valor < alfa else "No se rechaza H0"
+
+
+def texto_bondad_ajuste(resultado, alfa=ALFA_PRUEBA):
+    """Bloque de texto con el mismo formato que el resumen estadístico"""
+    texto = f"{'PRUEBAS DE BONDAD DE AJUSTE':^40}\n"
+    texto += f"{'='*40}\n"
+    if 'omitida' in resultado:
+        texto += f"No se calculan: {resultado['omitida']}\n"
+        texto += f"{'='*40}\n"
+        return texto
+    texto += f"H0: la muestra sigue la distribución teórica (α = {alfa})\n"
+    if resultado['discreta']:
+        chi = resultado['chi2']
+        texto += "Chi-cuadrado:\n"
+        texto += f"  χ² = {chi['estadistico']:.4f}, gl = {chi['gl']}\n"
+        texto += f"  p-valor = {chi['p_valor']:.4f} -> {decision(chi['p_valor'], alfa)}\n"
+        texto += f"  Celdas: {chi['celdas_originales']} -> {chi['celdas']} (esperado ≥ {MIN_ESPERADO})\n"
+    else:
+        ks, ad = resultado['ks'], resultado['ad']
+        texto += "Kolmogorov-Smirnov:\n"
+        texto += f"  D = {ks['estadistico']:.6f}, p-valor = {ks['p_valor']:.4f} -> {decision(ks['p_valor'], alfa)}\n"
+        texto += "Anderson-Darling:\n"
+        texto += f"  A² = {ad['estadistico']:.4f}, p-valor = {ad['p_valor']:.4f} -> {decision(ad['p_valor'], alfa)}\n"
+        texto += f"Cálculo: {resultado['calculo']}\n"
+    texto += f"{'='*40}\n"
+    return texto
@@ -0,0 +1,355 @@
+"""Búsqueda de multiplicadores de periodo completo y ordenamiento por la prueba espectral.
+
+Los candidatos se obtienen con teoría de números, sin generar la secuencia:
+
+- Mixto (c ≠ 0), teorema de Hull–Dobell: periodo m si mcd(c, m) = 1, a - 1 es
+  múltiplo de todos los primos de m y, cuando 4 | m, también de 4.
+- Multiplicativo (c = 0): el periodo máximo es λ(m) (función de Carmichael, m - 1 si
+  m es primo) y lo alcanza a si a^(λ/q) ≢ 1 (mod m) para cada primo q | λ; con m
+  primo, a es raíz primitiva. Requiere factorizar m y los p - 1 de sus primos.
+
+Cada candidato se califica con la prueba espectral en dimensiones 2..t: ν_t es la
+longitud del vector más corto de la red dual {s : s·(1, a, ..., a^(t-1)) ≡ 0 (mod m)},
+hallado con reducción LLL más enumeración exacta, y S_t = ν_t / (γ_t^(1/2) m^(1/t)) ∈ (0, 1]
+lo normaliza con la constante de Hermite γ_t. Los candidatos se ordenan por M = min S_t.
+
+Uso sin interfaz gráfica, por ejemplo:
+
+    python busqueda_parametros.py 2147483647 --metodo multiplicativo --candidatos 200 --mejores 10
+"""
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# Deterministas para n < 3.3·10^24; por encima la prueba es probabilística
+BASES_MILLER_RABIN = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+PRIMOS_PEQUENOS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+# γ_t de Hermite para t = 2..8
+CONSTANTES_HERMITE = {2: (4 / 3) ** 0.5, 3: 2 ** (1 / 3), 4: 2 ** 0.5, 5: 8 ** (1 / 5),
+                      6: (64 / 3) ** (1 / 6), 7: 64 ** (1 / 7), 8: 2.0}
+DIMENSION_MAXIMA = 8
+
+
+def es_primo(n):
+    """Miller–Rabin"""
+    if n < 2:
+        return False
+    for p in PRIMOS_PEQUENOS:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for base in BASES_MILLER_RABIN:
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def rho_pollard(n):
+    """Un divisor no trivial de n compuesto (variante de Brent)"""
+    if n % 2 == 0:
+        return 2
+    generador = random.Random(n)
+    while True:
+        y, c, salto = generador.randrange(1, n), generador.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(salto, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += salto
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factorizar(n):
+    """{primo: exponente} de n ≥ 1"""
+    factores = {}
+    for p in PRIMOS_PEQUENOS:
+        while n % p == 0:
+            factores[p] = factores.get(p, 0) + 1
+            n //= p
+    pendientes = [n] if n > 1 else []
+    while pendientes:
+        k = pendientes.pop()
+        if es_primo(k):
+            factores[k] = factores.get(k, 0) + 1
+        else:
+            d = rho_pollard(k)
+            pendientes.extend([d, k // d])
+    return factores
+
+
+def lambda_carmichael(factores_m):
+    """(λ(m), factores de λ(m)) a partir de la factorización de m"""
+    factores_lambda = {}
+    valores = []
+    for p, e in factores_m.items():
+        if p == 2:
+            valor = 1 if e == 1 else (2 if e == 2 else 2 ** (e - 2))
+            parciales = {2: valor.bit_length() - 1} if valor > 1 else {}
+        else:
+            valor = p ** (e - 1) * (p - 1)
+            parciales = factorizar(p - 1)
+            if e > 1:
+                parciales[p] = parciales.get(p, 0) + e - 1
+        valores.append(valor)
+        for q, k in parciales.items():
+            factores_lambda[q] = max(factores_lambda.get(q, 0), k)
+    return math.lcm(*valores) if valores else 1, factores_lambda
+
+
+def radical(factores):
+    return math.prod(factores)
+
+
+def es_periodo_completo_mixto(a, c, m, factores_m):
+    """Hull–Dobell"""
+    if math.gcd(c, m) != 1:
+        return False
+    if any((a - 1) % p for p in factores_m):
+        return False
+    return m % 4 != 0 or (a - 1) % 4 == 0
+
+
+def tiene_orden_maximo(a, m, lam, primos_lambda):
+    """a tiene orden λ(m) módulo m (raíz primitiva si m es primo)"""
+    if math.gcd(a, m) != 1:
+        return False
+    return all(pow(a, lam // q, m) != 1 for q in primos_lambda)
+
+
+def multiplicadores_candidatos(m, metodo, cantidad, semilla=None):
+    """(lista de multiplicadores de periodo máximo, periodo) sin generar ninguna secuencia.
+
+    Si hay más de `cantidad`, se toma una muestra aleatoria reproducible con `semilla`.
+    """
+    factores_m = factorizar(m)
+    generador = random.Random(semilla)
+    if metodo == "mixto":
+        # a = 1 + k·L con L = rad(m), o mcm(rad(m), 4) cuando 4 | m; k ≥ 1 excluye a = 1
+        paso = radical(factores_m)
+        if m % 4 == 0:
+            paso = math.lcm(paso, 4)
+        total = (m - 2) // paso
+        if total <= cantidad:
+            ks = range(1, total + 1)
+        else:
+            ks = sorted(generador.sample(range(1, total + 1), cantidad))
+        return [1 + k * paso for k in ks], m
+
+    lam, factores_lambda = lambda_carmichael(factores_m)
+    primos_lambda = list(factores_lambda)
+    if m - 2 <= 4 * cantidad:
+        candidatos = [a for a in range(2, m) if tiene_orden_maximo(a, m, lam, primos_lambda)]
+        if len(candidatos) > cantidad:
+            candidatos = sorted(generador.sample(candidatos, cantidad))
+        return candidatos, lam
+    encontrados = set()
+    intentos = 0
+    # Las raíces primitivas son una fracción ≈ φ(λ)/λ de los enteros; el tope evita bucles sin fin
+    while len(encontrados) < cantidad and intentos < 200 * cantidad:
+        a = generador.randrange(2, m)
+        intentos += 1
+        if tiene_orden_maximo(a, m, lam, primos_lambda):
+            encontrados.add(a)
+    return sorted(encontrados), lam
+
+
+def gram_schmidt(base):
+    n = len(base)
+    estrella = [[float(v) for v in fila] for fila in base]
+    mu = [[0.0] * n for _ in range(n)]
+    normas = [0.0] * n
+    for i in range(n):
+        for j in range(i):
+            mu[i][j] = sum(float(x) * y for x, y in zip(base[i], estrella[j])) / normas[j]
+            estrella[i] = [x - mu[i][j] * y for x, y in zip(estrella[i], estrella[j])]
+        normas[i] = sum(x * x for x in estrella[i])
+    return mu, normas
+
+
+def reducir_lll(base, delta=0.99):
+    """LLL con aritmética entera en la base y Gram–Schmidt en coma flotante.
+
+    La reducción de tamaño actualiza μ en su lugar; Gram–Schmidt se recalcula desde la
+    base entera sólo tras cada intercambio, lo que acota el error de redondeo.
+    """
+    base = [list(fila) for fila in base]
+    n = len(base)
+    k = 1
+    mu, normas = gram_schmidt(base)
+    while k < n:
+        reducir = True
+        while reducir:
+            reducir = False
+            for j in range(k - 1, -1, -1):
+                q = round(mu[k][j])
+                if q:
+                    base[k] = [x - q * y for x, y in zip(base[k], base[j])]
+                    for i in range(j):
+                        mu[k][i] -= q * mu[j][i]
+                    mu[k][j] -= q
+                    # Large quotients (moduli near 2^64) leave μ inexact: recompute and reduce again
+                    reducir = reducir or abs(q) > 2 ** 26
+            if reducir:
+                mu, normas = gram_schmidt(base)
+        if normas[k] >= (delta - mu[k][k - 1] ** 2) * normas[k - 1]:
+            k += 1
+        else:
+            base[k], base[k - 1] = base[k - 1], base[k]
+            mu, normas = gram_schmidt(base)
+            k = max(k - 1, 1)
+    return base
+
+
+def norma2(vector):
+    return sum(x * x for x in vector)
+
+
+def vector_mas_corto(base):
+    """Cuadrado de la longitud del vector no nulo más corto (enumeración de Fincke–Pohst)"""
+    base = reducir_lll(base)
+    n = len(base)
+    mu, normas = gram_schmidt(base)
+    mejor = [min(norma2(fila) for fila in base)]
+    x = [0] * n
+
+    def buscar(k, parcial):
+        centro = -sum(x[j] * mu[j][k] for j in range(k + 1, n))
+        holgura = mejor[0] * (1 + 1e-9) - parcial
+        if holgura < 0:
+            return
+        radio = math.sqrt(holgura / normas[k])
+        for xk in range(math.ceil(centro - radio), math.floor(centro + radio) + 1):
+            longitud = parcial + (xk - centro) ** 2 * normas[k]
+            if longitud > mejor[0] * (1 + 1e-9):
+                continue
+            x[k] = xk
+            if k == 0:
+                if any(x):
+                    vector = [sum(x[i] * base[i][j] for i in range(n)) for j in range(n)]
+                    mejor[0] = min(mejor[0], norma2(vector))
+            else:
+                buscar(k - 1, longitud)
+        x[k] = 0
+
+    buscar(n - 1, 0.0)
+    return mejor[0]
+
+
+def base_dual(a, m, t):
+    """Base de {s : s_0 + a s_1 + ... + a^(t-1) s_(t-1) ≡ 0 (mod m)}"""
+    base = [[m] + [0] * (t - 1)]
+    for i in range(1, t):
+        fila = [0] * t
+        fila[0] = -pow(a, i, m) % m
+        fila[i] = 1
+        base.append(fila)
+    return base
+
+
+def prueba_espectral(a, m, dimension_maxima=DIMENSION_MAXIMA):
+    """{t: (ν_t, S_t)} para t = 2..dimension_maxima"""
+    resultado = {}
+    for t in range(2, dimension_maxima + 1):
+        nu = math.sqrt(vector_mas_corto(base_dual(a, m, t)))
+        resultado[t] = (nu, nu / (CONSTANTES_HERMITE[t] ** 0.5 * m ** (1 / t)))
+    return resultado
+
+
+def evaluar_candidato(tarea):
+    """Función de nivel superior para poder enviarla al pool"""
+    a, m, dimension_maxima = tarea
+    espectral = prueba_espectral(a, m, dimension_maxima)
+    return {'a': a, 'nu': {t: v[0] for t, v in espectral.items()}, 's': {t: v[1] for t, v in espectral.items()},
+            'm_min': min(v[1] for v in espectral.values())}
+
+
+def buscar_multiplicadores(m, metodo="mixto", cantidad=100, dimension_maxima=DIMENSION_MAXIMA,
+                           procesos=None, semilla=None):
+    """Candidatos de periodo máximo ordenados de mejor a peor por M = min S_t; devuelve (resultados, periodo)"""
+    if m < 3:
+        raise ValueError("El módulo (m) debe ser al menos 3.")
+    if not 2 <= dimension_maxima <= DIMENSION_MAXIMA:
+        raise ValueError(f"La dimensión máxima debe estar entre 2 y {DIMENSION_MAXIMA}.")
+    candidatos, periodo = multiplicadores_candidatos(m, metodo, cantidad, semilla)
+    tareas = [(a, m, dimension_maxima) for a in candidatos]
+    if procesos == 1 or len(tareas) <= 1:
+        resultados = [evaluar_candidato(tarea) for tarea in tareas]
+    else:
+        procesos = procesos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(evaluar_candidato, tareas, chunksize=max(1, len(tareas) // (4 * procesos))))
+    for resultado in resultados:
+        resultado['periodo'] = periodo
+    resultados.sort(key=lambda r: r['m_min'], reverse=True)
+    return resultados, periodo
+
+
+def incremento_sugerido(m, c_actual=None):
+    """c coprimo con m (requisito de Hull–Dobell): el actual si sirve, si no el menor que sirva"""
+    if c_actual is not None and 0 < c_actual < m and math.gcd(c_actual, m) == 1:
+        return c_actual
+    return next(c for c in range(1, m) if math.gcd(c, m) == 1)
+
+
+def tabla_texto(resultados, periodo, mejores=None):
+    if not resultados:
+        return ("No se encontraron multiplicadores de periodo máximo.\n"
+                "En el método mixto a - 1 debe ser múltiplo de todos los primos de m (y de 4 si 4 | m);\n"
+                "si m no tiene factores primos repetidos, sólo a = 1 lo cumple.\n")
+    dimensiones = sorted(resultados[0]['s'])
+    texto = f"Periodo de cada candidato: {periodo}\n"
+    encabezado = f"{'#':>4} | {'a':>20} | " + " | ".join(f"{'S' + str(t):>6}" for t in dimensiones) + f" | {'M=min':>6}\n"
+    texto += encabezado
+    texto += "-" * (len(encabezado) - 1) + "\n"
+    for i, r in enumerate(resultados[:mejores] if mejores else resultados):
+        texto += f"{i + 1:>4} | {r['a']:>20} | " + " | ".join(f"{r['s'][t]:>6.4f}" for t in dimensiones) + f" | {r['m_min']:>6.4f}\n"
+    return texto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multiplicadores de periodo máximo ordenados por la prueba espectral.")
+    parser.add_argument("m", type=int, help="Módulo")
+    parser.add_argument("--metodo", choices=["mixto", "multiplicativo"], default="mixto")
+    parser.add_argument("--candidatos", type=int, default=100, help="Multiplicadores a evaluar")
+    parser.add_argument("--dimensiones", type=int, default=DIMENSION_MAXIMA, help="Dimensión máxima de la prueba espectral (2..8)")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para muestrear candidatos")
+    parser.add_argument("--mejores", type=int, default=20, help="Filas a mostrar")
+    args = parser.parse_args(argv)
+
+    resultados, periodo = buscar_multiplicadores(args.m, args.metodo, args.candidatos, args.dimensiones,
+                                                 args.procesos, args.semilla)
+    print(tabla_texto(resultados, periodo, args.mejores))
+    if args.metodo == "mixto":
+        print(f"Incremento sugerido: c = {incremento_sugerido(args.m)}")
+
+
+if __name__ == "__main__":
+    main()
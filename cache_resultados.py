@@ -0,0 +1,113 @@
+"""Caché en disco de corridas completas, direccionada por contenido.
+
+Cada entrada es un directorio cuyo nombre es el SHA-256 de los parámetros del
+generador y de la distribución más N. Guarda los arreglos de resultados (.npy, que se
+leen con memoria mapeada), un resumen JSON y los textos de procedimiento. Al superar
+el límite de tamaño se eliminan las entradas usadas hace más tiempo.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+# Cambiar al modificar lo que se guarda o cómo se genera, para no leer entradas viejas
+VERSION_CACHE = 3
+LIMITE_BYTES_CACHE = 256 * 1024 * 1024
+ARCHIVO_RESUMEN = "resumen.json"
+
+
+def directorio_por_defecto():
+    """SIMULADOR_CACHE_DIR si está definida (p. ej. una carpeta compartida del laboratorio)"""
+    return os.environ.get("SIMULADOR_CACHE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "simulador_variables"))
+
+
+def clave_contenido(**partes):
+    """SHA-256 de las partes serializadas en JSON con claves ordenadas"""
+    texto = json.dumps({'version': VERSION_CACHE, **partes}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class CacheResultados:
+    """Entradas {arreglos .npy, resumen, textos} con desalojo LRU por tamaño total"""
+
+    def __init__(self, directorio=None, limite_bytes=LIMITE_BYTES_CACHE):
+        self.directorio = directorio or directorio_por_defecto()
+        self.limite_bytes = limite_bytes
+
+    def ruta(self, clave):
+        return os.path.join(self.directorio, clave)
+
+    def cargar(self, clave):
+        """Entrada guardada o None; los arreglos se abren con mmap_mode='r'"""
+        ruta = self.ruta(clave)
+        ruta_resumen = os.path.join(ruta, ARCHIVO_RESUMEN)
+        try:
+            with open(ruta_resumen, encoding='utf-8') as archivo:
+                contenido = json.load(archivo)
+            arreglos = {nombre: np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode='r')
+                        for nombre in contenido['arreglos']}
+            textos = {}
+            for nombre in contenido['textos']:
+                with open(os.path.join(ruta, f"{nombre}.txt"), encoding='utf-8') as archivo:
+                    textos[nombre] = archivo.read()
+        except (OSError, ValueError, KeyError):
+            # Missing or half-written entry: treat as a miss
+            return None
+        # El tiempo de modificación del resumen marca el último uso
+        try:
+            os.utime(ruta_resumen)
+        except OSError:
+            pass # Shared or read-only cache: the entry is still valid, only its LRU position goes stale
+        return {'arreglos': arreglos, 'resumen': contenido['resumen'], 'textos': textos}
+
+    def guardar(self, clave, arreglos, resumen, textos):
+        """Escribir en un directorio temporal y renombrarlo, para no dejar entradas a medias"""
+        destino = self.ruta(clave)
+        if os.path.isdir(destino):
+            return
+        temporal = f"{destino}.tmp-{os.getpid()}"
+        os.makedirs(temporal, exist_ok=True)
+        try:
+            for nombre, arreglo in arreglos.items():
+                np.save(os.path.join(temporal, f"{nombre}.npy"), np.asarray(arreglo))
+            for nombre, texto in textos.items():
+                with open(os.path.join(temporal, f"{nombre}.txt"), 'w', encoding='utf-8') as archivo:
+                    archivo.write(texto)
+            contenido = {'arreglos': list(arreglos), 'textos': list(textos), 'resumen': resumen, 'creado': time.time()}
+            with open(os.path.join(temporal, ARCHIVO_RESUMEN), 'w', encoding='utf-8') as archivo:
+                json.dump(contenido, archivo, ensure_ascii=False, default=float)
+            os.replace(temporal, destino)
+        except OSError:
+            shutil.rmtree(temporal, ignore_errors=True)
+            if not os.path.isdir(destino):
+                raise
+        self.desalojar()
+
+    def entradas(self):
+        """(último uso, bytes, ruta) de cada entrada completa"""
+        resultado = []
+        if not os.path.isdir(self.directorio):
+            return resultado
+        for nombre in os.listdir(self.directorio):
+            ruta = os.path.join(self.directorio, nombre)
+            ruta_resumen = os.path.join(ruta, ARCHIVO_RESUMEN)
+            if not os.path.isfile(ruta_resumen):
+                continue
+            tamano = sum(entrada.stat().st_size for entrada in os.scandir(ruta) if entrada.is_file())
+            resultado.append((os.path.getmtime(ruta_resumen), tamano, ruta))
+        return resultado
+
+    def desalojar(self):
+        """Eliminar las entradas menos usadas recientemente hasta quedar bajo el límite"""
+        entradas = sorted(self.entradas())
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in entradas:
+            if total <= self.limite_bytes:
+                break
+            shutil.rmtree(ruta, ignore_errors=True)
+            total -= tamano
+        return total
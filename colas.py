@@ -0,0 +1,387 @@
+"""Simulación de eventos discretos de colas FIFO: M/M/c, M/G/1 y capacidad finita (M/G/c/K).
+
+Las llegadas forman un proceso de Poisson de tasa λ: interllegadas Exponencial(λ) o,
+como alternativa, conteos Poisson por ventana con posiciones uniformes dentro de cada
+una. El servicio puede ser cualquier familia del registro con soporte no negativo.
+Todas las variables salen por bloques de las transformaciones del proyecto, desde una
+misma fuente de uniformes.
+
+Con capacidad finita, el calendario de eventos es un montículo binario (heapq) con las
+salidas pendientes: en cada llegada se procesan primero las salidas anteriores de la
+cima del montículo y, si el sistema está lleno, el cliente se pierde. Un segundo
+montículo guarda el instante en que se libera cada servidor (recursión de
+Kiefer–Wolfowitz para FIFO); con capacidad infinita basta ese montículo, porque la
+cantidad de clientes que ve cada llegada se cuenta después, vectorizada, con las
+salidas ordenadas. Con un solo servidor y capacidad infinita (M/G/1), la recursión de
+Lindley se resuelve con un máximo acumulado, sin bucle por cliente.
+
+Las esperas, los tiempos en el sistema y la cantidad de clientes que ve cada llegada se
+acumulan por bloque (media/varianza de Chan y tabla de frecuencias); por PASTA, esa
+tabla estima la distribución estacionaria del número en el sistema.
+
+Uso sin interfaz gráfica, por ejemplo:
+
+    python colas.py --lambda 0.9 -n 5000000
+    python colas.py --lambda 3 --servidores 4 --capacidad 6 --servicio Exponencial --param Lambda=1
+    python colas.py --lambda 0.8 --servicio Uniforme --param Mínimo=0 --param Máximo=2 --llegadas Poisson
+"""
+import argparse
+import heapq
+import math
+import time
+
+import numpy as np
+from scipy.special import gammaln, logsumexp
+
+from convergencia import AcumuladorMomentos
+from distribuciones import REGISTRO, ErrorParametros, clave_parametro, convertir_parametros, modelo_teorico
+from flujo import TAMANO_BLOQUE, FuenteUniformes, SumideroFrecuencias, muestreador_distribucion
+
+METODOS_LLEGADA = ("Exponencial", "Poisson")
+# Filas de la tabla de P(n en el sistema) en el resumen
+ESTADOS_RESUMEN = 15
+
+
+def tiempos_llegada(tasa, fuente, n, desde=0.0, metodo="Exponencial"):
+    """Los n instantes de llegada siguientes a `desde` de un proceso de Poisson de tasa λ.
+
+    "Exponencial": suma acumulada de interllegadas Exponencial(λ). "Poisson": conteos
+    Poisson(1) en ventanas de largo 1/λ y posiciones uniformes en cada ventana; las
+    llegadas posteriores a la n-ésima se descartan, lo que no altera el proceso porque
+    lo que ocurre después de una llegada es independiente de lo anterior.
+    """
+    if metodo == "Exponencial":
+        interllegadas = muestreador_distribucion("Exponencial", convertir_parametros("Exponencial", {"Lambda": tasa}))
+        return desde + np.cumsum(interllegadas(fuente, n))
+    if metodo != "Poisson":
+        raise ErrorParametros(f"Método de llegadas desconocido: {metodo}. Use {' o '.join(METODOS_LLEGADA)}.")
+    conteos_ventana = muestreador_distribucion("Poisson", convertir_parametros("Poisson", {"Lambda": 1.0}))
+    partes = []
+    obtenidas = 0
+    inicio = desde
+    while obtenidas < n:
+        ventanas = n - obtenidas + 3 * math.isqrt(n - obtenidas) + 16
+        conteos = conteos_ventana(fuente, ventanas)
+        total = int(conteos.sum())
+        tiempos = inicio + (np.repeat(np.arange(ventanas), conteos) + fuente.tomar(total)) / tasa
+        # Windows are disjoint, so sorting the whole batch only reorders within each window
+        tiempos.sort()
+        partes.append(tiempos)
+        obtenidas += total
+        inicio += ventanas / tasa
+    return np.concatenate(partes)[:n]
+
+
+class SimuladorCola:
+    """Cola FIFO con c servidores y capacidad K (None = infinita), alimentada por bloques de clientes"""
+
+    def __init__(self, servidores=1, capacidad=None):
+        if servidores < 1:
+            raise ErrorParametros("Se necesita al menos un servidor.")
+        if capacidad is not None and capacidad < servidores:
+            raise ErrorParametros("La capacidad del sistema (K) no puede ser menor que la cantidad de servidores.")
+        self.servidores = servidores
+        self.capacidad = capacidad
+        self.libres = [0.0] * servidores  # Instant at which each server becomes free (heap)
+        self.salidas = []  # Event calendar: departure times of the customers in the system (heap)
+        self.ultima_salida = 0.0
+        self.pendientes = np.empty(0)
+        self.espera = AcumuladorMomentos()
+        self.permanencia = AcumuladorMomentos()
+        self.vistos = SumideroFrecuencias()
+        self.llegadas = 0
+        self.bloqueados = 0
+        self.con_espera = 0
+        self.suma_esperas = 0.0
+        self.suma_permanencias = 0.0
+        self.trabajo = 0.0
+        self.horizonte = 0.0
+        self.segundos = 0.0
+
+    @property
+    def motor(self):
+        if self.capacidad is not None:
+            return "calendario de eventos (montículo binario)"
+        if self.servidores == 1:
+            return "recursión de Lindley vectorizada"
+        return "montículo de servidores (Kiefer–Wolfowitz)"
+
+    @property
+    def atendidos(self):
+        return self.llegadas - self.bloqueados
+
+    @property
+    def eventos(self):
+        """Llegadas más salidas"""
+        return self.llegadas + self.atendidos
+
+    def agregar(self, llegadas, servicios):
+        """Procesar un bloque de clientes: instantes de llegada crecientes y sus tiempos de servicio"""
+        if len(llegadas) == 0:
+            return
+        self.horizonte = float(llegadas[-1])
+        if self.capacidad is None:
+            if self.servidores == 1:
+                inicios, salidas = self.procesar_lindley(llegadas, servicios)
+            else:
+                inicios, salidas = self.procesar_servidores(llegadas, servicios)
+            vistos = self.contar_en_sistema(llegadas, salidas)
+        else:
+            inicios, vistos, rechazados = self.procesar_calendario(llegadas, servicios)
+            if rechazados:
+                aceptados = np.ones(len(llegadas), dtype=bool)
+                aceptados[rechazados] = False
+                llegadas = llegadas[aceptados]
+                servicios = servicios[aceptados]
+                self.bloqueados += len(rechazados)
+        esperas = inicios - llegadas
+        permanencias = esperas + servicios
+        self.llegadas += len(vistos)
+        self.espera.agregar(esperas)
+        self.permanencia.agregar(permanencias)
+        self.vistos.agregar(vistos)
+        self.con_espera += int(np.count_nonzero(esperas > 0))
+        self.suma_esperas += float(esperas.sum())
+        self.suma_permanencias += float(permanencias.sum())
+        self.trabajo += float(servicios.sum())
+
+    def procesar_calendario(self, llegadas, servicios):
+        """Simulación por eventos: (inicios de servicio de los aceptados, clientes vistos, índices bloqueados)"""
+        libres = self.libres
+        salidas = self.salidas
+        capacidad = self.capacidad
+        heappop, heappush, heapreplace = heapq.heappop, heapq.heappush, heapq.heapreplace
+        inicios = []
+        vistos = []
+        rechazados = []
+        for i, (llegada, servicio) in enumerate(zip(llegadas.tolist(), servicios.tolist())):
+            # Departure events that happen before this arrival leave the calendar first
+            while salidas and salidas[0] <= llegada:
+                heappop(salidas)
+            en_sistema = len(salidas)
+            vistos.append(en_sistema)
+            if en_sistema >= capacidad:
+                rechazados.append(i)
+                continue
+            libre = libres[0]
+            inicio = llegada if libre <= llegada else libre
+            fin = inicio + servicio
+            heapreplace(libres, fin)
+            heappush(salidas, fin)
+            inicios.append(inicio)
+        return np.array(inicios), np.array(vistos, dtype=np.int64), rechazados
+
+    def procesar_servidores(self, llegadas, servicios):
+        """c servidores, capacidad infinita: cada cliente toma el servidor que se libera primero"""
+        libres = self.libres
+        heapreplace = heapq.heapreplace
+        inicios = []
+        agregar_inicio = inicios.append
+        for llegada, servicio in zip(llegadas.tolist(), servicios.tolist()):
+            libre = libres[0]
+            inicio = llegada if libre <= llegada else libre
+            heapreplace(libres, inicio + servicio)
+            agregar_inicio(inicio)
+        inicios = np.array(inicios)
+        return inicios, inicios + servicios
+
+    def procesar_lindley(self, llegadas, servicios):
+        """Un servidor, capacidad infinita: inicio_i = max(llegada_i, salida_{i-1}) con un máximo acumulado.
+
+        Con S_i la suma de servicios hasta i, salida_i - S_i = max(llegada_i - S_{i-1}, salida_{i-1} - S_{i-1}).
+        """
+        acumulado = np.cumsum(servicios)
+        previo = acumulado - servicios
+        propia = llegadas - previo
+        holgura = propia.copy()
+        holgura[0] = max(holgura[0], self.ultima_salida)
+        np.maximum.accumulate(holgura, out=holgura)
+        self.ultima_salida = float(holgura[-1] + acumulado[-1])
+        # Customers that find the server free start exactly at arrival (no rounding leftovers as "waits")
+        return np.where(holgura > propia, holgura + previo, llegadas), holgura + acumulado
+
+    def contar_en_sistema(self, llegadas, salidas):
+        """Clientes que ve cada llegada: los anteriores cuya salida aún no ocurrió.
+
+        Las salidas de ese cliente y de los siguientes nunca son anteriores a su llegada, así
+        que basta contar cuántas salidas ordenadas (de este bloque y pendientes) la preceden.
+        """
+        todas = np.concatenate([self.pendientes, salidas])
+        if self.servidores > 1:
+            todas.sort()
+        anteriores = len(self.pendientes) + np.arange(len(llegadas))
+        vistos = anteriores - np.minimum(np.searchsorted(todas, llegadas, side='right'), anteriores)
+        self.pendientes = todas[np.searchsorted(todas, llegadas[-1], side='right'):]
+        return vistos
+
+    def medidas(self):
+        """Medidas de desempeño estimadas, con las mismas claves que teoria_cola"""
+        return {
+            'Wq': self.espera.media, 'W': self.permanencia.media,
+            # Time averages over [0, última llegada]: area under the queue-length curves
+            'Lq': self.suma_esperas / self.horizonte if self.horizonte else float('nan'),
+            'L': self.suma_permanencias / self.horizonte if self.horizonte else float('nan'),
+            'P_espera': self.con_espera / self.atendidos if self.atendidos else float('nan'),
+            'P_bloqueo': self.bloqueados / self.llegadas if self.llegadas else float('nan'),
+            'utilizacion': self.trabajo / (self.servidores * self.horizonte) if self.horizonte else float('nan'),
+        }
+
+    def probabilidades_estado(self):
+        """P(n clientes en el sistema) vista por las llegadas, n = 0, 1, ..."""
+        conteos = self.vistos.conteos
+        if self.vistos.minimo is None or conteos.sum() == 0:
+            return np.zeros(0)
+        return np.concatenate([np.zeros(self.vistos.minimo), conteos / conteos.sum()])
+
+
+def validar_servicio(tasa, servicio, params_servicio, servidores, capacidad):
+    """Modelo del tiempo de servicio; ErrorParametros si admite valores negativos o la cola es inestable"""
+    if not tasa > 0:
+        raise ErrorParametros("La tasa de llegadas λ debe ser mayor que 0.")
+    modelo = modelo_teorico(servicio, params_servicio)
+    if modelo.support()[0] < 0:
+        raise ErrorParametros(f"El tiempo de servicio no puede ser negativo: la {servicio} elegida admite valores "
+                              f"desde {modelo.support()[0]:g}.")
+    rho = tasa * modelo.mean() / servidores
+    if capacidad is None and rho >= 1:
+        raise ErrorParametros(f"La cola es inestable (ρ = λ·E[S]/c = {rho:.4f} ≥ 1); use una capacidad finita "
+                              f"o reduzca λ.")
+    return modelo
+
+
+def simular_cola(tasa, servicio, params_servicio, n_clientes, servidores=1, capacidad=None, config=None, rng=None,
+                 llegadas="Exponencial", tamano_bloque=TAMANO_BLOQUE):
+    """Simular n_clientes llegadas; devuelve el SimuladorCola con sus acumuladores y el tiempo en `segundos`"""
+    validar_servicio(tasa, servicio, params_servicio, servidores, capacidad)
+    simulador = SimuladorCola(servidores, capacidad)
+    fuente = FuenteUniformes.desde_generador(config or {"metodo": "estandar"}, tamano_bloque, rng=rng)
+    muestrear_servicio = muestreador_distribucion(servicio, params_servicio)
+    inicio = time.perf_counter()
+    desde = 0.0
+    restantes = n_clientes
+    while restantes > 0:
+        n = min(tamano_bloque, restantes)
+        instantes = tiempos_llegada(tasa, fuente, n, desde, llegadas)
+        simulador.agregar(instantes, np.asarray(muestrear_servicio(fuente, n), dtype=np.float64))
+        desde = float(instantes[-1])
+        restantes -= n
+    simulador.segundos = time.perf_counter() - inicio
+    return simulador
+
+
+def probabilidades_mmck(a, servidores, capacidad):
+    """P(n) para n = 0..K de una M/M/c/K con carga ofrecida a = λ/μ, calculada en escala logarítmica"""
+    n = np.arange(capacidad + 1)
+    c = servidores
+    log_pesos = np.where(n <= c, n * np.log(a) - gammaln(n + 1),
+                         c * np.log(a) - gammaln(c + 1) + (n - c) * np.log(a / c))
+    return np.exp(log_pesos - logsumexp(log_pesos))
+
+
+def teoria_cola(tasa, servicio, params_servicio, servidores=1, capacidad=None):
+    """Medidas analíticas (M/M/c, M/M/c/K, Pollaczek–Khinchine para M/G/1) o None si no hay fórmula exacta"""
+    modelo = modelo_teorico(servicio, params_servicio)
+    media_servicio = modelo.mean()
+    c = servidores
+    if servicio == "Exponencial":
+        a = tasa * media_servicio
+        rho = a / c
+        if capacidad is None:
+            # Erlang C: the states n ≥ c form a geometric tail of ratio ρ
+            log_pesos = np.arange(c + 1) * np.log(a) - gammaln(np.arange(c + 1) + 1)
+            log_cola = log_pesos[c] - np.log1p(-rho)
+            log_total = logsumexp(np.append(log_pesos[:c], log_cola))
+            p_espera = float(np.exp(log_cola - log_total))
+            lq = p_espera * rho / (1 - rho)
+            wq = lq / tasa
+            estados = np.exp(np.append(log_pesos[:c], log_pesos[c] + np.arange(ESTADOS_RESUMEN) * np.log(rho)) - log_total)
+            return {'modelo': f"M/M/{c}", 'Wq': wq, 'W': wq + media_servicio, 'Lq': lq, 'L': lq + a,
+                    'P_espera': p_espera, 'P_bloqueo': 0.0, 'utilizacion': rho, 'p': estados}
+        p = probabilidades_mmck(a, c, capacidad)
+        n = np.arange(capacidad + 1)
+        tasa_efectiva = tasa * (1 - p[-1])
+        l = float(np.sum(n * p))
+        lq = float(np.sum(np.maximum(n - c, 0) * p))
+        # Arrivals see the stationary distribution (PASTA); accepted ones wait when all servers are busy
+        p_espera = float(p[c:-1].sum() / (1 - p[-1]))
+        return {'modelo': f"M/M/{c}/{capacidad}", 'Wq': lq / tasa_efectiva, 'W': l / tasa_efectiva, 'Lq': lq, 'L': l,
+                'P_espera': p_espera, 'P_bloqueo': float(p[-1]), 'utilizacion': tasa_efectiva * media_servicio / c, 'p': p}
+    if c == 1 and capacidad is None:
+        rho = tasa * media_servicio
+        segundo_momento = modelo.var() + media_servicio ** 2
+        wq = tasa * segundo_momento / (2 * (1 - rho))
+        return {'modelo': "M/G/1", 'Wq': wq, 'W': wq + media_servicio, 'Lq': tasa * wq, 'L': tasa * (wq + media_servicio),
+                'P_espera': rho, 'P_bloqueo': 0.0, 'utilizacion': rho, 'p': np.array([1 - rho])}
+    return None
+
+
+def nombre_modelo(servicio, servidores, capacidad):
+    """Notación de Kendall: M/M/c, M/G/1, M/G/c/K, ..."""
+    nombre = f"M/{'M' if servicio == 'Exponencial' else 'G'}/{servidores}"
+    return nombre if capacidad is None else f"{nombre}/{capacidad}"
+
+
+def texto_resumen_cola(simulador, teoria, tasa, servicio):
+    """Medidas simuladas frente a las analíticas y la distribución del número en el sistema"""
+    modelo = nombre_modelo(servicio, simulador.servidores, simulador.capacidad)
+    simuladas = simulador.medidas()
+    texto = f"{'='*60}\n"
+    texto += f"{'SIMULACIÓN DE COLA ' + modelo:^60}\n"
+    texto += f"{'='*60}\n"
+    texto += f"λ = {tasa:g}, servicio {servicio}, {simulador.servidores} servidor(es), capacidad "
+    texto += f"{'infinita' if simulador.capacidad is None else simulador.capacidad}\n"
+    texto += f"Motor: {simulador.motor}\n"
+    texto += f"Clientes: {simulador.llegadas} ({simulador.bloqueados} bloqueados), eventos: {simulador.eventos}\n"
+    texto += f"Tiempo: {simulador.segundos:.3f} s ({simulador.eventos / max(simulador.segundos, 1e-9):.4g} eventos/s)\n\n"
+    texto += f"{'Medida':<24} {'Simulada':>12} {'Teórica':>12} {'Error rel.':>11}\n"
+    etiquetas = [('Wq', "Espera en cola (Wq)"), ('W', "Tiempo en sistema (W)"), ('Lq', "Clientes en cola (Lq)"),
+                 ('L', "Clientes en sistema (L)"), ('P_espera', "P(esperar)"), ('P_bloqueo', "P(bloqueo)"),
+                 ('utilizacion', "Utilización")]
+    for clave, etiqueta in etiquetas:
+        valor = simuladas[clave]
+        if teoria is None:
+            texto += f"{etiqueta:<24} {valor:>12.6f} {'—':>12} {'—':>11}\n"
+            continue
+        referencia = teoria[clave]
+        error = f"{abs(valor - referencia) / abs(referencia):>10.3%}" if referencia else f"{'—':>10}"
+        texto += f"{etiqueta:<24} {valor:>12.6f} {referencia:>12.6f} {error:>11}\n"
+    if teoria is None:
+        texto += f"\nNo hay fórmula exacta para {modelo}; sólo se muestran los valores simulados.\n"
+    probabilidades = simulador.probabilidades_estado()
+    teoricas = teoria['p'] if teoria is not None else np.zeros(0)
+    texto += f"\n{'n':>4} {'P(n) simulada':>14} {'P(n) teórica':>14}\n"
+    for n in range(min(len(probabilidades), ESTADOS_RESUMEN)):
+        teorica = f"{teoricas[n]:>14.6f}" if n < len(teoricas) else f"{'—':>14}"
+        texto += f"{n:>4} {probabilidades[n]:>14.6f} {teorica}\n"
+    texto += f"{'='*60}\n"
+    return texto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simular una cola FIFO por eventos discretos y compararla con la teoría.")
+    parser.add_argument("--lambda", dest="tasa", type=float, required=True, help="Tasa de llegadas λ")
+    parser.add_argument("--servicio", default="Exponencial", help="Distribución del tiempo de servicio")
+    parser.add_argument("--param", action="append", default=[], help="Parámetro del servicio, p. ej. Lambda=1")
+    parser.add_argument("--servidores", type=int, default=1)
+    parser.add_argument("--capacidad", type=int, default=None, help="Capacidad K del sistema (por defecto infinita)")
+    parser.add_argument("--llegadas", choices=METODOS_LLEGADA, default="Exponencial")
+    parser.add_argument("-n", type=int, default=1_000_000, help="Cantidad de clientes (llegadas)")
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.servicio not in REGISTRO:
+        parser.error(f"Distribución desconocida: {args.servicio}. Disponibles: {', '.join(REGISTRO)}")
+    # Parameters not given on the command line keep the form's default values
+    valores = {clave_parametro(etiqueta): defecto for etiqueta, _, defecto in REGISTRO[args.servicio].parametros}
+    valores.update(p.split("=", 1) for p in args.param)
+    try:
+        params = convertir_parametros(args.servicio, valores)
+        simulador = simular_cola(args.tasa, args.servicio, params, args.n, args.servidores, args.capacidad,
+                                 rng=np.random.default_rng(args.semilla), llegadas=args.llegadas)
+    except ErrorParametros as e:
+        parser.error(str(e))
+    print(texto_resumen_cola(simulador, teoria_cola(args.tasa, args.servicio, params, args.servidores, args.capacidad),
+                             args.tasa, args.servicio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import numpy as np
+
+from distribuciones import DISCRETAS
+
+BINS_CONVERGENCIA = 40
+# Puntos máximos en las curvas de media/varianza; al superarlos se conserva uno de cada dos
+MAX_PUNTOS_CURVA = 2000
+
+
+class AcumuladorMomentos:
+    """Media y varianza acumuladas por bloques (combinación de Chan), en float64"""
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    def agregar(self, bloque):
+        bloque = np.asarray(bloque)
+        if bloque.dtype != np.float32:
+            bloque = bloque.astype(np.float64, copy=False)
+        n_b = bloque.size
+        if n_b == 0:
+            return
+        # float32 blocks are reduced with float64 accumulators rather than copied to float64 first
+        media_b = bloque.mean(dtype=np.float64)
+        desviaciones = bloque - bloque.dtype.type(media_b)
+        m2_b = np.sum(desviaciones * desviaciones, dtype=np.float64)
+        n_total = self.n + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n_total
+        self.m2 += m2_b + delta * delta * self.n * n_b / n_total
+        self.n = n_total
+
+    @property
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else float('nan')
+
+
+class HistogramaIncremental:
+    """Histograma con bordes fijos que se actualiza sólo con el bloque nuevo.
+
+    Los bordes se eligen a partir del modelo teórico; los valores fuera de rango se
+    cuentan aparte para que la densidad siga normalizada sobre el total.
+    """
+
+    def __init__(self, distribucion, modelo, bins=BINS_CONVERGENCIA):
+        self.discreta = distribucion in DISCRETAS
+        if self.discreta:
+            inicio = int(modelo.ppf(0.0001))
+            fin = int(modelo.ppf(0.9999))
+            self.bordes = np.arange(inicio - 0.5, fin + 1.5)
+        else:
+            self.bordes = np.linspace(modelo.ppf(0.001), modelo.ppf(0.999), bins + 1)
+        self.conteos = np.zeros(len(self.bordes) - 1, dtype=np.int64)
+        self.fuera_de_rango = 0
+        self.total = 0
+
+    def agregar(self, bloque):
+        bloque = np.asarray(bloque)
+        inicio = self.bordes[0]
+        ancho = self.bordes[1] - self.bordes[0]
+        if bloque.dtype == np.float32:
+            # Bin in the block's own precision instead of promoting the whole block to float64
+            inicio, ancho = np.float32(inicio), np.float32(ancho)
+        indices = np.floor((bloque - inicio) / ancho).astype(np.int64)
+        dentro = (indices >= 0) & (indices < len(self.conteos))
+        self.conteos += np.bincount(indices[dentro], minlength=len(self.conteos))
+        self.fuera_de_rango += bloque.size - np.count_nonzero(dentro)
+        self.total += bloque.size
+
+    def densidades(self):
+        if self.total == 0:
+            return np.zeros(len(self.conteos))
+        return self.conteos / (self.total * np.diff(self.bordes))
+
+
+class VistaConvergencia:
+    """Histograma, media y varianza acumuladas redibujados con blitting.
+
+    Sólo los artistas animados (barras y curvas) se repintan en cada bloque; el fondo
+    (ejes, curvas teóricas, textos) se captura una vez y se restaura.
+    """
+
+    def __init__(self, figura, canvas, distribucion, modelo, n_total, colores):
+        self.figura = figura
+        self.canvas = canvas
+        self.modelo = modelo
+        self.histograma = HistogramaIncremental(distribucion, modelo)
+        self.acumulador = AcumuladorMomentos()
+        self.media_teorica = modelo.mean()
+        self.var_teorica = modelo.var()
+        self.puntos_n, self.puntos_media, self.puntos_var = [], [], []
+
+        figura.clear()
+        self.ax_hist = figura.add_subplot(2, 1, 1)
+        self.ax_media = figura.add_subplot(2, 2, 3)
+        self.ax_var = figura.add_subplot(2, 2, 4)
+
+        bordes = self.histograma.bordes
+        centros = (bordes[:-1] + bordes[1:]) / 2
+        anchos = np.diff(bordes) * (0.8 if self.histograma.discreta else 1.0)
+        self.barras = self.ax_hist.bar(centros, np.zeros(len(centros)), width=anchos, color=colores['relleno'],
+                                       edgecolor=colores['borde'], alpha=0.7, animated=True)
+        if self.histograma.discreta:
+            teorica = modelo.pmf(np.round(centros))
+            self.ax_hist.plot(centros, teorica, 'ro', markersize=4, label="PMF Teórica")
+        else:
+            x = np.linspace(bordes[0], bordes[-1], 200)
+            teorica = modelo.pdf(x)
+            self.ax_hist.plot(x, teorica, color='red', linestyle='dashed', linewidth=2, label="PDF Teórica")
+        self.ax_hist.set_xlim(bordes[0], bordes[-1])
+        self.ax_hist.set_ylim(0, 1.3 * np.max(teorica))
+        self.ax_hist.set_title(f"Convergencia de {distribucion}", color=colores['texto'])
+        self.ax_hist.legend(loc='upper right')
+        self.texto_estado = self.ax_hist.text(0.01, 0.95, "", transform=self.ax_hist.transAxes,
+                                              verticalalignment='top', animated=True, color=colores['texto'])
+
+        self.linea_media, = self.ax_media.plot([], [], color=colores['borde'], animated=True)
+        self.ax_media.axhline(self.media_teorica, color='red', linestyle='dashed', linewidth=1.5)
+        self.ax_media.set_title("Media acumulada", color=colores['texto'])
+        self.linea_var, = self.ax_var.plot([], [], color=colores['borde'], animated=True)
+        self.ax_var.axhline(self.var_teorica, color='red', linestyle='dashed', linewidth=1.5)
+        self.ax_var.set_title("Varianza acumulada", color=colores['texto'])
+        for ax in (self.ax_media, self.ax_var):
+            ax.set_xlim(0, n_total)
+            ax.set_xlabel("n", color=colores['texto'])
+
+        desviacion = np.sqrt(self.var_teorica)
+        self.ax_media.set_ylim(self.media_teorica - desviacion, self.media_teorica + desviacion)
+        self.ax_var.set_ylim(0, 2 * self.var_teorica)
+        figura.tight_layout()
+        self.capturar_fondo()
+
+    def capturar_fondo(self):
+        self.canvas.draw()
+        self.fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+
+    def agregar_bloque(self, bloque):
+        """Incorporar un bloque de valores y repintar sólo lo que cambió"""
+        self.histograma.agregar(bloque)
+        self.acumulador.agregar(bloque)
+        self.puntos_n.append(self.acumulador.n)
+        self.puntos_media.append(self.acumulador.media)
+        self.puntos_var.append(self.acumulador.varianza)
+        if len(self.puntos_n) > MAX_PUNTOS_CURVA:
+            self.puntos_n = self.puntos_n[::2]
+            self.puntos_media = self.puntos_media[::2]
+            self.puntos_var = self.puntos_var[::2]
+
+        for barra, altura in zip(self.barras, self.histograma.densidades()):
+            barra.set_height(altura)
+        self.linea_media.set_data(self.puntos_n, self.puntos_media)
+        self.linea_var.set_data(self.puntos_n, self.puntos_var)
+        self.texto_estado.set_text(f"n = {self.acumulador.n}\nmedia = {self.acumulador.media:.5f} (teórica {self.media_teorica:.5f})\n"
+                                   f"varianza = {self.acumulador.varianza:.5f} (teórica {self.var_teorica:.5f})")
+
+        if self.ajustar_limites():
+            # Limits changed: the static background must be captured again
+            self.capturar_fondo()
+        self.canvas.restore_region(self.fondo)
+        for artista in list(self.barras) + [self.linea_media, self.linea_var, self.texto_estado]:
+            artista.axes.draw_artist(artista)
+        self.canvas.blit(self.figura.bbox)
+
+    def ajustar_limites(self):
+        cambio = False
+        for ax, valor in ((self.ax_media, self.acumulador.media), (self.ax_var, self.acumulador.varianza)):
+            y0, y1 = ax.get_ylim()
+            if np.isfinite(valor) and not (y0 <= valor <= y1):
+                margen = (y1 - y0) / 2
+                ax.set_ylim(min(y0, valor - margen), max(y1, valor + margen))
+                cambio = True
+        return cambio
@@ -0,0 +1,58 @@
+import numpy as np
+
+BINS_SERIAL = 256
+CORTES_TRIPLES = 4
+
+
+def densidad_pares(x, y, bins=BINS_SERIAL, rango=((0.0, 1.0), (0.0, 1.0))):
+    """Contar los pares (x, y) dentro del rango visible en una malla bins × bins.
+
+    Usa np.bincount sobre el índice lineal de cada celda, por lo que el costo es
+    lineal en N y la memoria sólo depende del tamaño de la malla. La matriz
+    devuelta está indexada [fila_y, columna_x], lista para imshow(origin='lower').
+    """
+    (x0, x1), (y0, y1) = rango
+    x = np.asarray(x)
+    y = np.asarray(y)
+    visibles = (x >= x0) & (x < x1) & (y >= y0) & (y < y1)
+    if not visibles.all():
+        x = x[visibles]
+        y = y[visibles]
+    if x1 <= x0 or y1 <= y0 or x.size == 0:
+        return np.zeros((bins, bins))
+
+    ix = ((x - x0) * (bins / (x1 - x0))).astype(np.int64)
+    iy = ((y - y0) * (bins / (y1 - y0))).astype(np.int64)
+    # Protección ante redondeos en el borde superior
+    np.minimum(ix, bins - 1, out=ix)
+    np.minimum(iy, bins - 1, out=iy)
+    conteos = np.bincount(iy * bins + ix, minlength=bins * bins)
+    return conteos.reshape(bins, bins).astype(float)
+
+
+def pares_seriales(r, retardo=1):
+    """Devolver las coordenadas (R_i, R_{i+retardo}) como vistas sin copiar"""
+    r = np.asarray(r, dtype=float)
+    if r.size <= retardo:
+        return r[:0], r[:0]
+    return r[:-retardo], r[retardo:]
+
+
+def cortes_triples(r, cortes=CORTES_TRIPLES):
+    """Separar las ternas (R_i, R_{i+1}, R_{i+2}) en cortes según R_{i+2}.
+
+    Devuelve una lista de (z0, z1, x, y) con los pares (R_i, R_{i+1}) cuyo tercer
+    valor cae en [z0, z1).
+    """
+    r = np.asarray(r, dtype=float)
+    if r.size < 3:
+        return []
+    x, y, z = r[:-2], r[1:-1], r[2:]
+    indice_corte = np.minimum((z * cortes).astype(np.int64), cortes - 1)
+    orden = np.argsort(indice_corte, kind='stable')
+    limites = np.searchsorted(indice_corte[orden], np.arange(cortes + 1))
+    resultado = []
+    for k in range(cortes):
+        seleccion = orden[limites[k]:limites[k + 1]]
+        resultado.append((k / cortes, (k + 1) / cortes, x[seleccion], y[seleccion]))
+    return resultado
@@ -0,0 +1,393 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.stats import (norm, expon, binom, poisson, geom, uniform, erlang, gamma, beta, weibull_min,
+                         lognorm, triang, hypergeom)
+
+
+class ErrorParametros(ValueError):
+    """Parámetros de distribución fuera de rango (el mensaje es apto para mostrar al usuario)"""
+
+
+def clave_parametro(etiqueta):
+    """Clave de un parámetro a partir de su etiqueta: "Media (μ):" -> "Media" """
+    return etiqueta.split('(')[0].strip()
+
+
+class Distribucion:
+    """Familia del registro: parámetros, validación, muestreador vectorizado y modelo teórico.
+
+    - parametros: lista de (etiqueta, tipo, valor por defecto) para el formulario.
+    - validar(valores) recibe los valores ya convertidos a su tipo y devuelve el dict de
+      parámetros que usan el muestreador y el modelo, o lanza ErrorParametros.
+    - modelo(params) devuelve la distribución congelada de scipy.stats (PDF/PMF, momentos).
+    - Muestreo con consumo fijo: estructura(params, n) -> (filas, k) uniformes y
+      transformar(params, u, n) sobre filas·k uniformes.
+    - Muestreo con consumo variable (rechazo): muestrear_bloque(params, fuente, n), que
+      pide a la fuente los uniformes que necesite, y estimar_uniformes(params, n).
+    """
+
+    def __init__(self, nombre, parametros, validar, modelo, transformar=None, estructura=None,
+                 muestrear_bloque=None, estimar_uniformes=None, discreta=False, metodo=""):
+        self.nombre = nombre
+        self.parametros = parametros
+        self.validar = validar
+        self.modelo = modelo
+        self.transformar = transformar
+        self.estructura = estructura
+        self.muestrear_bloque_variable = muestrear_bloque
+        self.estimar_uniformes = estimar_uniformes
+        self.discreta = discreta
+        self.metodo = metodo
+
+    @property
+    def consumo_fijo(self):
+        return self.estructura is not None
+
+    def convertir(self, valores_raw):
+        valores = {}
+        for etiqueta, tipo, _ in self.parametros:
+            clave = clave_parametro(etiqueta)
+            valores[clave] = tipo(valores_raw.get(clave, 0))
+        return self.validar(valores)
+
+    def uniformes_requeridos(self, params, n):
+        """Uniformes exactos (consumo fijo) o estimados (rechazo) para n variables"""
+        if self.consumo_fijo:
+            filas, k = self.estructura(params, n)
+            return filas * k
+        return self.estimar_uniformes(params, n)
+
+    def muestrear_bloque(self, params, fuente, n):
+        if self.consumo_fijo:
+            return self.transformar(params, fuente.tomar(self.uniformes_requeridos(params, n)), n)
+        return self.muestrear_bloque_variable(params, fuente, n)
+
+
+REGISTRO = {}
+
+
+def registrar(distribucion):
+    REGISTRO[distribucion.nombre] = distribucion
+    return distribucion
+
+
+def una_por_muestra(params, n):
+    return n, 1
+
+
+def pares_box_muller(params, n):
+    return (n + 1) // 2, 2
+
+
+def evitar_uno(u):
+    return np.where(u == 1, 0.999999, u) # Avoid log(0) in ln(1-U)
+
+
+def normales_box_muller(u):
+    """Normales estándar a partir de pares (U1, U2): Z0 = R·cos(2πU2), Z1 = R·sin(2πU2)"""
+    u1 = np.where(u[0::2] == 0, 1e-10, u[0::2]) # Avoid log(0)
+    u2 = u[1::2]
+    sqrt_term = np.sqrt(-2 * np.log(u1))
+    angulo = 2 * np.pi * u2
+    z = np.empty(2 * len(u1), dtype=sqrt_term.dtype) # float32 uniforms give float32 normals
+    z[0::2] = sqrt_term * np.cos(angulo)
+    z[1::2] = sqrt_term * np.sin(angulo)
+    return z
+
+
+def gamma_marsaglia_tsang(alfa, fuente, n):
+    """n valores Gamma(α, 1) por el método de Marsaglia–Tsang, en lotes sobredimensionados.
+
+    Cada candidato usa una normal (Box-Muller) y un uniforme de aceptación; la tasa de
+    aceptación supera el 95 %, así que un lote un 10 % mayor que lo que falta suele bastar.
+    Para α < 1 se genera Gamma(α + 1) y se multiplica por U^(1/α).
+    """
+    a = alfa + 1 if alfa < 1 else alfa
+    d = a - 1 / 3
+    c = 1 / np.sqrt(9 * d)
+    resultado = np.empty(n)
+    obtenidos = 0
+    while obtenidos < n:
+        faltan = n - obtenidos
+        candidatos = int(faltan * 1.1) + 16
+        candidatos += candidatos % 2
+        z = normales_box_muller(fuente.tomar(candidatos))
+        u = fuente.tomar(candidatos)
+        v = (1 + c * z) ** 3
+        positivos = v > 0
+        v_seguro = np.where(positivos, v, 1.0)
+        with np.errstate(divide='ignore'):
+            acepta = positivos & (np.log(u) < 0.5 * z * z + d - d * v_seguro + d * np.log(v_seguro))
+        aceptados = (d * v)[acepta][:faltan]
+        resultado[obtenidos:obtenidos + len(aceptados)] = aceptados
+        obtenidos += len(aceptados)
+    if alfa < 1:
+        resultado *= fuente.tomar(n) ** (1 / alfa)
+    return resultado
+
+
+def estimar_uniformes_gamma(alfa, n):
+    # ~2 uniformes por candidato con margen para un segundo lote, más U^(1/α) cuando α < 1
+    return int(2.5 * n) + 64 + (n if alfa < 1 else 0)
+
+
+@lru_cache(maxsize=64)
+def tabla_cdf_poisson(lam):
+    """CDF acumulada hasta el mismo k_max heurístico que usa la búsqueda paso a paso"""
+    k_max = int(lam + 5 * np.sqrt(lam))
+    if k_max < 10: k_max = 10
+    return poisson.cdf(np.arange(k_max + 1), mu=lam)
+
+
+@lru_cache(maxsize=64)
+def tabla_cdf_hipergeometrica(poblacion, exitos, extracciones):
+    """(mínimo del soporte, CDF sobre todo el soporte) de la hipergeométrica"""
+    minimo = max(0, extracciones + exitos - poblacion)
+    maximo = min(extracciones, exitos)
+    return minimo, hypergeom.cdf(np.arange(minimo, maximo + 1), poblacion, exitos, extracciones)
+
+
+def validar_normal(v):
+    if v["Desviación Estándar"] <= 0:
+        raise ErrorParametros("La desviación estándar debe ser mayor que 0.")
+    return {'loc': v["Media"], 'scale': v["Desviación Estándar"]}
+
+
+def transformar_normal(params, u, n):
+    return params['loc'] + params['scale'] * normales_box_muller(u)[:n]
+
+
+def validar_lambda(v):
+    if v["Lambda"] <= 0:
+        raise ErrorParametros("Lambda (λ) debe ser mayor que 0.")
+    return v["Lambda"]
+
+
+def validar_binomial(v):
+    if not (0 <= v["P"] <= 1):
+        raise ErrorParametros("La probabilidad (P) debe estar entre 0 y 1.")
+    if v["N"] <= 0:
+        raise ErrorParametros("El número de ensayos (N) debe ser un entero positivo.")
+    return {'n': v["N"], 'p': v["P"]}
+
+
+def transformar_poisson(params, u, n):
+    cdf = tabla_cdf_poisson(params['mu'])
+    # Smallest k with U < P(X <= k); values beyond the table get k_max
+    return np.minimum(np.searchsorted(cdf, u, side='right'), len(cdf) - 1)
+
+
+def validar_geometrica(v):
+    if not (0 < v["P"] <= 1):
+        raise ErrorParametros("La probabilidad (P) debe estar entre 0 (exclusive) y 1.")
+    return {'p': v["P"]}
+
+
+def transformar_geometrica(params, u, n):
+    if params['p'] >= 1:
+        raise ErrorParametros("La probabilidad (P) no puede ser 1 para la distribución Geométrica al usar la transformada inversa.")
+    return (np.floor(np.log(1 - evitar_uno(u)) / np.log(1 - params['p'])) + 1).astype(np.int64)
+
+
+def validar_uniforme(v):
+    if v["Mínimo"] >= v["Máximo"]:
+        raise ErrorParametros("El mínimo (a) debe ser menor que el máximo (b).")
+    return {'loc': v["Mínimo"], 'scale': v["Máximo"] - v["Mínimo"]}
+
+
+def validar_erlang(v):
+    if v["Forma"] <= 0:
+        raise ErrorParametros("La forma (k) de la Erlang debe ser un entero positivo.")
+    return {'k': v["Forma"], 'scale': 1 / validar_lambda(v)}
+
+
+def transformar_erlang(params, u, n):
+    # Sum of k exponentials: X = -(1/λ) Σ ln(1 - U_j)
+    return -params['scale'] * np.log(1 - evitar_uno(u)).reshape(n, params['k']).sum(axis=1)
+
+
+def validar_forma_escala(v):
+    if v["Forma"] <= 0 or v["Escala"] <= 0:
+        raise ErrorParametros("La forma y la escala deben ser mayores que 0.")
+    return {'forma': v["Forma"], 'escala': v["Escala"]}
+
+
+def validar_beta(v):
+    if v["Alfa"] <= 0 or v["Beta"] <= 0:
+        raise ErrorParametros("Los parámetros α y β deben ser mayores que 0.")
+    return {'a': v["Alfa"], 'b': v["Beta"]}
+
+
+def muestrear_beta(params, fuente, n):
+    g1 = gamma_marsaglia_tsang(params['a'], fuente, n)
+    g2 = gamma_marsaglia_tsang(params['b'], fuente, n)
+    return g1 / (g1 + g2)
+
+
+def transformar_weibull(params, u, n):
+    return params['escala'] * (-np.log(1 - evitar_uno(u))) ** (1 / params['forma'])
+
+
+def validar_lognormal(v):
+    if v["Sigma"] <= 0:
+        raise ErrorParametros("Sigma (σ) debe ser mayor que 0.")
+    return {'mu': v["Mu"], 'sigma': v["Sigma"]}
+
+
+def validar_triangular(v):
+    a, c, b = v["Mínimo"], v["Moda"], v["Máximo"]
+    if not a < b:
+        raise ErrorParametros("El mínimo (a) debe ser menor que el máximo (b).")
+    if not a <= c <= b:
+        raise ErrorParametros("La moda (c) debe estar entre el mínimo (a) y el máximo (b).")
+    return {'a': a, 'c': c, 'b': b}
+
+
+def transformar_triangular(params, u, n):
+    a, c, b = params['a'], params['c'], params['b']
+    f_c = (c - a) / (b - a)
+    izquierda = a + np.sqrt(u * (b - a) * (c - a))
+    derecha = b - np.sqrt((1 - u) * (b - a) * (b - c))
+    return np.where(u < f_c, izquierda, derecha)
+
+
+def validar_hipergeometrica(v):
+    poblacion, exitos, extracciones = v["Población"], v["Éxitos"], v["Extracciones"]
+    if poblacion <= 0:
+        raise ErrorParametros("La población (N) debe ser un entero positivo.")
+    if not 0 <= exitos <= poblacion:
+        raise ErrorParametros("Los éxitos (K) deben estar entre 0 y la población (N).")
+    if not 0 < extracciones <= poblacion:
+        raise ErrorParametros("Las extracciones (n) deben estar entre 1 y la población (N).")
+    return {'M': poblacion, 'K': exitos, 'n': extracciones}
+
+
+def transformar_hipergeometrica(params, u, n):
+    minimo, cdf = tabla_cdf_hipergeometrica(params['M'], params['K'], params['n'])
+    return minimo + np.minimum(np.searchsorted(cdf, u, side='right'), len(cdf) - 1)
+
+
+registrar(Distribucion(
+    "Normal", [("Media (μ):", float, "0"), ("Desviación Estándar (σ):", float, "1")],
+    validar_normal, lambda p: norm(**p), transformar_normal, pares_box_muller,
+    metodo="Box-Muller: $Z = \\sqrt{-2 × \\ln(U_1)} × \\cos(2π × U_2)$, $X = μ + σ × Z$"))
+registrar(Distribucion(
+    "Exponencial", [("Lambda (λ):", float, "1")],
+    lambda v: {'scale': 1 / validar_lambda(v)}, lambda p: expon(**p),
+    lambda p, u, n: -p['scale'] * np.log(1 - evitar_uno(u)), una_por_muestra,
+    metodo="Transformada inversa: $X = -(1/λ) × \\ln(1 - U)$"))
+registrar(Distribucion(
+    "Binomial", [("N (Ensayos):", int, "10"), ("P (Probabilidad):", float, "0.5")],
+    validar_binomial, lambda p: binom(**p),
+    lambda p, u, n: np.count_nonzero(u.reshape(n, p['n']) <= p['p'], axis=1),
+    lambda p, n: (n, p['n']), discreta=True,
+    metodo="Conteo de éxitos (U ≤ p) en n ensayos de Bernoulli"))
+registrar(Distribucion(
+    "Poisson", [("Lambda (λ):", float, "2")],
+    lambda v: {'mu': validar_lambda(v)}, lambda p: poisson(**p), transformar_poisson, una_por_muestra,
+    discreta=True, metodo="Transformada inversa con tabla de la CDF: $P(X < k) \\leq U < P(X \\leq k)$"))
+registrar(Distribucion(
+    "Geométrica", [("P (Probabilidad):", float, "0.5")],
+    validar_geometrica, lambda p: geom(**p), transformar_geometrica, una_por_muestra, discreta=True,
+    metodo="Transformada inversa: $X = ⌊\\ln(1-U)/\\ln(1-p)⌋ + 1$"))
+registrar(Distribucion(
+    "Uniforme", [("Mínimo (a):", float, "0"), ("Máximo (b):", float, "1")],
+    validar_uniforme, lambda p: uniform(**p), lambda p, u, n: p['loc'] + p['scale'] * u, una_por_muestra,
+    metodo="Transformada inversa: $X = a + (b - a) × U$"))
+registrar(Distribucion(
+    "Erlang", [("Forma (k):", int, "2"), ("Lambda (λ):", float, "1")],
+    validar_erlang, lambda p: erlang(a=p['k'], scale=p['scale']), transformar_erlang,
+    lambda p, n: (n, p['k']),
+    metodo="Suma de k exponenciales: $X = -(1/λ) × \\sum \\ln(1 - U_j)$"))
+registrar(Distribucion(
+    "Gamma", [("Forma (α):", float, "2"), ("Escala (θ):", float, "1")],
+    validar_forma_escala, lambda p: gamma(a=p['forma'], scale=p['escala']),
+    muestrear_bloque=lambda p, fuente, n: p['escala'] * gamma_marsaglia_tsang(p['forma'], fuente, n),
+    estimar_uniformes=lambda p, n: estimar_uniformes_gamma(p['forma'], n),
+    metodo="Marsaglia–Tsang (rechazo): $d = α - 1/3$, $V = (1 + Z/\\sqrt{9d})^3$, aceptar si $\\ln U < Z^2/2 + d - dV + d\\ln V$"))
+registrar(Distribucion(
+    "Beta", [("Alfa (α):", float, "2"), ("Beta (β):", float, "5")],
+    validar_beta, lambda p: beta(**p), muestrear_bloque=muestrear_beta,
+    estimar_uniformes=lambda p, n: estimar_uniformes_gamma(p['a'], n) + estimar_uniformes_gamma(p['b'], n),
+    metodo="Cociente de gammas: $X = G_1/(G_1 + G_2)$ con $G_1 \\sim Gamma(α)$, $G_2 \\sim Gamma(β)$"))
+registrar(Distribucion(
+    "Weibull", [("Forma (k):", float, "1.5"), ("Escala (λ):", float, "1")],
+    validar_forma_escala, lambda p: weibull_min(c=p['forma'], scale=p['escala']), transformar_weibull,
+    una_por_muestra, metodo="Transformada inversa: $X = λ × (-\\ln(1 - U))^{1/k}$"))
+registrar(Distribucion(
+    "Lognormal", [("Mu (μ):", float, "0"), ("Sigma (σ):", float, "0.5")],
+    validar_lognormal, lambda p: lognorm(s=p['sigma'], scale=np.exp(p['mu'])),
+    lambda p, u, n: np.exp(p['mu'] + p['sigma'] * normales_box_muller(u)[:n]), pares_box_muller,
+    metodo="Box-Muller: $X = \\exp(μ + σ × Z)$"))
+registrar(Distribucion(
+    "Triangular", [("Mínimo (a):", float, "0"), ("Moda (c):", float, "0.5"), ("Máximo (b):", float, "1")],
+    validar_triangular, lambda p: triang(c=(p['c'] - p['a']) / (p['b'] - p['a']), loc=p['a'], scale=p['b'] - p['a']),
+    transformar_triangular, una_por_muestra,
+    metodo="Transformada inversa por tramos: $X = a + \\sqrt{U(b-a)(c-a)}$ si $U < F(c)$, si no $X = b - \\sqrt{(1-U)(b-a)(b-c)}$"))
+registrar(Distribucion(
+    "Hipergeométrica", [("Población (N):", int, "50"), ("Éxitos (K):", int, "10"), ("Extracciones (n):", int, "5")],
+    validar_hipergeometrica, lambda p: hypergeom(p['M'], p['K'], p['n']), transformar_hipergeometrica,
+    una_por_muestra, discreta=True, metodo="Transformada inversa con tabla de la CDF sobre todo el soporte"))
+
+
+DISTRIBUCIONES = list(REGISTRO)
+
+DISCRETAS = {nombre for nombre, familia in REGISTRO.items() if familia.discreta}
+
+
+def convertir_parametros(distribucion, params):
+    """Validar los parámetros tal como se ingresan y devolverlos en la forma que usa el muestreador.
+
+    Lanza ErrorParametros si algún valor está fuera de rango y ValueError si no es numérico.
+    """
+    if distribucion not in REGISTRO:
+        raise ErrorParametros(f"Distribución desconocida: {distribucion}")
+    return REGISTRO[distribucion].convertir(params)
+
+
+def modelo_teorico(distribucion, params):
+    """Distribución congelada de scipy.stats para parámetros ya convertidos"""
+    return REGISTRO[distribucion].modelo(params)
+
+
+def uniformes_requeridos(distribucion, params, n):
+    """Uniformes que consume n variables (una estimación en los métodos de rechazo)"""
+    return REGISTRO[distribucion].uniformes_requeridos(params, n)
+
+
+def muestrear(distribucion, params, uniformes, n):
+    """Transformar uniformes en n variables de una familia de consumo fijo, vectorizado.
+
+    Para las cinco familias originales reproduce exactamente las transformaciones del
+    procedimiento paso a paso: mismas fórmulas, mismo orden de consumo de uniformes y
+    mismos ajustes en los extremos.
+    """
+    familia = REGISTRO[distribucion]
+    if not familia.consumo_fijo:
+        raise ErrorParametros(f"La distribución {distribucion} usa rechazo y necesita una fuente de uniformes.")
+    u = np.asarray(uniformes, dtype=float)[:familia.uniformes_requeridos(params, n)]
+    return familia.transformar(params, u, n)
+
+
+def tabla_frecuencias(valores):
+    """Tabla de frecuencias de valores enteros: (mínimo, conteos) con conteos[i] = #(X = mínimo + i)"""
+    valores = np.asarray(valores, dtype=np.int64)
+    if valores.size == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+    minimo = int(valores.min())
+    return minimo, np.bincount(valores - minimo)
+
+
+def resumen_frecuencias(minimo, conteos):
+    """Total, media, moda, mínimo y máximo a partir de la tabla de frecuencias, sin reordenar datos"""
+    total = int(conteos.sum())
+    soporte = np.arange(minimo, minimo + len(conteos))
+    no_nulos = np.flatnonzero(conteos)
+    return {
+        'total': total,
+        'media': float(np.dot(soporte, conteos) / total),
+        'moda': int(soporte[np.argmax(conteos)]),
+        'minimo': int(soporte[no_nulos[0]]),
+        'maximo': int(soporte[no_nulos[-1]]),
+    }
@@ -0,0 +1,260 @@
+"""Flujo por bloques: fuente de uniformes -> transformación -> sumideros.
+
+Ningún paso materializa todos los uniformes ni todas las variables: la memoria pico
+es proporcional al tamaño de bloque, no a N.
+
+Los uniformes y las variables continuas pueden ir en float32 (la mitad de bytes por
+bloque) o en float64; las sumas de los sumideros se acumulan siempre en float64.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from convergencia import AcumuladorMomentos, HistogramaIncremental
+from distribuciones import DISCRETAS, REGISTRO, convertir_parametros, modelo_teorico
+from generadores_uniformes import PRECISIONES, bloques_uniformes
+from importar_uniformes import ArchivoUniformes
+
+TAMANO_BLOQUE = 65536
+
+
+class FuenteUniformes:
+    """Entrega exactamente la cantidad de uniformes pedida, leyendo bloques fijos de un iterador.
+
+    Permite que cada transformación consuma un número variable de uniformes por bloque
+    (por ejemplo, un muestreador por rechazo); el sobrante del último bloque leído se
+    guarda para la siguiente petición.
+    """
+
+    def __init__(self, bloques, dtype=np.float64):
+        self.bloques = iter(bloques)
+        self.dtype = np.dtype(dtype)
+        self.sobrante = np.empty(0, dtype=self.dtype)
+        self.consumidos = 0
+
+    @classmethod
+    def desde_generador(cls, config, tamano_bloque=TAMANO_BLOQUE, rng=None, dtype=np.float64):
+        """Fuente a partir de la configuración del generador (metodo, x0, a, c, m; o metodo="archivo", ruta, inicio)"""
+        if config["metodo"] == "archivo":
+            return cls(ArchivoUniformes(config["ruta"]).bloques(tamano_bloque, config.get("inicio", 0), dtype), dtype)
+        return cls(bloques_uniformes(config["metodo"], tamano_bloque, x0=config.get("x0"), a=config.get("a"),
+                                     c=config.get("c", 0), m=config.get("m"), rng=rng, dtype=dtype), dtype)
+
+    def tomar(self, cantidad):
+        partes = []
+        faltan = cantidad
+        while faltan > 0:
+            if self.sobrante.size == 0:
+                try:
+                    self.sobrante = np.asarray(next(self.bloques), dtype=self.dtype)
+                except StopIteration:
+                    raise ValueError(f"La fuente de uniformes se agotó: faltan {faltan} de {cantidad} valores.")
+            parte = self.sobrante[:faltan]
+            self.sobrante = self.sobrante[faltan:]
+            partes.append(parte)
+            faltan -= parte.size
+        self.consumidos += cantidad
+        return partes[0] if len(partes) == 1 else np.concatenate(partes)
+
+
+def muestreador_distribucion(distribucion, params, dtype=np.float64):
+    """Función (fuente, n) -> n variables para una de las familias del registro de distribuciones.py.
+
+    Las continuas se entregan en `dtype`; las discretas siguen siendo enteros.
+    """
+    familia = REGISTRO[distribucion]
+    tipo = None if distribucion in DISCRETAS else np.dtype(dtype)
+    def muestrear_bloque(fuente, n):
+        valores = familia.muestrear_bloque(params, fuente, n)
+        # Inverse transforms already keep float32; rejection samplers work in float64 and are cast here
+        return valores if tipo is None else valores.astype(tipo, copy=False)
+    return muestrear_bloque
+
+
+def bloques_variables(muestreador, fuente, n_total, tamano_bloque=TAMANO_BLOQUE):
+    """Iterar bloques de variables hasta completar n_total"""
+    # Pares de Box-Muller completos dentro de cada bloque
+    tamano_bloque += tamano_bloque % 2
+    restantes = n_total
+    while restantes > 0:
+        n = min(tamano_bloque, restantes)
+        yield muestreador(fuente, n)
+        restantes -= n
+
+
+def ejecutar_flujo(muestreador, fuente, n_total, sumideros, tamano_bloque=TAMANO_BLOQUE):
+    """Pasar cada bloque de variables por todos los sumideros y cerrarlos al terminar"""
+    try:
+        for bloque in bloques_variables(muestreador, fuente, n_total, tamano_bloque):
+            for sumidero in sumideros:
+                sumidero.agregar(bloque)
+    finally:
+        for sumidero in sumideros:
+            cerrar = getattr(sumidero, 'cerrar', None)
+            if cerrar is not None:
+                cerrar()
+    return sumideros
+
+
+class SumideroEstadisticas:
+    """Media, varianza, mínimo y máximo acumulados en float64"""
+
+    def __init__(self):
+        self.acumulador = AcumuladorMomentos()
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, bloque):
+        self.acumulador.agregar(bloque)
+        self.minimo = min(self.minimo, float(np.min(bloque)))
+        self.maximo = max(self.maximo, float(np.max(bloque)))
+
+    @property
+    def n(self):
+        return self.acumulador.n
+
+    @property
+    def media(self):
+        return self.acumulador.media
+
+    @property
+    def varianza(self):
+        return self.acumulador.varianza
+
+
+class SumideroFrecuencias:
+    """Tabla de frecuencias entera que crece con el soporte observado"""
+
+    def __init__(self):
+        self.minimo = None
+        self.conteos = np.zeros(0, dtype=np.int64)
+
+    def agregar(self, bloque):
+        bloque = np.asarray(bloque, dtype=np.int64)
+        if bloque.size == 0:
+            return
+        minimo_bloque = int(bloque.min())
+        if self.minimo is None:
+            self.minimo = minimo_bloque
+        elif minimo_bloque < self.minimo:
+            self.conteos = np.concatenate([np.zeros(self.minimo - minimo_bloque, dtype=np.int64), self.conteos])
+            self.minimo = minimo_bloque
+        nuevos = np.bincount(bloque - self.minimo)
+        if nuevos.size > self.conteos.size:
+            self.conteos = np.concatenate([self.conteos, np.zeros(nuevos.size - self.conteos.size, dtype=np.int64)])
+        self.conteos[:nuevos.size] += nuevos
+
+    def contar(self, valor):
+        """Sumar un único valor, para los bucles que generan las variables de a una"""
+        if self.minimo is not None and 0 <= valor - self.minimo < self.conteos.size:
+            self.conteos[valor - self.minimo] += 1
+        else:
+            self.agregar((valor,))
+
+    @property
+    def tabla(self):
+        """(mínimo, conteos), con el mismo formato que distribuciones.tabla_frecuencias"""
+        return (0 if self.minimo is None else self.minimo), self.conteos
+
+
+class SumideroArchivo:
+    """Escribir las variables en .npy (memoria mapeada, tamaño conocido) o .csv (una por línea).
+
+    Con `columnas` cada fila es un vector (p. ej. de la normal multivariada): el .npy
+    tiene forma (n_total, columnas) y el .csv una columna x1, x2, ... por componente.
+    """
+
+    def __init__(self, ruta, n_total, dtype=np.float64, columnas=None):
+        self.ruta = ruta
+        self.posicion = 0
+        self.columnas = columnas
+        # 9 significant digits round-trip a float32; str() would print its float64 expansion
+        self.formato = "{:.9g}".format if np.dtype(dtype) == np.float32 else str
+        if ruta.lower().endswith('.npy'):
+            forma = (n_total,) if columnas is None else (n_total, columnas)
+            self.destino = np.lib.format.open_memmap(ruta, mode='w+', dtype=dtype, shape=forma)
+            self.archivo = None
+        else:
+            self.destino = None
+            self.archivo = open(ruta, 'w', encoding='utf-8')
+            self.archivo.write("valor\n" if columnas is None else ",".join(f"x{j + 1}" for j in range(columnas)) + "\n")
+
+    def agregar(self, bloque):
+        if self.destino is not None:
+            self.destino[self.posicion:self.posicion + len(bloque)] = bloque
+        elif self.columnas is None:
+            # str() of Python ints/floats is much faster than np.savetxt's per-row formatting
+            self.archivo.write("\n".join(map(self.formato, bloque.tolist())))
+            self.archivo.write("\n")
+        else:
+            self.archivo.write("\n".join(",".join(map(self.formato, fila)) for fila in bloque.tolist()))
+            self.archivo.write("\n")
+        self.posicion += len(bloque)
+
+    def cerrar(self):
+        if self.destino is not None:
+            self.destino.flush()
+            self.destino = None
+        if self.archivo is not None:
+            self.archivo.close()
+            self.archivo = None
+
+
+def sumideros_resumen(distribucion, params):
+    """Sumideros estándar de una corrida: estadísticas y frecuencias (discretas) o histograma (continuas)"""
+    if distribucion in DISCRETAS:
+        return [SumideroEstadisticas(), SumideroFrecuencias()]
+    return [SumideroEstadisticas(), HistogramaIncremental(distribucion, modelo_teorico(distribucion, params))]
+
+
+def comparar_precisiones(distribucion, params, n_total, config=None, tamano_bloque=TAMANO_BLOQUE, repeticiones=3):
+    """Tiempo del flujo completo (uniformes, transformación, estadísticas e histograma) en cada precisión.
+
+    Las dos usan la misma semilla, pero Generator.random produce otra secuencia en
+    float32, así que media y varianza sólo deben coincidir dentro del error de muestreo.
+    Devuelve una fila por precisión con el mejor tiempo de `repeticiones`.
+    """
+    config = config or {"metodo": "estandar"}
+    filas = []
+    for nombre, dtype in PRECISIONES.items():
+        mejor = np.inf
+        for _ in range(repeticiones):
+            rng = np.random.default_rng(12345) if config["metodo"] == "estandar" else None
+            fuente = FuenteUniformes.desde_generador(config, tamano_bloque, rng=rng, dtype=dtype)
+            inicio = time.perf_counter()
+            estadisticas, _ = ejecutar_flujo(muestreador_distribucion(distribucion, params, dtype), fuente, n_total,
+                                             sumideros_resumen(distribucion, params), tamano_bloque)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        filas.append({'precision': nombre, 'segundos': mejor, 'valores_por_segundo': n_total / mejor,
+                      'bytes_por_bloque': tamano_bloque * np.dtype(dtype).itemsize,
+                      'media': estadisticas.media, 'varianza': estadisticas.varianza})
+    return filas
+
+
+def texto_comparacion_precisiones(distribucion, n_total, filas):
+    referencia = filas[0]
+    texto = f"Comparación de precisión: {distribucion}, N = {n_total}\n"
+    texto += f"{'Precisión':<10} | {'Segundos':>9} | {'Valores/s':>12} | {'Aceleración':>11} | {'Bytes/bloque':>12} | {'Media':>12} | {'Varianza':>12}\n"
+    texto += f"{'-'*10}-|-{'-'*9}-|-{'-'*12}-|-{'-'*11}-|-{'-'*12}-|-{'-'*12}-|-{'-'*12}\n"
+    for fila in filas:
+        texto += (f"{fila['precision']:<10} | {fila['segundos']:>9.4f} | {fila['valores_por_segundo']:>12.4g} | "
+                  f"{referencia['segundos'] / fila['segundos']:>10.2f}x | {fila['bytes_por_bloque']:>12} | "
+                  f"{fila['media']:>12.6f} | {fila['varianza']:>12.6f}\n")
+    return texto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparar el flujo por bloques en float64 y float32.")
+    parser.add_argument("distribucion")
+    parser.add_argument("--param", action="append", default=[], help="Parámetro de la distribución, p. ej. Lambda=3")
+    parser.add_argument("-n", type=int, default=10**7)
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE)
+    args = parser.parse_args(argv)
+    params = convertir_parametros(args.distribucion, dict(p.split("=", 1) for p in args.param))
+    print(texto_comparacion_precisiones(args.distribucion, args.n,
+                                        comparar_precisiones(args.distribucion, params, args.n, tamano_bloque=args.bloque)))
+
+
+if __name__ == "__main__":
+    main()
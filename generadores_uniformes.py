@@ -0,0 +1,155 @@
+import numpy as np
+
+
+class SecuenciaCongruencial:
+    """Secuencia congruencial (mixta o multiplicativa) que se extiende de forma incremental.
+
+    Guarda los Xi y Ri ya generados junto con el último estado, de modo que pedir
+    más valores sólo calcula los que faltan.
+    """
+
+    def __init__(self, metodo, x0, a, c, m):
+        self.metodo = metodo
+        self.x0 = x0
+        self.a = a
+        self.c = c if metodo == "mixto" else 0
+        self.m = m
+        self.valores_x = []
+        self.valores_r = []
+        # Texto del procedimiento por valor generado; lo completa quien lo muestra
+        self.pasos = []
+        self.estado = x0
+
+    def __len__(self):
+        return len(self.valores_r)
+
+    def extender(self, cantidad):
+        """Asegurar al menos `cantidad` valores; devuelve el índice del primer valor nuevo"""
+        inicio = len(self.valores_r)
+        if cantidad > inicio:
+            nuevos = generar_congruencial(self.estado, self.a, self.c, self.m, cantidad - inicio)
+            self.valores_x.extend(nuevos.tolist())
+            self.valores_r.extend((nuevos / self.m).tolist())
+            self.estado = self.valores_x[-1]
+        return inicio
+
+    def anterior(self, i):
+        """Valor X que precede al i-ésimo generado (X₀ para el primero)"""
+        return self.x0 if i == 0 else self.valores_x[i - 1]
+
+
+class CacheSecuencias:
+    """Cache LRU de secuencias congruenciales por (método, X₀, a, c, m)"""
+
+    def __init__(self, max_secuencias=8):
+        self.max_secuencias = max_secuencias
+        self.secuencias = {}
+
+    def obtener(self, metodo, x0, a, c, m):
+        """Devolver (secuencia, es_nueva), creando la secuencia si no estaba en cache"""
+        clave = (metodo, x0, a, c if metodo == "mixto" else 0, m)
+        secuencia = self.secuencias.pop(clave, None)
+        es_nueva = secuencia is None
+        if es_nueva:
+            secuencia = SecuenciaCongruencial(metodo, x0, a, c, m)
+        # Reinsertar al final para mantener el orden de uso reciente
+        self.secuencias[clave] = secuencia
+        while len(self.secuencias) > self.max_secuencias:
+            self.secuencias.pop(next(iter(self.secuencias)))
+        return secuencia, es_nueva
+
+
+def coeficientes_salto(a, c, m, k):
+    """Coeficientes (A, C) tales que X_{i+k} = (A·X_i + C) mod m, en O(log k)"""
+    A, C = 1, 0
+    a_pot, c_pot = a % m, c % m
+    while k > 0:
+        if k & 1:
+            A, C = (A * a_pot) % m, (C * a_pot + c_pot) % m
+        # Componer el salto actual consigo mismo: duplica su longitud
+        a_pot, c_pot = (a_pot * a_pot) % m, (c_pot * a_pot + c_pot) % m
+        k >>= 1
+    return A, C
+
+
+def saltar(x0, a, c, m, k):
+    """Estado de la secuencia k pasos después de x0"""
+    A, C = coeficientes_salto(a, c, m, k)
+    return (A * x0 + C) % m
+
+
+# Los productos A·X deben caber en int64 para la versión vectorizada
+MODULO_MAXIMO_VECTORIZADO = 2**31
+BLOQUE_VECTORIZADO = 4096
+
+
+def generar_congruencial(x0, a, c, m, cantidad):
+    """Generar X_1..X_cantidad de la secuencia congruencial como arreglo int64 (u objeto si m es grande).
+
+    Para m ≤ 2³¹ calcula bloques completos a partir del primer estado de cada bloque
+    con los coeficientes de salto de 1..B pasos, sin bucle de Python por valor.
+    """
+    if m > MODULO_MAXIMO_VECTORIZADO:
+        valores = np.empty(cantidad, dtype=object)
+        xi = x0
+        for i in range(cantidad):
+            xi = (a * xi + c) % m
+            valores[i] = xi
+        return valores
+
+    bloque = min(BLOQUE_VECTORIZADO, max(cantidad, 1))
+    coef_a = np.empty(bloque, dtype=np.int64)
+    coef_c = np.empty(bloque, dtype=np.int64)
+    A, C = a % m, c % m
+    for j in range(bloque):
+        coef_a[j], coef_c[j] = A, C
+        A, C = (A * a) % m, (C * a + c) % m
+
+    valores = np.empty(cantidad, dtype=np.int64)
+    xi = x0
+    for inicio in range(0, cantidad, bloque):
+        fin = min(inicio + bloque, cantidad)
+        valores[inicio:fin] = (coef_a[:fin - inicio] * xi + coef_c[:fin - inicio]) % m
+        xi = int(valores[fin - 1])
+    return valores
+
+
+PRECISIONES = {"float64": np.float64, "float32": np.float32}
+
+
+def a_precision(u, dtype=np.float64):
+    """Convertir uniformes a `dtype` sin que el redondeo lleve a 1.0 valores cercanos a 1"""
+    dtype = np.dtype(dtype)
+    if u.dtype == dtype:
+        return u
+    # (m-1)/m, for example, rounds to exactly 1.0 in float32 once m > 2^24
+    return np.minimum(u.astype(dtype), np.nextafter(dtype.type(1), dtype.type(0)))
+
+
+def generar_uniformes(metodo, cantidad, x0=None, a=None, c=0, m=None, rng=None, dtype=np.float64):
+    """Generar `cantidad` uniformes en [0,1) sin interfaz gráfica.
+
+    metodo es "mixto", "multiplicativo" o "estandar"; este último usa `rng`
+    (np.random.Generator) o np.random.rand si no se indica. Con dtype=np.float32 los
+    congruenciales se calculan en float64 y se redondean; Generator.random produce
+    float32 directamente (resolución 2⁻²⁴).
+    """
+    if metodo == "estandar":
+        if rng is not None:
+            return rng.random(cantidad, dtype=dtype)
+        return a_precision(np.random.rand(cantidad), dtype)
+    c = c if metodo == "mixto" else 0
+    return a_precision(generar_congruencial(x0, a, c, m, cantidad).astype(float) / m, dtype)
+
+
+def bloques_uniformes(metodo, tamano_bloque, x0=None, a=None, c=0, m=None, rng=None, dtype=np.float64):
+    """Generador infinito de bloques de uniformes; conserva el estado entre bloques"""
+    if metodo == "estandar":
+        while True:
+            yield generar_uniformes("estandar", tamano_bloque, rng=rng, dtype=dtype)
+    c = c if metodo == "mixto" else 0
+    xi = x0
+    while True:
+        valores = generar_congruencial(xi, a, c, m, tamano_bloque)
+        xi = int(valores[-1])
+        yield a_precision(valores.astype(float) / m, dtype)
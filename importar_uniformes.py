@@ -0,0 +1,131 @@
+"""Uniformes importados de archivos generados por otros programas.
+
+- .npy: se abre con memoria mapeada (np.load(mmap_mode='r')).
+- Binario crudo (.bin, .raw, .f64, .f32): np.memmap con el tipo indicado o el que
+  sugiere la extensión (float64 salvo .f32).
+- Texto (.csv, .txt): se lee por trozos de FILAS_CSV líneas; una columna numérica
+  (la primera por defecto) y una cabecera opcional, como la que escribe SumideroArchivo.
+
+Cada bloque se valida en una sola pasada vectorizada (0 ≤ u < 1, sin NaN) y se entrega
+como float64 (o float32 si se pide), así que el archivo nunca se copia entero en memoria ni en listas de Python.
+"""
+import itertools
+import os
+
+import numpy as np
+
+from generadores_uniformes import a_precision
+
+TIPOS_BINARIOS = {".bin": np.float64, ".raw": np.float64, ".f64": np.float64, ".f32": np.float32}
+EXTENSIONES_TEXTO = {".csv", ".txt"}
+FILAS_CSV = 65536
+BLOQUE_LECTURA = 65536
+
+
+class ErrorArchivoUniformes(ValueError):
+    """Archivo ilegible o con valores fuera de [0, 1)"""
+
+
+def validar_bloque(bloque, desplazamiento=0):
+    """Comprobar 0 ≤ u < 1 en todo el bloque; el error indica la posición del primer valor inválido"""
+    validos = (bloque >= 0) & (bloque < 1) # NaN fails both comparisons
+    if not validos.all():
+        i = int(np.argmin(validos))
+        raise ErrorArchivoUniformes(f"El valor {float(bloque[i])} en la posición {desplazamiento + i + 1} "
+                                    f"no está en [0, 1).")
+    return bloque
+
+
+class ArchivoUniformes:
+    """Fuente de bloques de uniformes leída de un archivo, sin cargarlo completo"""
+
+    def __init__(self, ruta, dtype=None, columna=0):
+        self.ruta = ruta
+        self.columna = columna
+        extension = os.path.splitext(ruta)[1].lower()
+        try:
+            if extension == ".npy":
+                self.datos = np.load(ruta, mmap_mode='r')
+            elif extension in TIPOS_BINARIOS or dtype is not None:
+                tipo = np.dtype(dtype or TIPOS_BINARIOS.get(extension, np.float64))
+                tamano = os.path.getsize(ruta)
+                if tamano % tipo.itemsize:
+                    raise ErrorArchivoUniformes(f"El tamaño del archivo ({tamano} bytes) no es múltiplo de {tipo.itemsize} "
+                                                f"bytes ({tipo.name}).")
+                # np.memmap rejects empty files, so those become an empty array
+                self.datos = np.memmap(ruta, dtype=tipo, mode='r') if tamano else np.empty(0, dtype=tipo)
+            elif extension in EXTENSIONES_TEXTO:
+                self.datos = None
+            else:
+                raise ErrorArchivoUniformes(f"Formato no reconocido: '{extension}'. Use .npy, .bin/.raw/.f64/.f32, .csv o .txt.")
+        except ErrorArchivoUniformes:
+            raise
+        except (OSError, ValueError) as e:
+            raise ErrorArchivoUniformes(f"No se pudo abrir {ruta}: {e}")
+        if self.datos is not None:
+            if self.datos.ndim != 1 and not (self.datos.ndim == 2 and 0 <= columna < self.datos.shape[1]):
+                raise ErrorArchivoUniformes(f"Se esperaba un arreglo de una dimensión (o una columna válida), no de forma {self.datos.shape}.")
+            if self.datos.ndim == 2:
+                self.datos = self.datos[:, columna]
+            if not np.issubdtype(self.datos.dtype, np.floating):
+                raise ErrorArchivoUniformes(f"Los uniformes deben ser de punto flotante, no {self.datos.dtype}.")
+        self.cantidad = None if self.datos is None else len(self.datos)
+
+    def bloques(self, tamano_bloque=BLOQUE_LECTURA, inicio=0, dtype=np.float64):
+        """Bloques validados de `dtype` desde el valor número `inicio` hasta el final del archivo"""
+        if self.datos is not None:
+            for desde in range(inicio, len(self.datos), tamano_bloque):
+                bloque = validar_bloque(np.asarray(self.datos[desde:desde + tamano_bloque]), desde)
+                yield a_precision(bloque, dtype)
+            return
+        leidos = 0
+        for trozo in self.trozos_texto():
+            for desde in range(max(inicio - leidos, 0), len(trozo), tamano_bloque):
+                yield a_precision(validar_bloque(trozo[desde:desde + tamano_bloque], leidos + desde), dtype)
+            leidos += len(trozo)
+
+    def trozos_texto(self):
+        """Columna numérica del archivo de texto, FILAS_CSV líneas por trozo"""
+        with open(self.ruta, encoding='utf-8') as archivo:
+            primera = archivo.readline()
+            separador = ";" if ";" in primera else "," if "," in primera else None
+            try:
+                trozo = [float((primera.split(separador))[self.columna])]
+            except (ValueError, IndexError):
+                trozo = [] # Header line (e.g. "valor")
+            if trozo:
+                yield np.array(trozo)
+            while True:
+                lineas = list(itertools.islice(archivo, FILAS_CSV))
+                if not lineas:
+                    return
+                try:
+                    yield np.loadtxt(lineas, delimiter=separador, usecols=self.columna, ndmin=1, dtype=np.float64)
+                except ValueError as e:
+                    raise ErrorArchivoUniformes(f"No se pudo leer {self.ruta}: {e}")
+
+    def leer(self, cantidad, inicio=0):
+        """Los `cantidad` valores siguientes a `inicio` como un solo arreglo validado"""
+        partes = []
+        faltan = cantidad
+        for bloque in self.bloques(min(cantidad, BLOQUE_LECTURA) or 1, inicio):
+            partes.append(bloque[:faltan])
+            faltan -= len(partes[-1])
+            if faltan <= 0:
+                break
+        if faltan > 0:
+            raise ErrorArchivoUniformes(f"El archivo sólo tiene {cantidad - faltan} uniformes desde la posición {inicio + 1}; "
+                                        f"se necesitan {cantidad}.")
+        return np.concatenate(partes) if partes else np.empty(0)
+
+    def validar(self):
+        """Recorrer todo el archivo una vez: (cantidad, mínimo, máximo); ErrorArchivoUniformes si algo falla"""
+        cantidad, minimo, maximo = 0, np.inf, -np.inf
+        for bloque in self.bloques(1 << 20):
+            cantidad += len(bloque)
+            minimo = min(minimo, float(bloque.min()))
+            maximo = max(maximo, float(bloque.max()))
+        if cantidad == 0:
+            raise ErrorArchivoUniformes(f"{self.ruta} no contiene valores.")
+        self.cantidad = cantidad
+        return cantidad, minimo, maximo
@@ -0,0 +1,133 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Instrumentacion:
+    """Mide tiempo, pico de memoria (tracemalloc) y conteos por etapa de una ejecución.
+
+    Las etapas son planas: se abre una, se cierra, y se abre la siguiente. Sólo se
+    registran mientras hay una ejecución activa (entre iniciar() y finalizar()).
+    """
+
+    def __init__(self, medir_memoria=True):
+        self.medir_memoria = medir_memoria
+        self.perfilar_siguiente = False
+        self.descripcion = ""
+        self.etapas = []
+        self.total_segundos = 0.0
+        self.perfil_texto = ""
+        self.activa = False
+        self.etapa_abierta = None
+        self.inicio_ejecucion = 0.0
+        self.tracemalloc_propio = False
+        self.perfilador = None
+
+    def iniciar(self, descripcion):
+        self.descripcion = descripcion
+        self.etapas = []
+        self.total_segundos = 0.0
+        self.perfil_texto = ""
+        self.activa = True
+        self.etapa_abierta = None
+        self.tracemalloc_propio = self.medir_memoria and not tracemalloc.is_tracing()
+        if self.tracemalloc_propio:
+            tracemalloc.start()
+        if self.perfilar_siguiente:
+            # El perfil cubre una sola ejecución
+            self.perfilar_siguiente = False
+            self.perfilador = cProfile.Profile()
+            self.perfilador.enable()
+        self.inicio_ejecucion = time.perf_counter()
+
+    def abrir_etapa(self, nombre):
+        if not self.activa:
+            return
+        if self.etapa_abierta is not None:
+            self.cerrar_etapa()
+        memoria_inicial = 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        self.etapa_abierta = (nombre, memoria_inicial, time.perf_counter())
+
+    def cerrar_etapa(self, **conteos):
+        if not self.activa or self.etapa_abierta is None:
+            return
+        nombre, memoria_inicial, inicio = self.etapa_abierta
+        segundos = time.perf_counter() - inicio
+        pico = None
+        if tracemalloc.is_tracing():
+            pico = max(0, tracemalloc.get_traced_memory()[1] - memoria_inicial)
+        self.etapas.append({'etapa': nombre, 'segundos': segundos, 'pico_memoria_bytes': pico, 'conteos': conteos})
+        self.etapa_abierta = None
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Medir un bloque; el dict entregado permite anotar conteos (filas, valores, ...)"""
+        conteos = {}
+        self.abrir_etapa(nombre)
+        try:
+            yield conteos
+        finally:
+            self.cerrar_etapa(**conteos)
+
+    def finalizar(self):
+        if not self.activa:
+            return
+        self.cerrar_etapa()
+        self.total_segundos = time.perf_counter() - self.inicio_ejecucion
+        if self.perfilador is not None:
+            self.perfilador.disable()
+            salida = io.StringIO()
+            pstats.Stats(self.perfilador, stream=salida).sort_stats('cumulative').print_stats(30)
+            self.perfil_texto = salida.getvalue()
+            self.perfilador = None
+        if self.tracemalloc_propio:
+            tracemalloc.stop()
+            self.tracemalloc_propio = False
+        self.activa = False
+
+    def a_dict(self):
+        return {
+            'descripcion': self.descripcion,
+            'total_segundos': self.total_segundos,
+            'etapas': self.etapas,
+            'perfil': self.perfil_texto,
+        }
+
+    def exportar_json(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.a_dict(), archivo, ensure_ascii=False, indent=2)
+
+    def resumen_linea(self):
+        """Texto corto para la barra de estado"""
+        if not self.etapas:
+            return "Sin mediciones"
+        mas_lenta = max(self.etapas, key=lambda e: e['segundos'])
+        return (f"{self.descripcion}: {self.total_segundos * 1000:.1f} ms en total | "
+                f"etapa más lenta: {mas_lenta['etapa']} ({mas_lenta['segundos'] * 1000:.1f} ms)")
+
+    def resumen_texto(self):
+        texto = f"{'='*78}\n"
+        texto += f"{'DIAGNÓSTICO DE EJECUCIÓN':^78}\n"
+        texto += f"{'='*78}\n"
+        texto += f"Ejecución: {self.descripcion}\n"
+        texto += f"Tiempo total: {self.total_segundos * 1000:.2f} ms\n\n"
+        texto += f"{'Etapa':<40} | {'Tiempo (ms)':>11} | {'Pico memoria':>12} | Conteos\n"
+        texto += f"{'-'*40}-|-{'-'*11}-|-{'-'*12}-|--------\n"
+        for etapa in self.etapas:
+            pico = etapa['pico_memoria_bytes']
+            pico_str = f"{pico / 1024:.1f} KiB" if pico is not None else "N/A"
+            conteos = ", ".join(f"{k}={v}" for k, v in etapa['conteos'].items())
+            texto += f"{etapa['etapa']:<40} | {etapa['segundos'] * 1000:>11.2f} | {pico_str:>12} | {conteos}\n"
+        if self.perfil_texto:
+            texto += f"\n{'='*78}\n"
+            texto += f"{'PERFIL cProfile (30 funciones, tiempo acumulado)':^78}\n"
+            texto += f"{'='*78}\n"
+            texto += self.perfil_texto
+        return texto
@@ -0,0 +1,276 @@
+"""Normal multivariada N(μ, Σ) a partir de las normales estándar de Box-Muller.
+
+Σ se valida y se factoriza una sola vez por matriz: Cholesky si es definida positiva
+y, si sólo es semidefinida (p. ej. componentes perfectamente correlacionadas), la
+descomposición espectral con los autovalores negativos de redondeo llevados a 0. El
+factor L (Σ = L·Lᵀ) queda en caché para las corridas siguientes con la misma matriz.
+
+Cada bloque de n vectores de dimensión d toma n·d normales de Box-Muller, las ve como
+una matriz n × d y aplica X = μ + Z·Lᵀ: una sola multiplicación de matrices por bloque.
+Los resúmenes (medias, covarianzas y los histogramas de cada par de componentes) se
+acumulan por bloques, así que N no está limitado por la memoria.
+
+Uso sin interfaz gráfica, por ejemplo:
+
+    python normal_multivariada.py --media "0, 1" --covarianza "1, 0.8; 0.8, 2" -n 1000000
+    python normal_multivariada.py --media "0 0 0" --covarianza "1 1 0; 1 1 0; 0 0 4" --salida x.npy
+"""
+import argparse
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from distribuciones import ErrorParametros, normales_box_muller
+from flujo import TAMANO_BLOQUE, FuenteUniformes, SumideroArchivo, ejecutar_flujo
+from generadores_uniformes import PRECISIONES
+
+DIMENSION_MAXIMA = 50
+# Componentes que se dibujan en la matriz de densidades por pares
+DIMENSIONES_GRAFICO = 6
+BINS_PARES = 64
+# Tolerancias relativas a la escala de Σ para la simetría y los autovalores negativos
+TOLERANCIA_SIMETRIA = 1e-9
+TOLERANCIA_AUTOVALORES = 1e-10
+
+
+def leer_vector(texto):
+    """Números separados por comas, punto y coma o espacios"""
+    try:
+        return np.array([float(v) for v in re.split(r"[,;\s]+", texto.strip()) if v], dtype=np.float64)
+    except ValueError:
+        raise ErrorParametros(f"El vector '{texto}' debe contener sólo números.")
+
+
+def leer_matriz(texto):
+    """Filas separadas por punto y coma o saltos de línea; valores por comas o espacios"""
+    filas = [fila for fila in re.split(r"[;\n]+", texto.strip()) if fila.strip()]
+    try:
+        valores = [[float(v) for v in re.split(r"[,\s]+", fila.strip()) if v] for fila in filas]
+    except ValueError:
+        raise ErrorParametros("La matriz de covarianza debe contener sólo números.")
+    if not valores or any(len(fila) != len(valores[0]) for fila in valores):
+        raise ErrorParametros("Todas las filas de la matriz de covarianza deben tener la misma cantidad de valores.")
+    return np.array(valores, dtype=np.float64)
+
+
+@lru_cache(maxsize=32)
+def factor_covarianza(filas):
+    """(L, método, rango) con Σ = L·Lᵀ; `filas` es Σ como tupla de tuplas para poder usar la caché"""
+    covarianza = np.array(filas, dtype=np.float64)
+    d = covarianza.shape[0]
+    if covarianza.shape != (d, d) or d == 0:
+        raise ErrorParametros(f"La matriz de covarianza debe ser cuadrada, no de forma {covarianza.shape}.")
+    if not np.isfinite(covarianza).all():
+        raise ErrorParametros("La matriz de covarianza contiene valores no finitos.")
+    escala = float(np.max(np.abs(covarianza))) or 1.0
+    if np.max(np.abs(covarianza - covarianza.T)) > TOLERANCIA_SIMETRIA * escala:
+        raise ErrorParametros("La matriz de covarianza debe ser simétrica.")
+    covarianza = (covarianza + covarianza.T) / 2
+    if np.any(np.diag(covarianza) < 0):
+        raise ErrorParametros("Las varianzas (diagonal de Σ) no pueden ser negativas.")
+    try:
+        factor, metodo, rango = np.linalg.cholesky(covarianza), "Cholesky", d
+    except np.linalg.LinAlgError:
+        autovalores, autovectores = np.linalg.eigh(covarianza)
+        if autovalores[0] < -TOLERANCIA_AUTOVALORES * escala * d:
+            raise ErrorParametros(f"La matriz de covarianza no es semidefinida positiva "
+                                  f"(autovalor mínimo {autovalores[0]:.6g}).")
+        autovalores = np.clip(autovalores, 0, None)
+        rango = int(np.sum(autovalores > TOLERANCIA_AUTOVALORES * escala * d))
+        factor, metodo = autovectores * np.sqrt(autovalores), "espectral (semidefinida)"
+    # The cached factor is shared between runs, so it must not be modified in place
+    factor.flags.writeable = False
+    return factor, metodo, rango
+
+
+def factorizar_covarianza(covarianza):
+    """Factor de Σ desde la caché; la matriz se valida y factoriza sólo la primera vez"""
+    return factor_covarianza(tuple(map(tuple, np.asarray(covarianza, dtype=np.float64).tolist())))
+
+
+class NormalMultivariada:
+    """Muestreador (fuente, n) -> matriz n × d de vectores N(μ, Σ)"""
+
+    def __init__(self, media, covarianza, dtype=np.float64):
+        self.media = np.asarray(media, dtype=np.float64).ravel()
+        self.covarianza = np.asarray(covarianza, dtype=np.float64)
+        self.dimension = self.media.size
+        if not 1 <= self.dimension <= DIMENSION_MAXIMA:
+            raise ErrorParametros(f"La dimensión debe estar entre 1 y {DIMENSION_MAXIMA}.")
+        if not np.isfinite(self.media).all():
+            raise ErrorParametros("El vector de medias contiene valores no finitos.")
+        if self.covarianza.shape != (self.dimension, self.dimension):
+            raise ErrorParametros(f"Σ debe ser {self.dimension} × {self.dimension} para un vector de medias de "
+                                  f"dimensión {self.dimension} (se recibió {self.covarianza.shape}).")
+        self.factor, self.metodo, self.rango = factorizar_covarianza(self.covarianza)
+        self.dtype = np.dtype(dtype)
+        self.factor_transpuesto = np.ascontiguousarray(self.factor.T, dtype=self.dtype)
+        self.media_bloque = self.media.astype(self.dtype)
+
+    def __call__(self, fuente, n):
+        cantidad = n * self.dimension
+        # Box-Muller gives normals in pairs; an odd n·d leaves one unused
+        z = normales_box_muller(fuente.tomar(cantidad + cantidad % 2))[:cantidad].reshape(n, self.dimension)
+        return z @ self.factor_transpuesto + self.media_bloque
+
+    @property
+    def desviaciones(self):
+        return np.sqrt(np.diag(self.covarianza))
+
+    @property
+    def correlacion(self):
+        return matriz_correlacion(self.covarianza)
+
+    def tamano_bloque(self, valores=TAMANO_BLOQUE):
+        """Vectores por bloque para que cada bloque tenga unos `valores` números"""
+        return max(valores // self.dimension, 2)
+
+
+def matriz_correlacion(covarianza):
+    """Correlaciones a partir de una covarianza; las componentes con varianza 0 quedan en NaN fuera de la diagonal"""
+    desviaciones = np.sqrt(np.diag(covarianza))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlacion = covarianza / np.outer(desviaciones, desviaciones)
+    np.fill_diagonal(correlacion, 1.0)
+    return correlacion
+
+
+class AcumuladorCovarianza:
+    """Vector de medias y matriz de covarianza acumulados por bloques (Chan), en float64"""
+
+    def __init__(self, dimension):
+        self.n = 0
+        self.media = np.zeros(dimension)
+        self.comomentos = np.zeros((dimension, dimension))
+        self.minimo = np.full(dimension, np.inf)
+        self.maximo = np.full(dimension, -np.inf)
+
+    def agregar(self, bloque):
+        # One component per contiguous row: reductions along axis 0 of a narrow n × d block are much slower
+        columnas = np.ascontiguousarray(np.asarray(bloque).T, dtype=np.float64)
+        n_b = columnas.shape[1]
+        if n_b == 0:
+            return
+        media_b = columnas.mean(axis=1)
+        desviaciones = columnas - media_b[:, None]
+        comomentos_b = desviaciones @ desviaciones.T
+        n_total = self.n + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n_total
+        self.comomentos += comomentos_b + np.outer(delta, delta) * self.n * n_b / n_total
+        self.n = n_total
+        np.minimum(self.minimo, columnas.min(axis=1), out=self.minimo)
+        np.maximum(self.maximo, columnas.max(axis=1), out=self.maximo)
+
+    @property
+    def covarianza(self):
+        return self.comomentos / (self.n - 1) if self.n > 1 else np.full_like(self.comomentos, np.nan)
+
+    @property
+    def correlacion(self):
+        return matriz_correlacion(self.covarianza)
+
+
+class HistogramasPares:
+    """Conteos de cada componente y de cada par (i > j) en una malla fija de μ ± 4σ.
+
+    Sólo se consideran las primeras DIMENSIONES_GRAFICO componentes; la malla se fija
+    con los parámetros teóricos, por lo que los bloques se suman sin guardar los valores.
+    """
+
+    def __init__(self, modelo, bins=BINS_PARES, dimensiones=DIMENSIONES_GRAFICO):
+        self.bins = bins
+        self.dimension = min(modelo.dimension, dimensiones)
+        media = modelo.media[:self.dimension]
+        radio = 4 * np.where(modelo.desviaciones[:self.dimension] > 0, modelo.desviaciones[:self.dimension], 0.25)
+        self.rangos = [(float(m - r), float(m + r)) for m, r in zip(media, radio)]
+        self.marginales = np.zeros((self.dimension, bins))
+        self.pares = {(i, j): np.zeros((bins, bins)) for i in range(self.dimension) for j in range(i)}
+
+    def agregar(self, bloque):
+        # Each component is binned once; the pairs reuse those indices (-1 = outside the grid)
+        indices = []
+        for i, (x0, x1) in enumerate(self.rangos):
+            x = np.asarray(bloque[:, i])
+            indice = ((x - x0) * (self.bins / (x1 - x0))).astype(np.int64)
+            indice[(x < x0) | (x >= x1)] = -1
+            np.minimum(indice, self.bins - 1, out=indice)
+            indices.append(indice)
+            self.marginales[i] += np.bincount(indice[indice >= 0], minlength=self.bins)
+        for (i, j), conteos in self.pares.items():
+            # Row index is component i (vertical axis), column index component j, as in densidad_pares
+            dentro = (indices[i] >= 0) & (indices[j] >= 0)
+            lineal = indices[i][dentro] * self.bins + indices[j][dentro]
+            conteos += np.bincount(lineal, minlength=self.bins * self.bins).reshape(self.bins, self.bins)
+
+    def densidad_marginal(self, i):
+        """(bordes, densidad) del histograma de la componente i"""
+        x0, x1 = self.rangos[i]
+        bordes = np.linspace(x0, x1, self.bins + 1)
+        total = self.marginales[i].sum()
+        return bordes, self.marginales[i] / (total * (bordes[1] - bordes[0])) if total else self.marginales[i]
+
+
+def texto_resumen_multivariada(modelo, acumulador, segundos):
+    """Resumen por componente y matrices de correlación muestral y teórica"""
+    d = modelo.dimension
+    covarianza = acumulador.covarianza
+    texto = f"{'='*60}\n"
+    texto += f"{'NORMAL MULTIVARIADA':^60}\n"
+    texto += f"{'='*60}\n"
+    texto += f"Dimensión: {d}, vectores generados: {acumulador.n}\n"
+    texto += f"Factorización de Σ: {modelo.metodo}, rango {modelo.rango}\n"
+    texto += f"Tiempo: {segundos:.3f} s ({acumulador.n / max(segundos, 1e-9):.4g} vectores/s)\n\n"
+    texto += f"{'Comp.':>6} {'Media':>11} {'(teórica)':>11} {'Desv.':>11} {'(teórica)':>11} {'Mínimo':>11} {'Máximo':>11}\n"
+    for i in range(d):
+        texto += (f"{f'X{i + 1}':>6} {acumulador.media[i]:>11.5f} {modelo.media[i]:>11.5f} "
+                  f"{np.sqrt(covarianza[i, i]):>11.5f} {modelo.desviaciones[i]:>11.5f} "
+                  f"{acumulador.minimo[i]:>11.5f} {acumulador.maximo[i]:>11.5f}\n")
+    for titulo, matriz in [("Correlación muestral", acumulador.correlacion), ("Correlación teórica", modelo.correlacion)]:
+        texto += f"\n{titulo}:\n"
+        texto += " " * 6 + "".join(f"{f'X{j + 1}':>9}" for j in range(d)) + "\n"
+        for i in range(d):
+            texto += f"{f'X{i + 1}':>6}" + "".join(f"{v:>9.4f}" for v in matriz[i]) + "\n"
+    diferencia = np.abs(acumulador.correlacion - modelo.correlacion)
+    if np.isfinite(diferencia).any():
+        texto += f"\nMáxima diferencia de correlación: {np.nanmax(diferencia):.5f}\n"
+    texto += f"Máxima diferencia de covarianza: {np.max(np.abs(covarianza - modelo.covarianza)):.5f}\n"
+    texto += f"{'='*60}\n"
+    return texto
+
+
+def generar_multivariada(modelo, fuente, n_total, ruta=None):
+    """Correr el flujo por bloques: (acumulador, histogramas, segundos); con `ruta` escribe los vectores"""
+    acumulador = AcumuladorCovarianza(modelo.dimension)
+    histogramas = HistogramasPares(modelo)
+    sumideros = [acumulador, histogramas]
+    if ruta:
+        sumideros.append(SumideroArchivo(ruta, n_total, modelo.dtype, columnas=modelo.dimension))
+    inicio = time.perf_counter()
+    ejecutar_flujo(modelo, fuente, n_total, sumideros, modelo.tamano_bloque())
+    return acumulador, histogramas, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generar vectores normales multivariados N(μ, Σ) por bloques.")
+    parser.add_argument("--media", required=True, help='Vector de medias, p. ej. "0, 1"')
+    parser.add_argument("--covarianza", required=True, help='Filas separadas por ";", p. ej. "1, 0.8; 0.8, 2"')
+    parser.add_argument("-n", type=int, default=1_000_000)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--precision", choices=list(PRECISIONES), default="float64")
+    parser.add_argument("--salida", help="Guardar los vectores en .npy o .csv")
+    args = parser.parse_args(argv)
+    try:
+        dtype = PRECISIONES[args.precision]
+        modelo = NormalMultivariada(leer_vector(args.media), leer_matriz(args.covarianza), dtype)
+    except ErrorParametros as e:
+        parser.error(str(e))
+    fuente = FuenteUniformes.desde_generador({"metodo": "estandar"}, rng=np.random.default_rng(args.semilla), dtype=dtype)
+    acumulador, _, segundos = generar_multivariada(modelo, fuente, args.n, args.salida)
+    print(texto_resumen_multivariada(modelo, acumulador, segundos))
+
+
+if __name__ == "__main__":
+    main()
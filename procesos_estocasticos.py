@@ -0,0 +1,219 @@
+"""Trayectorias de procesos estocásticos generadas en bloque a partir de los uniformes del proyecto.
+
+Cada proceso devuelve una matriz (trayectorias × (pasos + 1)) sobre una rejilla de
+tiempo común, construida con una suma acumulada a lo largo del eje 1 (sin bucles de
+Python por paso ni por trayectoria):
+
+- Proceso de Poisson: instantes de llegada = suma acumulada de interllegadas
+  Exponencial(λ); N(t) se evalúa en la rejilla con una sola búsqueda binaria.
+- Caminata aleatoria: pasos +1 con probabilidad p y -1 si no.
+- Proceso binomial: conteo de éxitos de Bernoulli(p); en el paso k vale Binomial(k, p).
+- Movimiento browniano: incrementos μ·Δt + σ·√Δt·Z con Z de Box-Muller.
+
+Para dibujar miles de trayectorias largas, decimar_min_max conserva el mínimo y el
+máximo de cada columna de píxeles, de modo que los picos siguen visibles con unas
+pocas miles de coordenadas por trayectoria; con muchas trayectorias, esos mismos
+extremos se acumulan en una imagen de densidad (densidad_trayectorias).
+"""
+import math
+
+import numpy as np
+
+from distribuciones import ErrorParametros, clave_parametro, convertir_parametros, normales_box_muller
+from flujo import muestreador_distribucion
+
+# Valores máximos (trayectorias × pasos) de una corrida, para acotar la memoria
+VALORES_MAXIMOS = 50_000_000
+# Columnas de la decimación por defecto (del orden del ancho del gráfico en píxeles)
+COLUMNAS_DECIMACION = 1000
+FILAS_DENSIDAD = 400
+# Con más trayectorias que esto se dibuja la imagen de densidad y sólo unas pocas como líneas
+TRAYECTORIAS_LINEAS = 200
+TRAYECTORIAS_DESTACADAS = 10
+
+PROCESOS = {
+    "Proceso de Poisson": [("Tasa (λ):", float, "1"), ("Horizonte (T):", float, "50")],
+    "Caminata aleatoria (±1)": [("P (Probabilidad):", float, "0.5")],
+    "Proceso binomial": [("P (Probabilidad):", float, "0.5")],
+    "Movimiento browniano": [("Deriva (μ):", float, "0"), ("Volatilidad (σ):", float, "1"), ("Horizonte (T):", float, "1")],
+}
+
+
+def convertir_parametros_proceso(proceso, valores_raw):
+    """Valores del formulario convertidos a su tipo y validados; ErrorParametros si están fuera de rango"""
+    if proceso not in PROCESOS:
+        raise ErrorParametros(f"Proceso desconocido: {proceso}")
+    valores = {clave_parametro(etiqueta): tipo(valores_raw.get(clave_parametro(etiqueta), defecto))
+               for etiqueta, tipo, defecto in PROCESOS[proceso]}
+    if "Tasa" in valores and not valores["Tasa"] > 0:
+        raise ErrorParametros("La tasa λ debe ser mayor que 0.")
+    if "Horizonte" in valores and not valores["Horizonte"] > 0:
+        raise ErrorParametros("El horizonte T debe ser mayor que 0.")
+    if "P" in valores and not 0 <= valores["P"] <= 1:
+        raise ErrorParametros("La probabilidad p debe estar entre 0 y 1.")
+    if "Volatilidad" in valores and valores["Volatilidad"] < 0:
+        raise ErrorParametros("La volatilidad σ no puede ser negativa.")
+    return valores
+
+
+def columnas_llegadas(tasa, horizonte):
+    """Interllegadas por fila del primer lote de llegadas_poisson: λT + 6√(λT) + 10"""
+    media = tasa * horizonte
+    return int(media + 6 * math.sqrt(media) + 10)
+
+
+def llegadas_poisson(tasa, horizonte, fuente, trayectorias):
+    """Instantes de llegada (trayectorias × k) hasta superar el horizonte en todas las filas.
+
+    Se generan λT + 6√(λT) + 10 interllegadas Exponencial(λ) por fila y, si alguna fila no
+    llega a T, se agregan columnas hasta que todas lo superen.
+    """
+    columnas = columnas_llegadas(tasa, horizonte)
+    exponencial = muestreador_distribucion("Exponencial", convertir_parametros("Exponencial", {"Lambda": tasa}))
+    # Arrival times stay in float64: rounding them would shift the counts near the grid points
+    llegadas = np.cumsum(exponencial(fuente, trayectorias * columnas).reshape(trayectorias, columnas), axis=1, dtype=np.float64)
+    while llegadas[:, -1].min() <= horizonte:
+        extra = np.cumsum(exponencial(fuente, trayectorias * columnas).reshape(trayectorias, columnas), axis=1, dtype=np.float64)
+        llegadas = np.concatenate([llegadas, llegadas[:, -1:] + extra], axis=1)
+    return llegadas
+
+
+def conteos_en_rejilla(llegadas, rejilla):
+    """N(t) de cada fila en los instantes de la rejilla, con una única búsqueda binaria.
+
+    Cada fila se desplaza a su propio intervalo [fila·D, (fila + 1)·D) para ordenar
+    todas las llegadas juntas; así searchsorted atiende las m filas de una vez.
+    """
+    filas, columnas = llegadas.shape
+    desplazamiento = max(float(llegadas[:, -1].max()), float(rejilla[-1])) + 1.0
+    base = np.arange(filas)[:, None] * desplazamiento
+    posiciones = np.searchsorted((llegadas + base).ravel(), (rejilla[None, :] + base).ravel(), side='right')
+    return (posiciones.reshape(filas, -1) - np.arange(filas)[:, None] * columnas).astype(np.int32)
+
+
+def generar_proceso(proceso, params, fuente, trayectorias, pasos):
+    """Trayectorias del proceso como matriz (trayectorias × (pasos + 1)) y sus momentos teóricos.
+
+    Devuelve un dict con 't' (rejilla), 'valores', 'media' y 'varianza' teóricas en cada
+    instante y, para el proceso de Poisson, 'llegadas' (instantes de llegada por fila).
+    El movimiento browniano sigue la precisión de la fuente (float32 o float64); los
+    procesos de conteo y las caminatas son enteros.
+    """
+    if trayectorias < 1 or pasos < 1:
+        raise ErrorParametros("Se necesitan al menos una trayectoria y un paso.")
+    if trayectorias * (pasos + 1) > VALORES_MAXIMOS:
+        raise ErrorParametros(f"Trayectorias × pasos no puede superar {VALORES_MAXIMOS:,} valores.")
+    resultado = {}
+    if proceso == "Proceso de Poisson":
+        tasa, horizonte = params["Tasa"], params["Horizonte"]
+        # The arrival matrix (and its shifted copy in conteos_en_rejilla) can be far wider than the grid
+        if trayectorias * columnas_llegadas(tasa, horizonte) > VALORES_MAXIMOS:
+            raise ErrorParametros(f"Trayectorias × llegadas esperadas (λT) no puede superar {VALORES_MAXIMOS:,} valores.")
+        t = np.linspace(0, horizonte, pasos + 1)
+        llegadas = llegadas_poisson(tasa, horizonte, fuente, trayectorias)
+        resultado['llegadas'] = llegadas
+        valores = conteos_en_rejilla(llegadas, t)
+        media = varianza = tasa * t
+    elif proceso in ("Caminata aleatoria (±1)", "Proceso binomial"):
+        p = params["P"]
+        t = np.arange(pasos + 1)
+        exitos = fuente.tomar(trayectorias * pasos).reshape(trayectorias, pasos) < p
+        if proceso == "Proceso binomial":
+            incrementos = exitos.astype(np.int32)
+            media, varianza = p * t, p * (1 - p) * t
+        else:
+            incrementos = 2 * exitos.astype(np.int32) - 1
+            media, varianza = (2 * p - 1) * t, 4 * p * (1 - p) * t
+        valores = np.zeros((trayectorias, pasos + 1), dtype=np.int32)
+        np.cumsum(incrementos, axis=1, out=valores[:, 1:])
+    elif proceso == "Movimiento browniano":
+        mu, sigma, horizonte = params["Deriva"], params["Volatilidad"], params["Horizonte"]
+        t = np.linspace(0, horizonte, pasos + 1)
+        dt = horizonte / pasos
+        cantidad = trayectorias * pasos
+        z = normales_box_muller(fuente.tomar(cantidad + cantidad % 2))[:cantidad].reshape(trayectorias, pasos)
+        valores = np.zeros((trayectorias, pasos + 1), dtype=z.dtype)
+        tipo = z.dtype.type
+        np.cumsum(tipo(mu * dt) + tipo(sigma * math.sqrt(dt)) * z, axis=1, out=valores[:, 1:])
+        media, varianza = mu * t, sigma ** 2 * t
+    else:
+        raise ErrorParametros(f"Proceso desconocido: {proceso}")
+    resultado.update({'t': t, 'valores': valores, 'media': media, 'varianza': varianza})
+    return resultado
+
+
+def extremos_por_columna(valores, columnas):
+    """(índices de inicio, mínimos, máximos) de cada trayectoria en `columnas` tramos consecutivos"""
+    cortes = np.linspace(0, valores.shape[1], min(columnas, valores.shape[1]) + 1).astype(np.int64)[:-1]
+    return cortes, np.minimum.reduceat(valores, cortes, axis=1), np.maximum.reduceat(valores, cortes, axis=1)
+
+
+def decimar_min_max(t, valores, columnas=COLUMNAS_DECIMACION):
+    """Reducir cada trayectoria a (mínimo, máximo) por columna: (t', valores') con 2·columnas puntos.
+
+    Cada columna de la rejilla original se representa con un trazo vertical del mínimo al
+    máximo, así que ningún pico desaparece. Si la trayectoria ya es corta se devuelve igual.
+    """
+    if valores.shape[1] <= 2 * columnas:
+        return t, valores
+    cortes, minimos, maximos = extremos_por_columna(valores, columnas)
+    decimados = np.empty((valores.shape[0], 2 * len(cortes)), dtype=valores.dtype)
+    decimados[:, 0::2] = minimos
+    decimados[:, 1::2] = maximos
+    return np.repeat(t[cortes], 2), decimados
+
+
+def densidad_trayectorias(valores, columnas=COLUMNAS_DECIMACION, filas=FILAS_DENSIDAD):
+    """Imagen (filas × columnas) con cuántas trayectorias pasan por cada celda, y su rango vertical.
+
+    Usa los mismos extremos que decimar_min_max: cada trayectoria cubre en cada columna el
+    tramo de su mínimo a su máximo (extendido hasta el primer valor de la columna siguiente,
+    para no cortar los saltos). Los tramos se suman con un arreglo de diferencias por
+    columna, así que el costo es lineal en trayectorias × columnas y no en los puntos.
+    """
+    cortes, minimos, maximos = extremos_por_columna(valores, columnas)
+    minimos = minimos.astype(np.float64)
+    maximos = maximos.astype(np.float64)
+    siguientes = valores[:, cortes[1:]]
+    np.minimum(minimos[:, :-1], siguientes, out=minimos[:, :-1])
+    np.maximum(maximos[:, :-1], siguientes, out=maximos[:, :-1])
+    y0, y1 = float(minimos.min()), float(maximos.max())
+    if y1 <= y0:
+        y0, y1 = y0 - 0.5, y1 + 0.5
+    escala = filas / (y1 - y0)
+    bajo = np.minimum(((minimos - y0) * escala).astype(np.int64), filas - 1)
+    alto = np.minimum(((maximos - y0) * escala).astype(np.int64), filas - 1)
+    columna = np.arange(len(cortes)) * (filas + 1)
+    total = len(cortes) * (filas + 1)
+    diferencias = (np.bincount((bajo + columna).ravel(), minlength=total)
+                   - np.bincount((alto + 1 + columna).ravel(), minlength=total))
+    densidad = np.cumsum(diferencias.reshape(len(cortes), filas + 1), axis=1)[:, :filas]
+    return densidad.T, (y0, y1)
+
+
+def texto_resumen_proceso(proceso, params, resultado, segundos):
+    """Valor final y máximo de las trayectorias frente a los momentos teóricos"""
+    valores = resultado['valores']
+    finales = valores[:, -1].astype(np.float64)
+    trayectorias, columnas = valores.shape
+    texto = f"{'='*50}\n"
+    texto += f"{proceso.upper():^50}\n"
+    texto += f"{'='*50}\n"
+    texto += "Parámetros: " + ", ".join(f"{nombre} = {valor:g}" for nombre, valor in params.items()) + "\n"
+    texto += f"Trayectorias: {trayectorias}, puntos por trayectoria: {columnas} ({valores.nbytes / 2**20:.1f} MiB, {valores.dtype})\n"
+    texto += f"Tiempo de generación: {segundos:.3f} s ({valores.size / max(segundos, 1e-9):.4g} valores/s)\n"
+    texto += f"Valor final, media: {finales.mean():.6f} (teórica {resultado['media'][-1]:.6f})\n"
+    if trayectorias > 1:
+        texto += f"Valor final, varianza: {finales.var(ddof=1):.6f} (teórica {resultado['varianza'][-1]:.6f})\n"
+    texto += f"Máximo por trayectoria, media: {valores.max(axis=1).astype(np.float64).mean():.6f}\n"
+    if 'llegadas' in resultado:
+        llegadas = resultado['llegadas']
+        primeras = llegadas[:, 0]
+        texto += f"Primera llegada, media: {primeras.mean():.6f} (teórica {1 / params['Tasa']:.6f})\n"
+        texto += f"Llegadas generadas por trayectoria: {llegadas.shape[1]}\n"
+    elif proceso == "Movimiento browniano":
+        variacion = np.sum(np.diff(valores, axis=1).astype(np.float64) ** 2, axis=1)
+        esperada = params['Volatilidad'] ** 2 * params['Horizonte'] + (params['Deriva'] * params['Horizonte']) ** 2 / (columnas - 1)
+        texto += f"Variación cuadrática, media: {variacion.mean():.6f} (teórica {esperada:.6f})\n"
+    texto += f"{'='*50}\n"
+    return texto
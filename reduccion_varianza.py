@@ -0,0 +1,144 @@
+import numpy as np
+
+MODO_SIMPLE = "Simple"
+MODO_ANTITETICO = "Antitético"
+MODO_ESTRATIFICADO = "Estratificado (LHS)"
+MODO_CONTROL = "Variables de control"
+
+MODOS_MUESTREO = [MODO_SIMPLE, MODO_ANTITETICO, MODO_ESTRATIFICADO, MODO_CONTROL]
+# Modos cuyas muestras no son i.i.d. (pares antitéticos, estratos); el de control sólo cambia el estimador
+MODOS_DEPENDIENTES = (MODO_ANTITETICO, MODO_ESTRATIFICADO)
+
+# Número de réplicas independientes del hipercubo latino usadas para estimar la varianza del estimador
+GRUPOS_ESTRATIFICADO = 10
+
+
+def uniformes_necesarios(modo, filas, k):
+    """Cantidad de uniformes de la fuente que consume un modo para filas × k coordenadas"""
+    if modo == MODO_ESTRATIFICADO:
+        # Cada coordenada necesita un desplazamiento y una clave de permutación
+        return 2 * filas * k
+    return filas * k
+
+
+def aplicar_modo_muestreo(uniformes, modo, filas, k, box_muller=False):
+    """Reordenar/transformar los uniformes de la fuente según el modo de muestreo.
+
+    Devuelve un arreglo de filas × k valores en [0,1) ordenados por fila: la fila r
+    alimenta a la r-ésima muestra (o al r-ésimo par de Box-Muller). En los pares de
+    Box-Muller la fila antitética es (U1, U2 + ½ mod 1): gira el ángulo media vuelta y
+    da (-Z0, -Z1), mientras que (1 - U1, 1 - U2) cambiaría R sin negar las normales.
+    """
+    u = np.asarray(uniformes, dtype=float)
+    total = filas * k
+
+    if modo == MODO_ANTITETICO:
+        mitad = filas // 2
+        base = u[:(filas - mitad) * k].reshape(filas - mitad, k)
+        # La fila r + (filas - mitad) es la antitética de la fila r
+        if box_muller:
+            antiteticas = base[:mitad].copy()
+            antiteticas[:, 1] = np.mod(antiteticas[:, 1] + 0.5, 1.0)
+        else:
+            antiteticas = 1.0 - base[:mitad]
+        # 1 - 0 = 1 queda fuera de [0,1); se refleja al valor más cercano por debajo
+        antiteticas = np.minimum(antiteticas, np.nextafter(1.0, 0.0))
+        return np.concatenate([base, antiteticas]).ravel()
+
+    if modo == MODO_ESTRATIFICADO:
+        desplazamientos = u[:total].reshape(filas, k)
+        claves = u[total:2 * total].reshape(filas, k)
+        resultado = np.empty((filas, k))
+        # Cada grupo es un hipercubo latino independiente de tamaño ~filas/G
+        for indices in np.array_split(np.arange(filas), min(GRUPOS_ESTRATIFICADO, filas)):
+            n = len(indices)
+            estratos = np.argsort(claves[indices], axis=0, kind='stable')
+            resultado[indices] = (estratos + desplazamientos[indices]) / n
+        return resultado.ravel()
+
+    return u[:total].copy()
+
+
+def _medias_por_fila(valores, filas, valores_por_fila):
+    """Media de los valores de cada fila; la última fila puede quedar incompleta (N impar en Box-Muller)"""
+    x = np.asarray(valores, dtype=float)
+    fila = np.arange(len(x)) // valores_por_fila
+    if len(x) == 0 or fila[-1] != filas - 1:
+        raise ValueError(f"{len(x)} valores no llenan {filas} filas de {valores_por_fila} valores.")
+    return np.bincount(fila, weights=x, minlength=filas) / np.bincount(fila, minlength=filas)
+
+
+def controles_por_fila(uniformes_modo, filas, k, box_muller=False):
+    """Variables de control de cada fila con media exactamente conocida: (matriz filas × j, medias, descripción).
+
+    Siempre la media de los uniformes de la fila (media ½). En los pares de Box-Muller
+    también cos(2πU2) y sen(2πU2) (media 0): la media de la fila, μ + σ·R·(cos + sen)/2,
+    depende sobre todo del ángulo, que la media de los uniformes apenas refleja.
+    La media teórica de la propia distribución no sirve de control, porque es justo lo
+    que se estima; se usa para medir el error en el resumen.
+    """
+    u = np.asarray(uniformes_modo, dtype=float)[:filas * k].reshape(filas, k)
+    controles = [u.mean(axis=1)]
+    medias = [0.5]
+    descripcion = "media de los uniformes de la fila (½)"
+    if box_muller:
+        angulo = 2 * np.pi * u[:, 1]
+        controles += [np.cos(angulo), np.sin(angulo)]
+        medias += [0.0, 0.0]
+        descripcion += ", cos(2πU2) y sen(2πU2) (0)"
+    return np.column_stack(controles), np.array(medias), descripcion
+
+
+def estimar_reduccion_varianza(valores, modo, filas, uniformes_modo=None, k=1, valores_por_fila=1, box_muller=False):
+    """Estimar la media con el modo elegido y el factor de reducción de varianza.
+
+    El factor compara la varianza del estimador Monte Carlo simple (s²/N) con la
+    varianza estimada del estimador del modo; valores > 1 indican ganancia.
+    valores_por_fila es la cantidad de valores que produce cada fila de uniformes
+    (2 para los pares de Box-Muller), de modo que cada media quede junto a su fila.
+    """
+    x = np.asarray(valores, dtype=float)
+    n = len(x)
+    if n < 2 or filas < 2:
+        return None
+
+    var_simple = np.var(x, ddof=1) / n
+    y = _medias_por_fila(x, filas, valores_por_fila)
+
+    if modo == MODO_ANTITETICO:
+        mitad = len(y) // 2
+        desplazamiento = len(y) - mitad
+        pares = (y[:mitad] + y[desplazamiento:desplazamiento + mitad]) / 2
+        if len(pares) < 2:
+            return None
+        estimacion = np.mean(pares)
+        var_modo = np.var(pares, ddof=1) / len(pares)
+    elif modo == MODO_ESTRATIFICADO:
+        grupos = np.array_split(y, min(GRUPOS_ESTRATIFICADO, len(y)))
+        medias_grupo = np.array([g.mean() for g in grupos])
+        if len(medias_grupo) < 2:
+            return None
+        estimacion = np.mean(y)
+        var_modo = np.var(medias_grupo, ddof=1) / len(medias_grupo)
+    elif modo == MODO_CONTROL:
+        c, medias_c, control = controles_por_fila(uniformes_modo, len(y), k, box_muller)
+        # Regression coefficients of the row means on the centered controls (least squares)
+        centrados = c - c.mean(axis=0)
+        beta = np.linalg.lstsq(centrados, y - y.mean(), rcond=None)[0]
+        ajustados = y - (c - medias_c) @ beta
+        estimacion = np.mean(ajustados)
+        var_modo = np.var(ajustados, ddof=1) / len(ajustados)
+    else:
+        estimacion = np.mean(x)
+        var_modo = var_simple
+
+    factor = var_simple / var_modo if var_modo > 0 else float('inf')
+    resultado = {
+        'estimacion': estimacion,
+        'var_simple': var_simple,
+        'var_modo': var_modo,
+        'factor': factor,
+    }
+    if modo == MODO_CONTROL:
+        resultado['control'] = control
+    return resultado
@@ -0,0 +1,266 @@
+"""Servidor local de muestras (asyncio, sólo biblioteca estándar + NumPy/SciPy).
+
+Expone los mismos generadores y transformaciones que la interfaz gráfica por HTTP/1.1
+sobre TCP (sólo localhost por defecto) o sobre un socket Unix. Cada petición es un
+flujo independiente que se envía en líneas JSON con codificación por trozos:
+
+    {"distribucion": ..., "params": ..., "n": ..., "semilla": ..., "generador": {...}}
+    [x_1, x_2, ...]            <- un bloque por línea
+    ...
+    {"fin": true, "enviados": n, "uniformes": consumidos}
+
+Uso, por ejemplo:
+
+    python servidor_muestras.py --puerto 8765
+    curl -N "http://127.0.0.1:8765/muestras?distribucion=Poisson&Lambda=3&n=1000000&semilla=42"
+    curl -N "http://127.0.0.1:8765/muestras?distribucion=Normal&Media=0&Desviación%20Estándar=1&n=10&metodo=mixto&x0=7&a=1103515245&c=12345&m=2147483648"
+    python servidor_muestras.py --unix /tmp/simulador.sock
+    curl -N --unix-socket /tmp/simulador.sock "http://localhost/distribuciones"
+
+Con la misma semilla (método estándar) o la misma configuración congruencial (más
+`salto`, para subflujos disjuntos) se obtiene exactamente la misma secuencia. Si no se
+indica semilla, el servidor elige una y la informa en la cabecera para poder repetirla.
+Los parámetros de la distribución que se omitan toman el valor por defecto de /distribuciones.
+Las tablas de parámetros (CDF de Poisson e hipergeométrica) se calculan una vez por
+proceso y se comparten entre peticiones; la escritura espera a que el cliente lea
+(drain) antes de generar el bloque siguiente, así la memoria por cliente queda acotada.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from distribuciones import DISCRETAS, REGISTRO, ErrorParametros, clave_parametro, convertir_parametros
+from flujo import FuenteUniformes, bloques_variables, muestreador_distribucion
+from generadores_uniformes import saltar
+
+PUERTO_POR_DEFECTO = 8765
+BLOQUE_POR_DEFECTO = 8192
+BLOQUE_MAXIMO = 1 << 20
+N_MAXIMO = 10**10
+# Bytes pendientes por cliente antes de que drain() suspenda la generación
+LIMITE_BUFER_ESCRITURA = 1 << 20
+CAMPOS_RESERVADOS = {"distribucion", "n", "semilla", "bloque", "metodo", "x0", "a", "c", "m", "salto"}
+
+
+def entero(campos, nombre, defecto=None):
+    if nombre not in campos:
+        if defecto is None:
+            raise ErrorParametros(f"Falta el campo '{nombre}'.")
+        return defecto
+    try:
+        return int(campos[nombre])
+    except (TypeError, ValueError):
+        raise ErrorParametros(f"El campo '{nombre}' debe ser un entero.")
+
+
+def interpretar_solicitud(campos):
+    """Validar los campos de una petición (consulta o cuerpo JSON) y devolver la solicitud"""
+    distribucion = campos.get("distribucion")
+    if not isinstance(distribucion, str) or distribucion not in REGISTRO:
+        raise ErrorParametros(f"Distribución desconocida: {distribucion}. Disponibles: {', '.join(REGISTRO)}")
+    n = entero(campos, "n")
+    bloque = entero(campos, "bloque", BLOQUE_POR_DEFECTO)
+    if not 0 < n <= N_MAXIMO:
+        raise ErrorParametros(f"n debe estar entre 1 y {N_MAXIMO}.")
+    if not 0 < bloque <= BLOQUE_MAXIMO:
+        raise ErrorParametros(f"bloque debe estar entre 1 y {BLOQUE_MAXIMO}.")
+
+    enviados = campos.get("params")
+    if enviados is None:
+        enviados = {k: v for k, v in campos.items() if k not in CAMPOS_RESERVADOS}
+    elif not isinstance(enviados, dict):
+        raise ErrorParametros("'params' debe ser un objeto JSON con los parámetros de la distribución.")
+    # Omitted parameters take the defaults advertised by /distribuciones
+    params_raw = {clave_parametro(etiqueta): defecto for etiqueta, _, defecto in REGISTRO[distribucion].parametros}
+    params_raw.update(enviados)
+    try:
+        params = convertir_parametros(distribucion, params_raw)
+    except ErrorParametros:
+        raise
+    except (TypeError, ValueError):
+        # int("abc"), float(None), ...: report it the same way as an out-of-range value
+        raise ErrorParametros("Los parámetros de la distribución deben ser numéricos.")
+
+    metodo = campos.get("metodo", "estandar")
+    if metodo == "estandar":
+        semilla = entero(campos, "semilla", -1)
+        if semilla < 0:
+            semilla = secrets.randbits(63)
+        generador = {"metodo": metodo}
+    elif metodo in ("mixto", "multiplicativo"):
+        semilla = None
+        generador = {"metodo": metodo, "x0": entero(campos, "x0"), "a": entero(campos, "a"), "m": entero(campos, "m"),
+                     "c": entero(campos, "c", 0) if metodo == "mixto" else 0, "salto": entero(campos, "salto", 0)}
+        if not (generador["m"] > 0 and 0 < generador["a"] < generador["m"] and 0 <= generador["x0"] < generador["m"]
+                and 0 <= generador["c"] < generador["m"] and generador["salto"] >= 0):
+            raise ErrorParametros("Se requiere m > 0, 0 < a < m, 0 ≤ X₀ < m, 0 ≤ c < m y salto ≥ 0.")
+        if generador["c"] == 0 and generador["x0"] == 0:
+            # Without an increment X₀ = 0 is a fixed point: every value would be 0
+            raise ErrorParametros("Con c = 0 (multiplicativo) la semilla X₀ debe ser mayor que 0.")
+    else:
+        raise ErrorParametros("metodo debe ser 'estandar', 'mixto' o 'multiplicativo'.")
+    return {"distribucion": distribucion, "params_raw": params_raw, "params": params, "n": n, "bloque": bloque,
+            "semilla": semilla, "generador": generador}
+
+
+def crear_fuente(solicitud):
+    """Fuente de uniformes propia de la petición"""
+    generador = solicitud["generador"]
+    if generador["metodo"] == "estandar":
+        return FuenteUniformes.desde_generador(generador, solicitud["bloque"],
+                                               rng=np.random.default_rng(solicitud["semilla"]))
+    config = dict(generador)
+    if config["salto"]:
+        config["x0"] = saltar(config["x0"], config["a"], config["c"], config["m"], config["salto"])
+    return FuenteUniformes.desde_generador(config, solicitud["bloque"])
+
+
+def linea_json(objeto):
+    return (json.dumps(objeto, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def catalogo():
+    """Distribuciones disponibles con sus parámetros y valores por defecto"""
+    return {nombre: {"discreta": familia.discreta, "metodo": familia.metodo,
+                     "parametros": {clave_parametro(etiqueta): {"tipo": tipo.__name__, "defecto": defecto}
+                                    for etiqueta, tipo, defecto in familia.parametros}}
+            for nombre, familia in REGISTRO.items()}
+
+
+class ServidorMuestras:
+    """Un flujo independiente por petición; varias peticiones se atienden a la vez"""
+
+    def __init__(self):
+        self.clientes_activos = 0
+        self.muestras_enviadas = 0
+
+    async def atender(self, lector, escritor):
+        escritor.transport.set_write_buffer_limits(high=LIMITE_BUFER_ESCRITURA)
+        try:
+            metodo_http, ruta, cabeceras = await self.leer_cabeceras(lector)
+            cuerpo = b""
+            if int(cabeceras.get("content-length", 0)) > 0:
+                cuerpo = await lector.readexactly(int(cabeceras["content-length"]))
+            await self.despachar(metodo_http, ruta, cuerpo, escritor)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass # Client went away; its stream simply stops
+        except ValueError as e:
+            await self.responder_json(escritor, 400, {"error": str(e)})
+        finally:
+            escritor.close()
+
+    async def leer_cabeceras(self, lector):
+        linea = (await lector.readline()).decode("latin-1").strip()
+        partes = linea.split()
+        if len(partes) != 3:
+            raise ValueError("Petición HTTP mal formada.")
+        cabeceras = {}
+        while True:
+            linea = (await lector.readline()).decode("latin-1").strip()
+            if not linea:
+                break
+            nombre, _, valor = linea.partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        return partes[0], partes[1], cabeceras
+
+    async def despachar(self, metodo_http, ruta, cuerpo, escritor):
+        url = urlsplit(ruta)
+        if url.path == "/distribuciones" and metodo_http == "GET":
+            await self.responder_json(escritor, 200, catalogo())
+        elif url.path == "/estado" and metodo_http == "GET":
+            await self.responder_json(escritor, 200, {"clientes_activos": self.clientes_activos,
+                                                      "muestras_enviadas": self.muestras_enviadas})
+        elif url.path == "/muestras" and metodo_http in ("GET", "POST"):
+            campos = dict(parse_qsl(url.query))
+            if cuerpo:
+                try:
+                    objeto = json.loads(cuerpo)
+                except json.JSONDecodeError:
+                    raise ValueError("El cuerpo debe ser un objeto JSON.")
+                if not isinstance(objeto, dict):
+                    raise ValueError("El cuerpo debe ser un objeto JSON.")
+                campos.update(objeto)
+            await self.enviar_muestras(interpretar_solicitud(campos), escritor)
+        else:
+            await self.responder_json(escritor, 404, {"error": f"Ruta desconocida: {metodo_http} {url.path}"})
+
+    async def responder_json(self, escritor, estado, objeto):
+        cuerpo = linea_json(objeto)
+        razon = {200: "OK", 400: "Bad Request", 404: "Not Found"}[estado]
+        escritor.write(f"HTTP/1.1 {estado} {razon}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                       f"Content-Length: {len(cuerpo)}\r\nConnection: close\r\n\r\n".encode("latin-1") + cuerpo)
+        await escritor.drain()
+
+    async def escribir_trozo(self, escritor, datos):
+        escritor.write(f"{len(datos):x}\r\n".encode("latin-1") + datos + b"\r\n")
+        # Backpressure: wait until the client has read enough before generating more
+        await escritor.drain()
+
+    async def enviar_muestras(self, solicitud, escritor):
+        escritor.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson; charset=utf-8\r\n"
+                       b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        await self.escribir_trozo(escritor, linea_json({
+            "distribucion": solicitud["distribucion"], "params": solicitud["params_raw"], "n": solicitud["n"],
+            "semilla": solicitud["semilla"], "generador": solicitud["generador"]}))
+
+        distribucion = solicitud["distribucion"]
+        fuente = crear_fuente(solicitud)
+        bloques = bloques_variables(muestreador_distribucion(distribucion, solicitud["params"]), fuente,
+                                    solicitud["n"], solicitud["bloque"])
+        tipo = int if distribucion in DISCRETAS else float
+        enviados = 0
+        self.clientes_activos += 1
+        try:
+            try:
+                while True:
+                    # NumPy work runs off the event loop so other clients keep being served
+                    bloque = await asyncio.to_thread(next, bloques, None)
+                    if bloque is None:
+                        break
+                    await self.escribir_trozo(escritor, (json.dumps(np.asarray(bloque).astype(tipo).tolist()) + "\n").encode("utf-8"))
+                    enviados += len(bloque)
+                    self.muestras_enviadas += len(bloque)
+                final = {"fin": True, "enviados": enviados, "uniformes": fuente.consumidos}
+            except ValueError as e:
+                # The 200 header is already out, so errors found while sampling end the stream in-band
+                final = {"fin": True, "enviados": enviados, "error": str(e)}
+            await self.escribir_trozo(escritor, linea_json(final))
+            escritor.write(b"0\r\n\r\n")
+            await escritor.drain()
+        finally:
+            self.clientes_activos -= 1
+
+
+async def iniciar_servidor(host="127.0.0.1", puerto=PUERTO_POR_DEFECTO, ruta_unix=None):
+    servidor = ServidorMuestras()
+    if ruta_unix:
+        return await asyncio.start_unix_server(servidor.atender, path=ruta_unix)
+    return await asyncio.start_server(servidor.atender, host, puerto)
+
+
+async def servir(host, puerto, ruta_unix):
+    servidor = await iniciar_servidor(host, puerto, ruta_unix)
+    direccion = ruta_unix or f"http://{host}:{servidor.sockets[0].getsockname()[1]}"
+    print(f"Servidor de muestras escuchando en {direccion} (Ctrl+C para terminar)")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de muestras en líneas JSON (HTTP por TCP o socket Unix).")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz TCP (por defecto sólo localhost)")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument("--unix", help="Ruta de un socket Unix en lugar de TCP")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()